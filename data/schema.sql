@@ -111,3 +111,54 @@ CREATE INDEX IF NOT EXISTS idx_movements_warehouse ON movements(warehouse_id);
 CREATE INDEX IF NOT EXISTS idx_movements_timestamp ON movements(timestamp);
 CREATE INDEX IF NOT EXISTS idx_movements_user ON movements(performed_by);
 CREATE INDEX IF NOT EXISTS idx_inventory_snapshots_date ON inventory_snapshots(snapshot_date);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_inventory_snapshots_day ON inventory_snapshots(warehouse_id, product_id, snapshot_date);
+
+-- Volltextindex für die Produktsuche (Name, Beschreibung, SKU)
+-- External-Content-Tabelle: Inhalte liegen in products, Trigger halten den Index synchron
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    name,
+    description,
+    sku,
+    content='products',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts(rowid, name, description, sku)
+    VALUES (new.rowid, new.name, new.description, new.sku);
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+    VALUES ('delete', old.rowid, old.name, old.description, old.sku);
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF name, description, sku ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+    VALUES ('delete', old.rowid, old.name, old.description, old.sku);
+    INSERT INTO products_fts(rowid, name, description, sku)
+    VALUES (new.rowid, new.name, new.description, new.sku);
+END;
+
+-- Trigramm-Index für die Teilstring-Suche über "<id> <name>" (search_products)
+CREATE VIRTUAL TABLE IF NOT EXISTS products_search USING fts5(
+    haystack,
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS products_search_insert AFTER INSERT ON products BEGIN
+    INSERT INTO products_search(rowid, haystack) VALUES (new.rowid, new.id || ' ' || new.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_search_delete AFTER DELETE ON products BEGIN
+    DELETE FROM products_search WHERE rowid = old.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS products_search_update AFTER UPDATE OF id, name ON products BEGIN
+    DELETE FROM products_search WHERE rowid = old.rowid;
+    INSERT INTO products_search(rowid, haystack) VALUES (new.rowid, new.id || ' ' || new.name);
+END;
+
+-- Schema-Version (muss SCHEMA_VERSION in src/adapters/models.py entsprechen)
+PRAGMA user_version = 3;
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark für den Lagerstandsreport je Kategorie
+Vergleicht die Laufzeit mit 1, 2, 4 und 8 Worker-Prozessen; die Schwelle
+für die sequentielle Aufbereitung (PARALLEL_THRESHOLD) wird dabei umgangen
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Pfad zum Projekt
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.category_report import PARALLEL_THRESHOLD, LazyProcessPool, build_category_report
+from src.domain.product import Product
+
+
+def _products(count: int, categories: int):
+    return [
+        Product(
+            id=f"SKU-{i:07d}",
+            name=f"Artikel {i}",
+            description="",
+            price=1.0 + (i % 997) / 10,
+            quantity=i % 250,
+            category=f"Kategorie {i % categories:03d}",
+        )
+        for i in range(count)
+    ]
+
+
+def benchmark_workers(products, workers: int, rounds: int) -> dict:
+    """
+    Bester Lauf aus ``rounds``
+
+    Der Pool wird wie in den Use Cases einmal gestartet und wiederverwendet;
+    ein Aufwärmlauf startet die Prozesse vor der Messung.
+    """
+    timings = []
+    pool = LazyProcessPool(max_workers=workers)
+    try:
+        build_category_report(products, workers, pool, parallel_threshold=0)
+        for _ in range(rounds):
+            start = time.perf_counter()
+            report = build_category_report(products, workers, pool, parallel_threshold=0)
+            timings.append(time.perf_counter() - start)
+    finally:
+        pool.shutdown()
+
+    return {
+        "workers": workers,
+        "seconds": min(timings),
+        "total_value": report["total_value"],
+    }
+
+
+def main(count: int, categories: int, rounds: int) -> None:
+    products = _products(count, categories)
+
+    print("\n" + "=" * 70)
+    print(
+        f"Lagerstandsreport je Kategorie ({count} Produkte, {categories} Kategorien, "
+        f"{os.cpu_count()} CPUs, Schwelle {PARALLEL_THRESHOLD})"
+    )
+    print("=" * 70)
+    print(f"{'Worker':>6} | {'Sekunden':>10} | {'Produkte/s':>14} | {'Speedup':>8}")
+    print("-" * 70)
+
+    baseline = None
+    total_value = None
+    for workers in (1, 2, 4, 8):
+        result = benchmark_workers(products, workers, rounds)
+        if baseline is None:
+            baseline = result["seconds"]
+            total_value = result["total_value"]
+        # Deterministisches Zusammenführen: jeder Lauf liefert exakt dieselbe Summe
+        assert result["total_value"] == total_value
+        print(
+            f"{workers:>6} | {result['seconds']:>10.3f} | "
+            f"{count / result['seconds']:>14,.0f} | {baseline / result['seconds']:>7.2f}x"
+        )
+
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark des Kategorie-Reports")
+    parser.add_argument("--products", type=int, default=200_000, help="Anzahl Produkte")
+    parser.add_argument("--categories", type=int, default=40, help="Anzahl Kategorien")
+    parser.add_argument("--rounds", type=int, default=3, help="Läufe je Worker-Anzahl")
+    args = parser.parse_args()
+
+    main(args.products, args.categories, args.rounds)
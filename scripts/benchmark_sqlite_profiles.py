@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark für SQLite Performance-Profile
+Vergleicht den Schreibdurchsatz von "durable", "balanced" und "bulk-load"
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Pfad zum Projekt
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.adapters.models import SQLITE_PROFILES
+from src.adapters.repository import SqliteRepository
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+def _movement(i: int) -> Movement:
+    return Movement(
+        id=f"bench_{i}",
+        product_id="BENCH-001",
+        product_name="",
+        quantity_change=1,
+        movement_type="IN",
+        reason="Benchmark",
+        timestamp=datetime.now(),
+    )
+
+
+def benchmark_profile(profile: str, scans: int, bulk: int) -> dict:
+    """Einzelbuchungen (ein Commit je Scan) und Bulk-Import für ein Profil messen"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo = SqliteRepository(str(Path(tmp_dir) / "bench.db"), profile=profile)
+        repo.save_product(
+            Product(id="BENCH-001", name="Benchmark", description="", price=1.0, sku="BENCH")
+        )
+
+        start = time.perf_counter()
+        for i in range(scans):
+            repo.apply_stock_change("BENCH-001", 1, _movement(i))
+        scan_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        repo.save_movements(_movement(scans + i) for i in range(bulk))
+        bulk_seconds = time.perf_counter() - start
+
+        repo.close()
+
+    return {
+        "profile": profile,
+        "scans_per_second": scans / scan_seconds,
+        "bulk_rows_per_second": bulk / bulk_seconds,
+    }
+
+
+def main(scans: int, bulk: int) -> None:
+    print("\n" + "=" * 70)
+    print(f"SQLite Profile-Benchmark ({scans} Einzelbuchungen, {bulk} Bulk-Zeilen)")
+    print("=" * 70)
+    print(f"{'Profil':<12} | {'Buchungen/s':>14} | {'Bulk-Zeilen/s':>14}")
+    print("-" * 70)
+
+    for profile in SQLITE_PROFILES:
+        result = benchmark_profile(profile, scans, bulk)
+        print(
+            f"{result['profile']:<12} | {result['scans_per_second']:>14,.0f} | "
+            f"{result['bulk_rows_per_second']:>14,.0f}"
+        )
+
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark der SQLite Performance-Profile")
+    parser.add_argument("--scans", type=int, default=500, help="Anzahl Einzelbuchungen")
+    parser.add_argument("--bulk", type=int, default=50000, help="Zeilen im Bulk-Import")
+    args = parser.parse_args()
+
+    main(args.scans, args.bulk)
@@ -17,6 +17,26 @@ DUMP_FILE = DATA_DIR / "dump.sql"
 DB_FILE = DATA_DIR / "warehouse.db"
 
 
+def split_sql_statements(sql_content: str) -> list:
+    """
+    Teilt SQL-Text in einzelne Statements auf
+
+    Ein einfaches split(';') würde Trigger zerlegen, deren Körper (BEGIN ... END)
+    selbst Semikolons enthält. sqlite3.complete_statement erkennt, wann ein
+    Statement wirklich abgeschlossen ist.
+    """
+    statements = []
+    buffer = ""
+    for line in sql_content.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip().rstrip(';').strip()
+            if statement:
+                statements.append(statement)
+            buffer = ""
+    return statements
+
+
 def execute_sql_file(conn: sqlite3.Connection, sql_file: Path, verbose: bool = True) -> None:
     """Führt SQL-Datei aus"""
     if not sql_file.exists():
@@ -25,8 +45,7 @@ def execute_sql_file(conn: sqlite3.Connection, sql_file: Path, verbose: bool = T
     with open(sql_file, 'r', encoding='utf-8') as f:
         sql_content = f.read()
     
-    # Teile in einzelne Statements auf (vereinfacht)
-    statements = [s.strip() for s in sql_content.split(';') if s.strip()]
+    statements = split_sql_statements(sql_content)
     
     cursor = conn.cursor()
     for i, statement in enumerate(statements, 1):
@@ -1,6 +1,14 @@
 """Adapters - Konkrete Implementierungen der Ports"""
 
 from .repository import InMemoryRepository, RepositoryFactory
+from .caching import CachingRepository
+from .async_repository import ThreadedAsyncRepository
 from .report import ConsoleReportAdapter
 
-__all__ = ["InMemoryRepository", "RepositoryFactory", "ConsoleReportAdapter"]
+__all__ = [
+    "InMemoryRepository",
+    "RepositoryFactory",
+    "CachingRepository",
+    "ThreadedAsyncRepository",
+    "ConsoleReportAdapter",
+]
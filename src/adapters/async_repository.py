@@ -0,0 +1,169 @@
+"""Async Repository Adapter - führt ein synchrones Repository in Threads aus"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import AsyncRepositoryPort, InventorySnapshot, MovementCursor, RepositoryPort
+
+
+class ThreadedAsyncRepository(AsyncRepositoryPort):
+    """
+    AsyncRepositoryPort auf Basis eines synchronen Repositorys
+
+    Lesezugriffe laufen auf einem begrenzten Thread-Pool und können sich
+    überlappen; alle Schreibzugriffe laufen nacheinander auf einem eigenen
+    Writer-Thread. Damit warten bei SQLite keine Schreiber gegenseitig auf
+    die Datenbanksperre, und Leser werden von Schreibern nicht blockiert.
+    """
+
+    def __init__(self, repository: RepositoryPort, max_readers: int = 4):
+        """
+        Args:
+            repository: Synchrones Repository (z.B. SqliteRepository, JsonRepository)
+            max_readers: Anzahl Threads für Lesezugriffe
+        """
+        if max_readers < 1:
+            raise ValueError("max_readers muss mindestens 1 sein")
+
+        self.repository = repository
+        self._readers = ThreadPoolExecutor(
+            max_workers=max_readers, thread_name_prefix="repository-reader"
+        )
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="repository-writer")
+
+    async def _read(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(func, *args, **kwargs))
+
+    async def _write(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, functools.partial(func, *args, **kwargs))
+
+    async def _stream(self, iterator: Iterator, batch_size: int) -> AsyncIterator:
+        """Synchronen Iterator blockweise auf dem Leser-Pool abarbeiten"""
+        try:
+            while True:
+                batch = await self._read(lambda: list(islice(iterator, batch_size)))
+                if not batch:
+                    return
+                for item in batch:
+                    yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await self._read(close)
+
+    def close(self) -> None:
+        """Thread-Pools beenden (laufende Aufträge werden noch abgeschlossen)"""
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+
+    async def __aenter__(self) -> "ThreadedAsyncRepository":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # -------------------- Produkte --------------------
+
+    async def save_product(self, product: Product) -> None:
+        await self._write(self.repository.save_product, product)
+
+    async def load_product(self, product_id: str) -> Optional[Product]:
+        return await self._read(self.repository.load_product, product_id)
+
+    async def load_all_products(self) -> Dict[str, Product]:
+        return await self._read(self.repository.load_all_products)
+
+    def iter_products(self, batch_size: int = 1000) -> AsyncIterator[Product]:
+        return self._stream(self.repository.iter_products(batch_size), batch_size)
+
+    async def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        return await self._read(
+            self.repository.search_products, text, category, limit=limit, offset=offset
+        )
+
+    async def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        return await self._read(self.repository.full_text_search, query, limit=limit)
+
+    async def delete_product(self, product_id: str) -> None:
+        await self._write(self.repository.delete_product, product_id)
+
+    async def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        return await self._write(
+            self.repository.update_product, product, quantity_delta, movement
+        )
+
+    async def save_products(self, products: Iterable[Product]) -> None:
+        # Iterable vorher materialisieren: Generatoren des Aufrufers sollen
+        # nicht auf dem Writer-Thread ausgeführt werden
+        await self._write(self.repository.save_products, list(products))
+
+    # -------------------- Bewegungen --------------------
+
+    async def save_movement(self, movement: Movement) -> None:
+        await self._write(self.repository.save_movement, movement)
+
+    async def load_movements(self) -> List[Movement]:
+        return await self._read(self.repository.load_movements)
+
+    def iter_movements(
+        self, batch_size: int = 1000, order_by_time: bool = True
+    ) -> AsyncIterator[Movement]:
+        return self._stream(
+            self.repository.iter_movements(batch_size, order_by_time), batch_size
+        )
+
+    async def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_cursor: Optional[MovementCursor] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        return await self._read(
+            self.repository.query_movements,
+            product_id=product_id,
+            movement_type=movement_type,
+            performed_by=performed_by,
+            since=since,
+            until=until,
+            after_cursor=after_cursor,
+            limit=limit,
+        )
+
+    async def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        return await self._write(self.repository.apply_stock_change, product_id, delta, movement)
+
+    async def save_movements(self, movements: Iterable[Movement]) -> None:
+        await self._write(self.repository.save_movements, list(movements))
+
+    async def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        return await self._write(self.repository.save_inventory_snapshot, snapshot_date)
+
+    async def load_inventory_snapshot(
+        self, at: date, product_id: Optional[str] = None
+    ) -> InventorySnapshot:
+        return await self._read(self.repository.load_inventory_snapshot, at, product_id)
+
+    async def data_version(self) -> int:
+        return await self._read(self.repository.data_version)
@@ -0,0 +1,259 @@
+"""Caching Adapter - Read-Through-Cache vor einem beliebigen Repository"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import InventorySnapshot, MovementCursor, RepositoryPort
+
+
+class CachingRepository(RepositoryPort):
+    """
+    Repository-Decorator mit LRU-Cache für Produkte
+
+    ``load_product`` wird aus einem begrenzten LRU-Cache (optional mit TTL)
+    bedient, ``load_all_products`` bis zum nächsten Schreibzugriff gemerkt.
+    Schreibende Methoden werden an das innere Repository weitergereicht und
+    invalidieren die betroffenen Einträge. Bewegungsabfragen und Suchen
+    werden nicht gecacht.
+
+    Da Aufrufer geladene Produkte verändern (z.B. ``update_product``), liefert
+    der Cache bei ``load_product`` Kopien und niemals das gecachte Objekt
+    selbst. ``load_all_products`` liefert dagegen ohne Kopie eine
+    schreibgeschützte Sicht (``MappingProxyType``) auf die gemerkte Liste;
+    wer daraus ein Produkt verändern will, muss es vorher selbst kopieren.
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Args:
+            repository: Inneres Repository, an das delegiert wird
+            max_size: Maximale Anzahl gecachter Produkte
+            ttl: Lebensdauer eines Eintrags in Sekunden (None = bis zur Invalidierung)
+        """
+        if max_size < 1:
+            raise ValueError("max_size muss mindestens 1 sein")
+
+        self.repository = repository
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # product_id -> (Zeitpunkt, Produkt oder None für "existiert nicht")
+        self._products: "OrderedDict[str, Tuple[float, Optional[Product]]]" = OrderedDict()
+        self._all_products: Optional[Tuple[float, Mapping[str, Product]]] = None
+        # Wird bei jedem Schreibzugriff erhöht; Ergebnisse von Lesezugriffen, die
+        # parallel zu einem Schreibzugriff liefen, werden nicht mehr gecacht
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    # -------------------- Cache-Verwaltung --------------------
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return self.ttl is None or time.monotonic() - stored_at < self.ttl
+
+    def _store_product(self, product_id: str, product: Optional[Product]) -> None:
+        self._products[product_id] = (time.monotonic(), product)
+        self._products.move_to_end(product_id)
+        while len(self._products) > self.max_size:
+            self._products.popitem(last=False)
+            self.evictions += 1
+
+    def _invalidate(self, product_ids: Optional[Iterable[str]] = None) -> None:
+        """Einträge verwerfen (None = alle Produkte) und gemerkte Gesamtliste löschen"""
+        with self._lock:
+            self._generation += 1
+            self._all_products = None
+            if product_ids is None:
+                self._products.clear()
+                return
+            for product_id in product_ids:
+                self._products.pop(product_id, None)
+
+    def clear(self) -> None:
+        """Gesamten Cache leeren"""
+        self._invalidate()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache-Statistik: Treffer, Fehlzugriffe, Verdrängungen und Größe"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._products),
+            }
+
+    # -------------------- Produkte --------------------
+
+    def save_product(self, product: Product) -> None:
+        """Produkt speichern und Cache-Eintrag invalidieren"""
+        try:
+            self.repository.save_product(product)
+        finally:
+            self._invalidate([product.id])
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt aus dem Cache oder (bei Fehlzugriff) aus dem Repository laden"""
+        with self._lock:
+            entry = self._products.get(product_id)
+            if entry is not None and self._is_fresh(entry[0]):
+                self._products.move_to_end(product_id)
+                self.hits += 1
+                return copy.copy(entry[1])
+            if entry is None and self._all_products is not None:
+                stored_at, products = self._all_products
+                if self._is_fresh(stored_at):
+                    self.hits += 1
+                    return copy.copy(products.get(product_id))
+            self.misses += 1
+            generation = self._generation
+
+        product = self.repository.load_product(product_id)
+        with self._lock:
+            if generation == self._generation:
+                self._store_product(product_id, product)
+        return copy.copy(product)
+
+    def load_all_products(self) -> Mapping[str, Product]:
+        """
+        Alle Produkte als schreibgeschützte Sicht, gemerkt bis zum nächsten Schreibzugriff
+
+        Ein Treffer liefert dieselbe Sicht ohne Kopie. Die Produkte darin
+        sind die gecachten Objekte und dürfen nicht verändert werden.
+        """
+        with self._lock:
+            if self._all_products is not None and self._is_fresh(self._all_products[0]):
+                self.hits += 1
+                return self._all_products[1]
+            self.misses += 1
+            generation = self._generation
+
+        products = MappingProxyType(dict(self.repository.load_all_products()))
+        with self._lock:
+            if generation == self._generation:
+                self._all_products = (time.monotonic(), products)
+        return products
+
+    def iter_products(self, batch_size: int = 1000) -> Iterator[Product]:
+        # Streams werden nicht gecacht, sonst wäre der Speicherbedarf nicht konstant
+        return self.repository.iter_products(batch_size)
+
+    def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        return self.repository.search_products(text, category, limit=limit, offset=offset)
+
+    def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        return self.repository.full_text_search(query, limit=limit)
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen und Cache-Eintrag invalidieren"""
+        try:
+            self.repository.delete_product(product_id)
+        finally:
+            self._invalidate([product_id])
+
+    def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        """Stammdaten und Bestand speichern, Cache-Eintrag invalidieren"""
+        try:
+            return self.repository.update_product(product, quantity_delta, movement)
+        finally:
+            self._invalidate([product.id])
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte speichern und den gesamten Produkt-Cache leeren"""
+        try:
+            self.repository.save_products(products)
+        finally:
+            self._invalidate()
+
+    # -------------------- Bewegungen --------------------
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung speichern und Cache-Eintrag des Produkts invalidieren"""
+        try:
+            self.repository.save_movement(movement)
+        finally:
+            self._invalidate([movement.product_id])
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen speichern und betroffene Produkte invalidieren"""
+        product_ids = set()
+
+        def _track(items: Iterable[Movement]):
+            for movement in items:
+                product_ids.add(movement.product_id)
+                yield movement
+
+        try:
+            self.repository.save_movements(_track(movements))
+        finally:
+            self._invalidate(product_ids)
+
+    def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        """Bestand ändern und Cache-Eintrag des Produkts invalidieren"""
+        try:
+            return self.repository.apply_stock_change(product_id, delta, movement)
+        finally:
+            self._invalidate([product_id])
+
+    def load_movements(self) -> List[Movement]:
+        return self.repository.load_movements()
+
+    def iter_movements(
+        self, batch_size: int = 1000, order_by_time: bool = True
+    ) -> Iterator[Movement]:
+        return self.repository.iter_movements(batch_size, order_by_time)
+
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_cursor: Optional[MovementCursor] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        return self.repository.query_movements(
+            product_id=product_id,
+            movement_type=movement_type,
+            performed_by=performed_by,
+            since=since,
+            until=until,
+            after_cursor=after_cursor,
+            limit=limit,
+        )
+
+    def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        return self.repository.save_inventory_snapshot(snapshot_date)
+
+    def load_inventory_snapshot(
+        self, at: date, product_id: Optional[str] = None
+    ) -> InventorySnapshot:
+        return self.repository.load_inventory_snapshot(at, product_id)
+
+    def data_version(self) -> int:
+        return self.repository.data_version()
@@ -0,0 +1,253 @@
+"""JSON-Index - Byte-Offsets der Produkte und Bewegungen eines JSON-Exports
+
+Für den Lazy-Modus des JsonRepository wird die Datei nicht geparst, sondern
+nur nach den Grenzen der Einträge in ``products`` und ``movements``
+durchsucht. Flache Objekte (der Normalfall) werden dabei mit einem einzigen
+regulären Ausdruck übersprungen, sodass Python pro Eintrag statt pro Token
+arbeitet. Der Index wird neben der Datei (``<datei>.idx``) abgelegt und beim
+nächsten Start wiederverwendet, solange Größe und Änderungszeit passen.
+"""
+
+import json
+import mmap
+import os
+import re
+import tempfile
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - abhängig von der Installation
+    orjson = None
+    loads = json.loads
+
+
+INDEX_VERSION = 1
+
+# Zeichenketten als "unrolled loop" (ohne Alternation pro Zeichen)
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_SEPARATOR = re.compile(rb"[ \t\r\n]*,?[ \t\r\n]*")
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+_SCALAR = re.compile(rb"[^,\]}\s]+")
+_TOKEN = re.compile(_STRING_PATTERN + rb"|[\[\]{}]", re.DOTALL)
+# Objekt ohne verschachtelte Objekte/Listen in einem Schritt
+_FLAT_OBJECT = re.compile(rb'\{(?:[^{}\[\]"]+|' + _STRING_PATTERN + rb")*\}", re.DOTALL)
+_PRODUCT_ID = re.compile(
+    rb'"product_id"[ \t\r\n]*:[ \t\r\n]*(' + _STRING_PATTERN + rb")", re.DOTALL
+)
+
+
+@dataclass
+class JsonIndex:
+    """Byte-Bereiche je Produkt-ID und je Bewegung plus übrige Dokumentfelder"""
+
+    products: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    # Flach: start0, end0, start1, end1, ...
+    movements: array = field(default_factory=lambda: array("q"))
+    document: dict = field(default_factory=dict)
+
+
+def _flat_object_end(buffer, pos: int) -> int:
+    """
+    Schneller Pfad: Ende eines flachen Objekts über das nächste ``}`` finden
+
+    Enthält der Abschnitt keine Backslashes, keine weiteren Klammern und eine
+    gerade Anzahl Anführungszeichen, liegt das ``}`` außerhalb von Strings.
+    Sonst -1 (dann übernimmt der reguläre Ausdruck).
+    """
+    end = buffer.find(b"}", pos) + 1
+    if end <= 0:
+        return -1
+    chunk = buffer[pos + 1:end]
+    if (
+        chunk.count(b'"') % 2
+        or b"\\" in chunk
+        or b"{" in chunk
+        or b"[" in chunk
+    ):
+        return -1
+    return end
+
+
+def _skip_value(buffer, pos: int) -> int:
+    """Ende des JSON-Werts ab ``pos`` bestimmen, ohne ihn zu dekodieren"""
+    first = buffer[pos:pos + 1]
+    if first == b'"':
+        return _STRING.match(buffer, pos).end()
+    if first not in (b"{", b"["):
+        return _SCALAR.match(buffer, pos).end()
+
+    if first == b"{":
+        end = _flat_object_end(buffer, pos)
+        if end > 0:
+            return end
+        flat = _FLAT_OBJECT.match(buffer, pos)
+        if flat is not None:
+            return flat.end()
+
+    depth = 0
+    for token in _TOKEN.finditer(buffer, pos):
+        char = token.group()
+        if char in (b"{", b"["):
+            depth += 1
+        elif char in (b"}", b"]"):
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    raise ValueError("Unvollständiges JSON-Dokument")
+
+
+def _expect(buffer, pos: int, char: bytes) -> int:
+    pos = _WHITESPACE.match(buffer, pos).end()
+    if buffer[pos:pos + 1] != char:
+        raise ValueError(f"Ungültiges JSON bei Byte {pos}: {char!r} erwartet")
+    return pos + 1
+
+
+def scan(buffer) -> JsonIndex:
+    """Dokument der Form ``{"products": [...], "movements": [...], ...}`` indizieren"""
+    index = JsonIndex()
+    pos = _expect(buffer, 0, b"{")
+
+    while True:
+        pos = _SEPARATOR.match(buffer, pos).end()
+        if buffer[pos:pos + 1] == b"}":
+            return index
+
+        key_match = _STRING.match(buffer, pos)
+        if key_match is None:
+            raise ValueError(f"Ungültiges JSON bei Byte {pos}: Schlüssel erwartet")
+        key = json.loads(key_match.group())
+        pos = _expect(buffer, key_match.end(), b":")
+        pos = _WHITESPACE.match(buffer, pos).end()
+
+        if key in ("products", "movements") and buffer[pos:pos + 1] == b"[":
+            pos = _scan_array(buffer, pos + 1, index, key)
+        else:
+            end = _skip_value(buffer, pos)
+            index.document[key] = loads(buffer[pos:end])
+            pos = end
+
+
+def _scan_array(buffer, pos: int, index: JsonIndex, key: str) -> int:
+    """Einträge einer Liste erfassen, liefert die Position hinter ``]``"""
+    while True:
+        pos = _SEPARATOR.match(buffer, pos).end()
+        if buffer[pos:pos + 1] == b"]":
+            return pos + 1
+
+        end = _skip_value(buffer, pos)
+        if key == "movements":
+            index.movements.append(pos)
+            index.movements.append(end)
+        else:
+            id_match = _PRODUCT_ID.search(buffer, pos, end)
+            if id_match is None:
+                raise ValueError(f"Produkt ohne product_id bei Byte {pos}")
+            index.products[json.loads(id_match.group(1))] = (pos, end)
+        pos = end
+
+
+# -------------------- Index-Datei --------------------
+
+
+def index_path(json_path: Path) -> Path:
+    return json_path.with_name(json_path.name + ".idx")
+
+
+def _write_index(path: Path, index: JsonIndex, stat: os.stat_result) -> None:
+    """Index als JSON-Kopfzeile plus Binärteil (IDs, Offsets) atomar schreiben"""
+    ids = list(index.products)
+    if any("\n" in product_id for product_id in ids):
+        # IDs werden zeilenweise abgelegt; solche Dateien werden jedes Mal gescannt
+        return
+    offsets = array("q")
+    for product_id in ids:
+        offsets.extend(index.products[product_id])
+    id_bytes = "\n".join(ids).encode("utf-8")
+    header = {
+        "version": INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "products": len(ids),
+        "movements": len(index.movements) // 2,
+        "id_bytes": len(id_bytes),
+        "document": index.document,
+    }
+
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.write(id_bytes)
+            f.write(offsets.tobytes())
+            f.write(index.movements.tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _read_index(path: Path, stat: os.stat_result):
+    """Gespeicherten Index laden, None wenn er fehlt oder veraltet ist"""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+
+    newline = data.find(b"\n")
+    try:
+        header = json.loads(data[:newline])
+    except ValueError:
+        return None
+    if (
+        header.get("version") != INDEX_VERSION
+        or header.get("size") != stat.st_size
+        or header.get("mtime_ns") != stat.st_mtime_ns
+    ):
+        return None
+
+    pos = newline + 1
+    id_bytes = data[pos:pos + header["id_bytes"]]
+    pos += header["id_bytes"]
+    offsets = array("q")
+    offsets.frombytes(data[pos:pos + header["products"] * 16])
+    pos += header["products"] * 16
+    movements = array("q")
+    movements.frombytes(data[pos:pos + header["movements"] * 16])
+
+    ids: List[str] = id_bytes.decode("utf-8").split("\n") if header["products"] else []
+    products = {
+        product_id: (offsets[2 * i], offsets[2 * i + 1]) for i, product_id in enumerate(ids)
+    }
+    return JsonIndex(products=products, movements=movements, document=header["document"])
+
+
+def open_indexed(json_path: Path) -> Tuple[mmap.mmap, JsonIndex]:
+    """
+    Datei per mmap öffnen und den (ggf. zwischengespeicherten) Index liefern
+
+    Returns:
+        (mmap der Datei, JsonIndex); die mmap muss vom Aufrufer geschlossen werden
+    """
+    with open(json_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    cache = index_path(json_path)
+    index = _read_index(cache, stat)
+    if index is None:
+        index = scan(buffer)
+        try:
+            _write_index(cache, index, stat)
+        except OSError:
+            # Schreibgeschütztes Verzeichnis: Index gilt nur für diesen Prozess
+            pass
+    return buffer, index
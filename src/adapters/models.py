@@ -3,11 +3,12 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Float, Integer, DateTime, Text, Boolean, 
-    ForeignKey, CheckConstraint, Index, create_engine
+    ForeignKey, CheckConstraint, Index, create_engine, event, text
 )
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
-from typing import Optional
+from typing import Dict, Optional, Union
 
 Base = declarative_base()
 
@@ -197,33 +198,317 @@ class InventorySnapshotORM(Base):
     
     __table_args__ = (
         Index('idx_inventory_snapshots_date', 'snapshot_date'),
+        # Ein Snapshot je Produkt und Tag (Ziel von ON CONFLICT beim Snapshot-Job)
+        Index(
+            'uq_inventory_snapshots_day', 'warehouse_id', 'product_id', 'snapshot_date',
+            unique=True,
+        ),
     )
     
     def __repr__(self):
         return f"<InventorySnapshot {self.product_id} on {self.snapshot_date}: {self.quantity} units>"
 
 
+# Volltextindex (FTS5) für Produkte - identisch zu data/schema.sql
+PRODUCTS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description, sku,
+        content='products', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.rowid, new.name, new.description, new.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.rowid, old.name, old.description, old.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_update
+    AFTER UPDATE OF name, description, sku ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.rowid, old.name, old.description, old.sku);
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.rowid, new.name, new.description, new.sku);
+    END
+    """,
+]
+
+
+def has_products_fts(engine) -> bool:
+    """Prüft ob der FTS5-Produktindex in der Datenbank existiert"""
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'products_fts'")
+        ).first() is not None
+
+
+def init_products_fts(engine) -> bool:
+    """
+    Legt den FTS5-Produktindex samt Sync-Triggern an
+
+    Bei neu angelegtem Index werden bereits vorhandene Produkte einmalig
+    indiziert ('rebuild'). Ist SQLite ohne FTS5 kompiliert, wird nichts
+    angelegt und False zurückgegeben.
+    """
+    if has_products_fts(engine):
+        return True
+    try:
+        with engine.begin() as conn:
+            for statement in PRODUCTS_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+    except OperationalError:
+        # z.B. "no such module: fts5"
+        return False
+    return True
+
+
+# Trigramm-Index für die Teilstring-Suche über "<id> <name>" - identisch zu data/schema.sql
+PRODUCTS_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_search USING fts5(
+        haystack, tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_insert AFTER INSERT ON products BEGIN
+        INSERT INTO products_search(rowid, haystack) VALUES (new.rowid, new.id || ' ' || new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_delete AFTER DELETE ON products BEGIN
+        DELETE FROM products_search WHERE rowid = old.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_update AFTER UPDATE OF id, name ON products BEGIN
+        DELETE FROM products_search WHERE rowid = old.rowid;
+        INSERT INTO products_search(rowid, haystack) VALUES (new.rowid, new.id || ' ' || new.name);
+    END
+    """,
+]
+
+
+def has_products_search(engine) -> bool:
+    """Prüft ob der Trigramm-Suchindex in der Datenbank existiert"""
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'products_search'")
+        ).first() is not None
+
+
+def init_products_search(engine) -> bool:
+    """
+    Legt den Trigramm-Suchindex samt Sync-Triggern an und füllt ihn
+
+    Der Trigramm-Tokenizer braucht SQLite ab 3.34 mit FTS5; fehlt er, wird
+    nichts angelegt und False zurückgegeben (``search_products`` sucht dann
+    ohne Index).
+    """
+    if has_products_search(engine):
+        return True
+    try:
+        with engine.begin() as conn:
+            for statement in PRODUCTS_SEARCH_DDL:
+                conn.execute(text(statement))
+            conn.execute(text(
+                "INSERT INTO products_search(rowid, haystack)"
+                " SELECT rowid, id || ' ' || name FROM products"
+            ))
+    except OperationalError:
+        # z.B. "no such module: fts5" oder "no such tokenizer: trigram"
+        return False
+    return True
+
+
+# Aktuelle Schema-Version, gespeichert in PRAGMA user_version.
+# data/schema.sql setzt denselben Wert und muss bei Änderungen angepasst werden.
+SCHEMA_VERSION = 3
+
+
+def _migrate_v1(engine) -> None:
+    """Basis-Schema: alle ORM-Tabellen und der FTS5-Produktindex"""
+    Base.metadata.create_all(engine)
+    init_products_fts(engine)
+
+
+def _migrate_v2(engine) -> None:
+    """Eindeutiger Snapshot je Produkt und Tag (Voraussetzung für den Snapshot-Job)"""
+    with engine.begin() as conn:
+        # Doppelte Zeilen (vor v2 möglich) auf die jüngste reduzieren
+        conn.execute(text(
+            "DELETE FROM inventory_snapshots WHERE id NOT IN ("
+            " SELECT MAX(id) FROM inventory_snapshots"
+            " GROUP BY warehouse_id, product_id, snapshot_date)"
+        ))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_inventory_snapshots_day"
+            " ON inventory_snapshots(warehouse_id, product_id, snapshot_date)"
+        ))
+
+
+def _migrate_v3(engine) -> None:
+    """Trigramm-Suchindex für search_products"""
+    init_products_search(engine)
+
+
+# Migrationen je Zielversion; jede Migration muss idempotent sein,
+# da ein Abbruch vor dem Setzen von user_version eine Wiederholung auslöst
+MIGRATIONS = {
+    1: _migrate_v1,
+    2: _migrate_v2,
+    3: _migrate_v3,
+}
+
+
+def get_schema_version(engine) -> int:
+    """Schema-Version der Datenbank lesen (PRAGMA user_version)"""
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def migrate_db(engine) -> int:
+    """
+    Fehlende Migrationen ausführen
+
+    Returns:
+        Schema-Version vor der Migration
+    """
+    current = get_schema_version(engine)
+    for version in range(current + 1, SCHEMA_VERSION + 1):
+        MIGRATIONS[version](engine)
+        with engine.begin() as conn:
+            conn.execute(text(f"PRAGMA user_version = {version}"))
+    return current
+
+
+# Performance-Profile: PRAGMAs, die beim Öffnen jeder Verbindung gesetzt werden
+#   durable   - Rollback-Journal, fsync bei jedem Commit (SQLite-Standardverhalten)
+#   balanced  - WAL + synchronous=NORMAL: Commits ohne fsync, bei Stromausfall
+#               gehen höchstens die letzten Transaktionen verloren, nie die Konsistenz
+#   bulk-load - für Importe, die bei Absturz wiederholt werden können
+SQLITE_PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    "durable": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,  # negativ = KiB, also 64 MiB
+        "mmap_size": 268435456,  # 256 MiB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,  # 256 MiB
+        "mmap_size": 1073741824,  # 1 GiB
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+}
+
+_ALLOWED_PRAGMAS = {
+    "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout",
+}
+
+
+def resolve_sqlite_profile(
+    profile: Union[str, Dict[str, Union[str, int]], None]
+) -> Dict[str, Union[str, int]]:
+    """
+    Performance-Profil in ein PRAGMA-Dictionary auflösen
+
+    Args:
+        profile: Name aus SQLITE_PROFILES, eigenes PRAGMA-Dictionary oder None
+
+    Raises:
+        ValueError: Unbekanntes Profil oder nicht unterstütztes PRAGMA
+    """
+    if profile is None:
+        return {}
+    if isinstance(profile, str):
+        if profile not in SQLITE_PROFILES:
+            raise ValueError(
+                f"Unbekanntes SQLite-Profil: {profile} "
+                f"(verfügbar: {', '.join(SQLITE_PROFILES)})"
+            )
+        return dict(SQLITE_PROFILES[profile])
+
+    unknown = set(profile) - _ALLOWED_PRAGMAS
+    if unknown:
+        raise ValueError(f"Nicht unterstützte PRAGMAs: {', '.join(sorted(unknown))}")
+    for value in profile.values():
+        if not isinstance(value, int) and not str(value).replace("_", "").isalnum():
+            raise ValueError(f"Ungültiger PRAGMA-Wert: {value!r}")
+    return dict(profile)
+
+
+def apply_sqlite_pragmas(engine, pragmas: Dict[str, Union[str, int]]) -> None:
+    """PRAGMAs auf jede neue Verbindung der Engine anwenden"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
 def get_database_url(db_path: str = "warehouse.db") -> str:
     """Erzeugt SQLite Connection String"""
     return f"sqlite:///{db_path}"
 
 
-def create_db_session(db_url: str = None):
-    """Erstellt SQLAlchemy Session für Datenbank-Operationen"""
+def create_db_session(db_url: str = None, profile=None):
+    """
+    Erstellt SQLAlchemy Session für Datenbank-Operationen
+
+    Args:
+        db_url: SQLite Connection String
+        profile: Performance-Profil (siehe SQLITE_PROFILES) oder PRAGMA-Dictionary
+    """
     if db_url is None:
         db_url = get_database_url()
     
+    pragmas = resolve_sqlite_profile(profile)
     engine = create_engine(db_url, echo=False)
+    apply_sqlite_pragmas(engine, pragmas)
     Session = sessionmaker(bind=engine)
     return engine, Session
 
 
-def init_db(db_url: str = None):
-    """Initialisiert Datenbank-Schema"""
-    if db_url is None:
-        db_url = get_database_url()
-    
-    engine = create_engine(db_url, echo=False)
-    Base.metadata.create_all(engine)
+def init_db(db_url: str = None, engine=None):
+    """
+    Initialisiert Datenbank-Schema
+
+    Eine aktuelle Datenbank kostet nur ein ``PRAGMA user_version``; Tabellen
+    werden nur angelegt bzw. migriert, wenn sich die Schema-Version ändert.
+
+    Args:
+        db_url: SQLite Connection String (nur wenn keine Engine übergeben wird)
+        engine: bestehende Engine, die weiterverwendet werden soll
+    """
+    if engine is None:
+        if db_url is None:
+            db_url = get_database_url()
+        engine = create_engine(db_url, echo=False)
+
+    migrate_db(engine)
     return engine
 
@@ -0,0 +1,576 @@
+"""Movement-Log Adapter - Lagerbewegungen in einer mmap-Datei mit festen Datensätzen
+
+Bewegungen werden nur angehängt und nie geändert. Jeder Datensatz ist
+64 Byte breit (acht int64)::
+
+    timestamp (µs seit 1970) | quantity_change | id | product_id | product_name
+    | movement_type | reason (-1 = None) | performed_by
+
+Die String-Felder sind Offsets in eine zweite, ebenfalls nur wachsende Datei
+(``<log>.heap``, je String ``<uint32 Länge><UTF-8>``). Wiederkehrende Strings
+(Produkt-ID, Name, Typ, Benutzer) werden pro Prozess nur einmal abgelegt.
+
+Gelesen wird über ``mmap``: Zeitbereiche werden per Binärsuche auf der
+Zeitstempel-Spalte gefunden und als ``memoryview`` ohne Kopie geliefert.
+Ein Index Produkt-ID -> Datensatznummern wird beim Öffnen aufgebaut und
+bei jedem Anhängen ergänzt. Solange Bewegungen in zeitlicher Reihenfolge
+angehängt werden (Normalfall), ist die Datei nach Zeit sortiert; ältere
+Nachzügler setzen ein Flag im Kopf, danach wird bei Abfragen sortiert.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement, end_of_day
+from ..ports import InventorySnapshot, MovementCursor, RepositoryPort
+from .repository import (
+    InMemoryRepository,
+    _filter_movements,
+    _latest_inventory_snapshot,
+    _movement_sort_key,
+    _stock_at_boundary,
+)
+
+MAGIC = b"LAGMVLOG"
+LOG_VERSION = 1
+
+RECORD = struct.Struct("<8q")
+RECORD_SIZE = RECORD.size
+FIELDS = 8
+# Spalten eines Datensatzes
+TIMESTAMP, QUANTITY, ID, PRODUCT_ID, PRODUCT_NAME, TYPE, REASON, USER = range(FIELDS)
+
+# Kopf: Magic, Version, Flags, auf Datensatzbreite aufgefüllt
+_HEADER = struct.Struct("<8sHH")
+_FLAG_UNORDERED = 1
+_LENGTH = struct.Struct("<I")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+class MovementLog:
+    """Append-only Datei fester Datensätze für Lagerbewegungen"""
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            # Spalten werden per memoryview.cast in Maschinen-Byte-Reihenfolge gelesen
+            raise RuntimeError("MovementLog setzt eine little-endian Plattform voraus")
+
+        self.path = Path(path)
+        self.heap_path = self.path.with_name(self.path.name + ".heap")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+
+        for file_path in (self.path, self.heap_path):
+            if not file_path.exists():
+                file_path.touch()
+        self._file = open(self.path, "r+b", buffering=0)
+        self._heap = open(self.heap_path, "r+b", buffering=0)
+
+        size = os.fstat(self._file.fileno()).st_size
+        if size == 0:
+            self._flags = 0
+            self._write_header()
+            size = RECORD_SIZE
+        else:
+            magic, version, self._flags = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} ist kein Movement-Log")
+            if version != LOG_VERSION:
+                raise ValueError(f"Movement-Log-Version {version} wird nicht unterstützt")
+
+        # Unvollständigen letzten Datensatz (Absturz beim Schreiben) abschneiden
+        self._count = (size - RECORD_SIZE) // RECORD_SIZE
+        if RECORD_SIZE * (self._count + 1) != size:
+            self._file.truncate(RECORD_SIZE * (self._count + 1))
+        self._heap_size = os.fstat(self._heap.fileno()).st_size
+
+        self._records_map = None
+        self._records: memoryview = memoryview(b"").cast("q")
+        self._heap_map = None
+        self._mapped_heap_size = 0
+        # Dekodierte Strings der wiederkehrenden Felder: Offset -> String
+        self._decoded: Dict[int, str] = {}
+        # Beim Schreiben: String -> Offset (nur wiederkehrende Felder)
+        self._interned: Dict[str, int] = {}
+        self._product_index: Dict[str, array] = {}
+        self._last_timestamp = None
+
+        self._build_product_index()
+
+    # -------------------- Dateiverwaltung --------------------
+
+    def _write_header(self) -> None:
+        header = _HEADER.pack(MAGIC, LOG_VERSION, self._flags)
+        self._file.seek(0)
+        self._file.write(header.ljust(RECORD_SIZE, b"\0"))
+
+    @property
+    def time_ordered(self) -> bool:
+        """True, solange alle Datensätze nach Zeitstempel sortiert angehängt wurden"""
+        return not self._flags & _FLAG_UNORDERED
+
+    def __len__(self) -> int:
+        return self._count
+
+    def records(self) -> memoryview:
+        """Alle Datensätze als int64-``memoryview`` (FIELDS Werte je Datensatz, ohne Kopie)"""
+        with self._lock:
+            if len(self._records) != self._count * FIELDS:
+                self._remap()
+            return self._records
+
+    def _remap(self) -> None:
+        # Alte Abbildungen nicht schließen: ausgegebene memoryviews bleiben
+        # gültig, die mmap wird freigegeben, sobald niemand sie mehr hält
+        end = RECORD_SIZE * (self._count + 1)
+        if self._count == 0:
+            self._records = memoryview(b"").cast("q")
+            return
+        self._records_map = mmap.mmap(self._file.fileno(), end, access=mmap.ACCESS_READ)
+        self._records = memoryview(self._records_map)[RECORD_SIZE:end].cast("q")
+
+    def _heap_buffer(self, offset: int):
+        if offset >= self._mapped_heap_size:
+            with self._lock:
+                self._heap_map = mmap.mmap(
+                    self._heap.fileno(), self._heap_size, access=mmap.ACCESS_READ
+                )
+                self._mapped_heap_size = self._heap_size
+        return self._heap_map
+
+    def _string(self, offset: int) -> Optional[str]:
+        if offset < 0:
+            return None
+        buffer = self._heap_buffer(offset)
+        (length,) = _LENGTH.unpack_from(buffer, offset)
+        start = offset + _LENGTH.size
+        return buffer[start:start + length].decode("utf-8")
+
+    def _cached_string(self, offset: int) -> Optional[str]:
+        value = self._decoded.get(offset)
+        if value is None:
+            value = self._string(offset)
+            if value is not None:
+                self._decoded[offset] = value
+        return value
+
+    def _build_product_index(self) -> None:
+        """Index Produkt-ID -> Datensatznummern (aufsteigend) aus der Datei aufbauen"""
+        records = self.records()
+        by_offset: Dict[int, array] = {}
+        for number, offset in enumerate(records[PRODUCT_ID::FIELDS]):
+            numbers = by_offset.get(offset)
+            if numbers is None:
+                numbers = by_offset[offset] = array("q")
+            numbers.append(number)
+
+        for offset, numbers in by_offset.items():
+            product_id = self._cached_string(offset)
+            self._interned.setdefault(product_id, offset)
+            existing = self._product_index.get(product_id)
+            if existing is None:
+                self._product_index[product_id] = numbers
+            else:
+                # Gleiche ID aus verschiedenen Sitzungen (mehrere Heap-Einträge)
+                merged = sorted(existing + numbers)
+                self._product_index[product_id] = array("q", merged)
+        if self._count:
+            self._last_timestamp = records[(self._count - 1) * FIELDS + TIMESTAMP]
+
+    # -------------------- Schreiben --------------------
+
+    def append(self, movements: Iterable[Movement]) -> None:
+        """
+        Bewegungen anhängen
+
+        Neue Strings werden mit einem Schreibzugriff an den Heap angehängt,
+        danach alle Datensätze mit einem Schreibzugriff an das Log. Ein
+        Absturz dazwischen hinterlässt nur unreferenzierte Heap-Bytes.
+        Die Dateien sind ungepuffert, die Daten liegen also sofort beim
+        Betriebssystem; dauerhaft gespeichert sind sie erst nach ``sync()``.
+        """
+        with self._lock:
+            heap_chunks: List[bytes] = []
+            heap_end = self._heap_size
+            pending: Dict[str, int] = {}
+
+            def store(value: Optional[str], intern: bool) -> int:
+                nonlocal heap_end
+                if value is None:
+                    return -1
+                if intern:
+                    offset = self._interned.get(value)
+                    if offset is None:
+                        offset = pending.get(value)
+                    if offset is not None:
+                        return offset
+                encoded = value.encode("utf-8")
+                offset = heap_end
+                heap_chunks.append(_LENGTH.pack(len(encoded)) + encoded)
+                heap_end += _LENGTH.size + len(encoded)
+                if intern:
+                    pending[value] = offset
+                return offset
+
+            records = []
+            product_ids = []
+            unordered = False
+            last_timestamp = self._last_timestamp
+            for movement in movements:
+                timestamp = _to_micros(movement.timestamp)
+                if last_timestamp is not None and timestamp < last_timestamp:
+                    unordered = True
+                last_timestamp = timestamp if last_timestamp is None else max(
+                    last_timestamp, timestamp
+                )
+                records.append(
+                    RECORD.pack(
+                        timestamp,
+                        movement.quantity_change,
+                        store(movement.id, False),
+                        store(movement.product_id, True),
+                        store(movement.product_name, True),
+                        store(movement.movement_type, True),
+                        store(movement.reason, False),
+                        store(movement.performed_by, True),
+                    )
+                )
+                product_ids.append(movement.product_id)
+            if not records:
+                return
+
+            if heap_chunks:
+                self._heap.seek(self._heap_size)
+                self._heap.write(b"".join(heap_chunks))
+                self._heap_size = heap_end
+            self._file.seek(RECORD_SIZE * (self._count + 1))
+            self._file.write(b"".join(records))
+
+            self._interned.update(pending)
+            for product_id in product_ids:
+                numbers = self._product_index.get(product_id)
+                if numbers is None:
+                    numbers = self._product_index[product_id] = array("q")
+                numbers.append(self._count)
+                self._count += 1
+            self._last_timestamp = last_timestamp
+            if unordered and self.time_ordered:
+                self._flags |= _FLAG_UNORDERED
+                self._write_header()
+
+    def sync(self) -> None:
+        """
+        Log und Heap per fsync dauerhaft speichern
+
+        Zuerst den Heap, damit ein gespeicherter Datensatz nie auf
+        verlorene Strings zeigt. Mehrere ``append`` können mit einem
+        ``sync`` abgeschlossen werden (siehe ``MovementLogRepository.sync_every``).
+        """
+        with self._lock:
+            os.fsync(self._heap.fileno())
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            self._records = memoryview(b"").cast("q")
+            self._file.close()
+            self._heap.close()
+
+    # -------------------- Lesen --------------------
+
+    def time_range(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> Tuple[int, int]:
+        """Datensatzbereich [lo, hi) für since <= timestamp < until (nur bei time_ordered)"""
+        timestamps = self.records()[TIMESTAMP::FIELDS]
+        lo = 0 if since is None else bisect_left(timestamps, _to_micros(since))
+        hi = len(timestamps) if until is None else bisect_left(timestamps, _to_micros(until))
+        return lo, max(lo, hi)
+
+    def slice(self, lo: int, hi: int) -> memoryview:
+        """Datensätze [lo, hi) als int64-``memoryview`` ohne Kopie"""
+        return self.records()[lo * FIELDS:hi * FIELDS]
+
+    def product_records(self, product_id: str) -> Sequence[int]:
+        """Datensatznummern eines Produkts in Anhängereihenfolge"""
+        return self._product_index.get(product_id, ())
+
+    def string(self, offset: int) -> Optional[str]:
+        """String zu einem Heap-Offset aus einer String-Spalte (-1 = None)"""
+        return self._cached_string(offset)
+
+    def timestamp_at(self, number: int) -> int:
+        return self.records()[number * FIELDS + TIMESTAMP]
+
+    def movement(self, number: int) -> Movement:
+        """Datensatz als Movement dekodieren"""
+        values = self.records()[number * FIELDS:(number + 1) * FIELDS]
+        return Movement(
+            id=self._string(values[ID]),
+            product_id=self._cached_string(values[PRODUCT_ID]),
+            product_name=self._cached_string(values[PRODUCT_NAME]),
+            quantity_change=values[QUANTITY],
+            movement_type=self._cached_string(values[TYPE]),
+            reason=self._string(values[REASON]),
+            timestamp=_EPOCH + timedelta(microseconds=values[TIMESTAMP]),
+            performed_by=self._cached_string(values[USER]),
+        )
+
+
+class MovementLogRepository(RepositoryPort):
+    """
+    Repository mit Bewegungen im MovementLog und Produkten in einem anderen Repository
+
+    Produkte werden an ``product_repository`` (z.B. SqliteRepository oder
+    InMemoryRepository) delegiert; dessen Bewegungsspeicher wird nicht benutzt.
+    Bei ``apply_stock_change`` ändert zuerst das bedingte Update des
+    Produkt-Repositorys den Bestand (bei SQLite auch über Prozessgrenzen
+    atomar), erst danach wird die Bewegung angehängt. Eine abgelehnte
+    Buchung hinterlässt so keine Bewegung im Log; ein Absturz zwischen
+    beiden Schritten verliert höchstens die Bewegung, nie eine Bestandsänderung.
+    """
+
+    def __init__(
+        self,
+        log_path,
+        product_repository: Optional[RepositoryPort] = None,
+        sync_every: int = 1,
+    ):
+        """
+        Args:
+            log_path: Pfad der Log-Datei (daneben entsteht ``<log_path>.heap``)
+            product_repository: Repository für Produkte (Standard: InMemoryRepository)
+            sync_every: Schreibzugriffe auf das Log pro fsync (1 = jeder Schreibzugriff);
+                ``sync()`` erzwingt es sofort
+        """
+        if sync_every < 1:
+            raise ValueError("sync_every muss mindestens 1 sein")
+        self.log = MovementLog(log_path)
+        if product_repository is None:
+            product_repository = InMemoryRepository()
+        self.products = product_repository
+        self.sync_every = sync_every
+        self._unsynced = 0
+        self._lock = threading.RLock()
+        # Bestands-Snapshots als JSON-Zeilen neben dem Log; der Snapshot-Speicher
+        # des Produkt-Repositorys kennt die Bewegungen im Log nicht
+        self.snapshot_path = Path(f"{log_path}.snapshots")
+        self.inventory_snapshots: Dict[date, Dict[str, int]] = {}
+        self._snapshot_writes = 0
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Unvollständige letzte Zeile nach einem Absturz
+                        break
+                    self.inventory_snapshots[date.fromisoformat(entry["date"])] = (
+                        entry["quantities"]
+                    )
+
+    def _append(self, movements: Iterable[Movement]) -> None:
+        """Bewegungen anhängen, alle ``sync_every`` Schreibzugriffe per fsync sichern"""
+        with self._lock:
+            self.log.append(movements)
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every:
+                self.sync()
+
+    def sync(self) -> None:
+        """Angehängte Bewegungen per fsync dauerhaft speichern"""
+        with self._lock:
+            if self._unsynced:
+                self.log.sync()
+            self._unsynced = 0
+
+    def close(self) -> None:
+        self.sync()
+        self.log.close()
+        close = getattr(self.products, "close", None)
+        if close is not None:
+            close()
+
+    # -------------------- Produkte --------------------
+
+    def save_product(self, product: Product) -> None:
+        self.products.save_product(product)
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        return self.products.load_product(product_id)
+
+    def load_all_products(self) -> Dict[str, Product]:
+        return self.products.load_all_products()
+
+    def iter_products(self, batch_size: int = 1000) -> Iterator[Product]:
+        return self.products.iter_products(batch_size)
+
+    def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        return self.products.search_products(text, category, limit=limit, offset=offset)
+
+    def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        return self.products.full_text_search(query, limit=limit)
+
+    def delete_product(self, product_id: str) -> None:
+        # Bewegungen bleiben als Protokoll erhalten
+        self.products.delete_product(product_id)
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        self.products.save_products(products)
+
+    def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        """Stammdaten und Bestand über das Produkt-Repository, danach Bewegung ins Log"""
+        quantity = self.products.update_product(product, quantity_delta)
+        if movement is not None:
+            if not movement.product_name:
+                movement.product_name = product.name
+            self._append([movement])
+        return quantity
+
+    # -------------------- Bewegungen --------------------
+
+    def save_movement(self, movement: Movement) -> None:
+        self._append([movement])
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        self._append(movements)
+
+    def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        """Bestand per bedingtem Update im Produkt-Repository ändern, danach Bewegung anhängen"""
+        quantity = self.products.apply_stock_change(product_id, delta)
+        if movement is not None:
+            if not movement.product_name:
+                product = self.products.load_product(product_id)
+                movement.product_name = product.name if product is not None else ""
+            self._append([movement])
+        return quantity
+
+    def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        """Snapshot aus Produkten und Log berechnen und an die Snapshot-Datei anhängen"""
+        boundary = end_of_day(snapshot_date)
+        with self._lock:
+            quantities = _stock_at_boundary(
+                self.products.iter_products(), self.query_movements(since=boundary), boundary
+            )
+            entry = {"date": snapshot_date.isoformat(), "quantities": quantities}
+            with open(self.snapshot_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.inventory_snapshots[snapshot_date] = quantities
+            self._snapshot_writes += 1
+            return len(quantities)
+
+    def load_inventory_snapshot(
+        self, at: date, product_id: Optional[str] = None
+    ) -> InventorySnapshot:
+        return _latest_inventory_snapshot(self.inventory_snapshots, at, product_id)
+
+    def data_version(self) -> int:
+        """Datenstand der Produkte + Länge des Logs + geschriebene Snapshots (alle monoton)"""
+        return self.products.data_version() + len(self.log) + self._snapshot_writes
+
+    def load_movements(self) -> List[Movement]:
+        return list(self.iter_movements(order_by_time=False))
+
+    def iter_movements(
+        self, batch_size: int = 1000, order_by_time: bool = True
+    ) -> Iterator[Movement]:
+        """Bewegungen dekodiert liefern; die Datei wird dabei nicht kopiert"""
+        count = len(self.log)
+        if order_by_time and not self.log.time_ordered:
+            numbers = sorted(range(count), key=lambda n: _movement_sort_key(self.log.movement(n)))
+            for number in numbers:
+                yield self.log.movement(number)
+            return
+        for number in range(count):
+            yield self.log.movement(number)
+
+    def _candidates(
+        self,
+        product_id: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime],
+    ) -> Sequence[int]:
+        """Datensatznummern, die Produkt- und Zeitfilter erfüllen können"""
+        if self.log.time_ordered:
+            lo, hi = self.log.time_range(since, until)
+        else:
+            lo, hi = 0, len(self.log)
+        if product_id is None:
+            return range(lo, hi)
+        numbers = self.log.product_records(product_id)
+        return numbers[bisect_left(numbers, lo):bisect_left(numbers, hi)]
+
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_cursor: Optional[MovementCursor] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        """
+        Bewegungen über Produktindex und Binärsuche im Zeitbereich laden
+
+        Bei zeitlich sortiertem Log und gesetztem ``limit`` wird nach der
+        ersten vollen Seite abgebrochen, Keyset-Seiten kosten also O(Seite).
+        """
+        if after_cursor is not None and (since is None or after_cursor[0] > since):
+            since = after_cursor[0]
+        candidates = self._candidates(product_id, since, until)
+        movements = (self.log.movement(number) for number in candidates)
+
+        if limit is None or not self.log.time_ordered:
+            return _filter_movements(
+                movements,
+                movement_type=movement_type,
+                performed_by=performed_by,
+                since=since,
+                until=until,
+                after_cursor=after_cursor,
+                limit=limit,
+            )
+
+        page: List[Movement] = []
+        for movement in movements:
+            # Gleiche Zeitstempel werden nach ID sortiert: erst abbrechen,
+            # wenn der Zeitstempel die volle Seite übersteigt
+            if len(page) >= limit and movement.timestamp > page[-1].timestamp:
+                break
+            if (
+                (movement_type is None or movement.movement_type == movement_type)
+                and (performed_by is None or movement.performed_by == performed_by)
+                and (after_cursor is None or _movement_sort_key(movement) > after_cursor)
+            ):
+                page.append(movement)
+        page.sort(key=_movement_sort_key)
+        return page[:limit]
@@ -1,9 +1,138 @@
-"""Report Adapter - Report-Generierung"""
+"""Report Adapter - Report-Generierung
 
-from typing import Dict
+Die Reports werden zeilenweise erzeugt (``iter_inventory_report``,
+``iter_movement_report``) und können direkt in eine Datei oder einen
+anderen Stream geschrieben werden (``write_report``). Summen werden beim
+Durchlauf mitgezählt, daher reicht ein einziger Durchlauf über die Daten;
+weder die Daten noch der fertige Text müssen vollständig im Speicher liegen.
+"""
 
+import io
+from itertools import chain
+from typing import Dict, Iterable, Iterator, Optional, TextIO
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
 from ..ports import ReportPort
 
+# Zeilen pro write()-Aufruf beim Schreiben in einen Stream
+WRITE_BATCH_LINES = 1000
+
+
+def _peek(items: Iterable) -> Optional[Iterator]:
+    """Iterator mit erstem Element wieder vorne, None wenn leer"""
+    iterator = iter(items)
+    for first in iterator:
+        return chain((first,), iterator)
+    return None
+
+
+def iter_inventory_report(products: Iterable[Product]) -> Iterator[str]:
+    """
+    Lagerbestandsbericht (Report A) zeilenweise erzeugen
+
+    Args:
+        products: Produkte in Ausgabereihenfolge (z.B. ``repository.iter_products()``)
+
+    Yields:
+        Zeilen inklusive Zeilenumbruch
+    """
+    products = _peek(products)
+    if products is None:
+        yield "Lager ist leer.\n"
+        return
+
+    yield "=" * 60 + "\n"
+    yield "LAGERBESTANDSBERICHT\n"
+    yield "=" * 60 + "\n"
+    yield "\n"
+
+    total_value = 0
+    for product in products:
+        value = product.get_total_value()
+        total_value += value
+        yield f"ID: {product.id}\n"
+        yield f"  Name: {product.name}\n"
+        yield f"  Kategorie: {product.category}\n"
+        yield f"  Bestand: {product.quantity}\n"
+        yield f"  Preis: {product.price:.2f} €\n"
+        yield f"  Gesamtwert: {value:.2f} €\n"
+        yield "\n"
+
+    yield "-" * 60 + "\n"
+    yield f"Gesamtwert Lager: {total_value:.2f} €\n"
+    yield "=" * 60 + "\n"
+
+
+def iter_movement_report(movements: Iterable[Movement]) -> Iterator[str]:
+    """
+    Bewegungsprotokoll (Report B) zeilenweise erzeugen
+
+    Args:
+        movements: Bewegungen, bereits nach Zeit sortiert
+            (z.B. ``repository.iter_movements()`` oder seitenweise ``query_movements``)
+
+    Yields:
+        Zeilen inklusive Zeilenumbruch
+    """
+    movements = _peek(movements)
+    if movements is None:
+        yield "Keine Lagerbewegungen vorhanden.\n"
+        return
+
+    yield "=" * 80 + "\n"
+    yield "BEWEGUNGSPROTOKOLL\n"
+    yield "=" * 80 + "\n"
+    yield "Zeit               | Artikel | Typ | Menge | User | Grund\n"
+    yield "-" * 80 + "\n"
+
+    total_in = total_out = count = 0
+    for m in movements:
+        if m.quantity_change > 0:
+            total_in += m.quantity_change
+        else:
+            total_out -= m.quantity_change
+        count += 1
+        ts = m.timestamp.strftime("%Y-%m-%d %H:%M")
+        reason = (m.reason or "-").replace("\n", " ").strip()
+        yield (
+            f"{ts} | {m.product_id} | {m.movement_type} | {m.quantity_change:+d} | "
+            f"{m.performed_by} | {reason}\n"
+        )
+
+    yield "-" * 80 + "\n"
+    yield f"Summe IN: {total_in} | Summe OUT: {total_out} | Netto: {total_in - total_out}\n"
+    yield f"Gesamtbewegungen: {count}\n"
+    yield "=" * 80 + "\n"
+
+
+def write_report(lines: Iterable[str], out: TextIO) -> int:
+    """
+    Zeilen blockweise in einen Stream schreiben
+
+    Returns:
+        Anzahl geschriebener Zeilen
+    """
+    written = 0
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= WRITE_BATCH_LINES:
+            out.write("".join(batch))
+            written += len(batch)
+            batch.clear()
+    if batch:
+        out.write("".join(batch))
+        written += len(batch)
+    return written
+
+
+def render_report(lines: Iterable[str]) -> str:
+    """Zeilen zu einem String zusammensetzen (linear, ohne ``+=``)"""
+    buffer = io.StringIO()
+    write_report(lines, buffer)
+    return buffer.getvalue()
+
 
 class ConsoleReportAdapter(ReportPort):
     """Report-Adapter für Konsolenausgabe"""
@@ -12,6 +141,9 @@ class ConsoleReportAdapter(ReportPort):
         self.products = products or {}
         self.movements = movements or []
 
+    def _sorted_movements(self) -> list:
+        return sorted(self.movements, key=lambda m: m.timestamp)
+
     def generate_inventory_report(self) -> str:
         """
         Lagerbestandsbericht als Text generieren
@@ -19,29 +151,7 @@ class ConsoleReportAdapter(ReportPort):
         Returns:
             Formatierter Bericht
         """
-        if not self.products:
-            return "Lager ist leer.\n"
-
-        report = "=" * 60 + "\n"
-        report += "LAGERBESTANDSBERICHT\n"
-        report += "=" * 60 + "\n\n"
-
-        total_value = 0
-        for product_id, product in self.products.items():
-            value = product.get_total_value()
-            total_value += value
-            report += f"ID: {product_id}\n"
-            report += f"  Name: {product.name}\n"
-            report += f"  Kategorie: {product.category}\n"
-            report += f"  Bestand: {product.quantity}\n"
-            report += f"  Preis: {product.price:.2f} €\n"
-            report += f"  Gesamtwert: {value:.2f} €\n\n"
-
-        report += "-" * 60 + "\n"
-        report += f"Gesamtwert Lager: {total_value:.2f} €\n"
-        report += "=" * 60 + "\n"
-
-        return report
+        return render_report(iter_inventory_report(self.products.values()))
 
     def generate_movement_report(self) -> str:
         """
@@ -50,32 +160,12 @@ class ConsoleReportAdapter(ReportPort):
         Returns:
             Formatierter Bericht
         """
-        if not self.movements:
-            return "Keine Lagerbewegungen vorhanden.\n"
-
-        movements_sorted = sorted(self.movements, key=lambda m: m.timestamp)
-
-        total_in = sum(m.quantity_change for m in movements_sorted if m.quantity_change > 0)
-        total_out = sum(-m.quantity_change for m in movements_sorted if m.quantity_change < 0)
-        net = total_in - total_out
-
-        report = "=" * 80 + "\n"
-        report += "BEWEGUNGSPROTOKOLL\n"
-        report += "=" * 80 + "\n"
-        report += "Zeit               | Artikel | Typ | Menge | User | Grund\n"
-        report += "-" * 80 + "\n"
-
-        for m in movements_sorted:
-            ts = m.timestamp.strftime("%Y-%m-%d %H:%M")
-            reason = (m.reason or "-").replace("\n", " ").strip()
-            report += (
-                f"{ts} | {m.product_id} | {m.movement_type} | {m.quantity_change:+d} | "
-                f"{m.performed_by} | {reason}\n"
-            )
-
-        report += "-" * 80 + "\n"
-        report += f"Summe IN: {total_in} | Summe OUT: {total_out} | Netto: {net}\n"
-        report += f"Gesamtbewegungen: {len(movements_sorted)}\n"
-        report += "=" * 80 + "\n"
-
-        return report
\ No newline at end of file
+        return render_report(iter_movement_report(self._sorted_movements()))
+
+    def write_inventory_report(self, out: TextIO) -> int:
+        """Lagerbestandsbericht in einen Stream schreiben, liefert die Zeilenzahl"""
+        return write_report(iter_inventory_report(self.products.values()), out)
+
+    def write_movement_report(self, out: TextIO) -> int:
+        """Bewegungsprotokoll in einen Stream schreiben, liefert die Zeilenzahl"""
+        return write_report(iter_movement_report(self._sorted_movements()), out)
@@ -1,147 +1,968 @@
 """Repository Adapter - In-Memory und persistente Implementierungen"""
 
+import heapq
 import json
-from datetime import datetime
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+import uuid
+from datetime import date, datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 
 from ..domain.product import Product
-from ..domain.warehouse import Movement
-from ..ports import RepositoryPort
+from ..domain.warehouse import Movement, end_of_day
+from ..ports import InventorySnapshot, MovementCursor, RepositoryPort
+from . import json_index
+from .search_index import TrigramIndex
+from .snapshot import read_snapshot, write_snapshot
 
 try:
+    from sqlalchemy import (
+        column, func, literal, literal_column, select, table, text, tuple_, update,
+    )
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
     from sqlalchemy.orm import Session
-    from .models import Base, ProductORM, MovementORM, init_db, get_database_url, create_db_session
+    from .models import (
+        Base, CategoryORM, InventorySnapshotORM, ProductORM, MovementORM, init_db,
+        get_database_url, create_db_session, has_products_fts, has_products_search,
+    )
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
 
 
+# Anzahl Zeilen pro executemany-Aufruf bei Bulk-Importen
+BULK_BATCH_SIZE = 1000
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Iterable in Listen der Länge ``size`` aufteilen (letzte ggf. kürzer)"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _movement_sort_key(movement: Movement) -> MovementCursor:
+    return (movement.timestamp, movement.id)
+
+
+def _filter_movements(
+    movements: Iterable[Movement],
+    product_id: Optional[str] = None,
+    movement_type: Optional[str] = None,
+    performed_by: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after_cursor: Optional[MovementCursor] = None,
+    limit: Optional[int] = None,
+) -> List[Movement]:
+    """Gemeinsame query_movements-Semantik für die In-Memory-Repositories"""
+    matches = (
+        m for m in movements
+        if (product_id is None or m.product_id == product_id)
+        and (movement_type is None or m.movement_type == movement_type)
+        and (performed_by is None or m.performed_by == performed_by)
+        and (since is None or m.timestamp >= since)
+        and (until is None or m.timestamp < until)
+        and (after_cursor is None or _movement_sort_key(m) > after_cursor)
+    )
+    if limit is None:
+        return sorted(matches, key=_movement_sort_key)
+    # Für eine Seite reicht eine Teilsortierung (O(n log limit))
+    return heapq.nsmallest(limit, matches, key=_movement_sort_key)
+
+
+def _escape_like(text: str) -> str:
+    """LIKE-Sonderzeichen escapen (Escape-Zeichen: Backslash)"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Kürzere Suchtexte enthalten kein Trigramm und können den Index nicht nutzen
+MIN_INDEXED_SEARCH = 3
+
+
+def _trigram_phrase(text: str) -> str:
+    """Suchtext als FTS5-Phrase: mit dem Trigramm-Tokenizer eine Teilstring-Suche"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+# Gewichtung der Felder bei der Volltextsuche (name, description, sku)
+FTS_WEIGHTS = (10.0, 1.0, 5.0)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _fts_tokens(value: Optional[str]) -> List[str]:
+    """Text wie FTS5 (unicode61, remove_diacritics) in Kleinbuchstaben-Wörter zerlegen"""
+    if not value:
+        return []
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WORD_RE.findall(stripped)
+
+
+def _fts_match_query(query: str) -> str:
+    """Suchanfrage in einen FTS5-MATCH-Ausdruck umwandeln ("5w30 castrol" -> "5w30"* "castrol"*)"""
+    return " ".join(f'"{token}"*' for token in _fts_tokens(query))
+
+
+def _insufficient_stock_message(available: int, delta: int) -> str:
+    return f"Unzureichender Bestand. Verfügbar: {available}, Angefordert: {-delta}"
+
+
+def _stock_at_boundary(
+    products: Iterable[Product], movements_after: Iterable[Movement], boundary: datetime
+) -> Dict[str, int]:
+    """Bestand vor ``boundary``: aktueller Bestand abzüglich späterer Bewegungen"""
+    quantities = {
+        product.id: product.quantity for product in products if product.created_at < boundary
+    }
+    for movement in movements_after:
+        if movement.product_id in quantities:
+            quantities[movement.product_id] -= movement.quantity_change
+    return quantities
+
+
+def _latest_inventory_snapshot(
+    snapshots: Mapping[date, Mapping[str, int]], at: date, product_id: Optional[str] = None
+) -> InventorySnapshot:
+    """Jüngsten Snapshot mit Stichtag <= ``at`` (ggf. mit ``product_id``) auswählen"""
+    candidates = [
+        day for day, quantities in snapshots.items()
+        if day <= at and (product_id is None or product_id in quantities)
+    ]
+    if not candidates:
+        return None, {}
+    day = max(candidates)
+    quantities = snapshots[day]
+    if product_id is not None:
+        return day, {product_id: quantities[product_id]}
+    return day, dict(quantities)
+
+
 class InMemoryRepository(RepositoryPort):
-    """In-Memory Repository - schnell für Tests und schnelle Prototypen"""
+    """
+    In-Memory Repository - schnell für Tests und schnelle Prototypen
+
+    ``load_all_products`` und ``load_movements`` liefern schreibgeschützte
+    Snapshots (``MappingProxyType`` bzw. ``tuple``). Ein Snapshot wird erst
+    nach einem Schreibzugriff neu erzeugt; wiederholte Lesezugriffe ohne
+    zwischenzeitliche Änderung liefern dasselbe Objekt ohne Kopie.
+    """
 
     def __init__(self):
         self.products: Dict[str, Product] = {}
         self.movements: List[Movement] = []
+        self._lock = threading.RLock()
+        # Copy-on-write Snapshots, None = seit dem letzten Schreibzugriff ungültig
+        self._products_view: Optional[Mapping[str, Product]] = None
+        self._movements_view: Optional[Sequence[Movement]] = None
+        # Bewegungen, die erst bei der ersten Bewegungsabfrage erzeugt und vor
+        # self.movements eingereiht werden (z.B. aus einem Snapshot)
+        self._movement_loader: Optional[Callable[[], List[Movement]]] = None
+        # Trigramm-Index für search_products, beim ersten Suchaufruf aufgebaut
+        # und danach von den Schreibzugriffen gepflegt (None = noch nicht gebaut)
+        self._search_index: Optional[TrigramIndex] = None
+        # Volltext je Produkt: id -> ((name, description, sku), Wortlisten je Feld)
+        self._fts_index: Dict[str, tuple] = {}
+        # Bestands-Snapshots: Stichtag -> Bestand je Produkt-ID
+        self.inventory_snapshots: Dict[date, Dict[str, int]] = {}
+        # Zähler der Schreibzugriffe (siehe data_version)
+        self._data_version = 0
 
     def save_product(self, product: Product) -> None:
         """Produkt im Memory speichern"""
-        self.products[product.id] = product
+        with self._lock:
+            self.products[product.id] = product
+            self._index_product(product)
+            self._products_view = None
+            self._data_version += 1
 
     def load_product(self, product_id: str) -> Optional[Product]:
         """Produkt aus Memory laden"""
         return self.products.get(product_id)
 
-    def load_all_products(self) -> Dict[str, Product]:
-        """Alle Produkte aus Memory laden"""
-        return self.products.copy()
+    def load_all_products(self) -> Mapping[str, Product]:
+        """Alle Produkte als schreibgeschützten Snapshot (Kopie nur nach Änderungen)"""
+        view = self._products_view
+        if view is None:
+            with self._lock:
+                if self._products_view is None:
+                    self._products_view = MappingProxyType(dict(self.products))
+                view = self._products_view
+        return view
+
+    def iter_products(self, batch_size: int = 1000) -> Iterator[Product]:
+        """Produkte nach ID sortiert liefern, ohne das Dictionary zu kopieren"""
+        for product_id in sorted(self.products):
+            product = self.products.get(product_id)
+            if product is not None:
+                yield product
+
+    def _index_product(self, product: Product) -> None:
+        """Gespeichertes Produkt in den Suchindex übernehmen (falls schon gebaut)"""
+        if self._search_index is not None:
+            self._search_index.add(product)
+
+    def _unindex_product(self, product_id: str) -> None:
+        if self._search_index is not None:
+            self._search_index.remove(product_id)
+
+    def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        """
+        Produkte im Memory über den Trigramm-Index filtern (siehe adapters/search_index.py)
+
+        Der Index wird beim ersten Aufruf einmalig aus allen Produkten
+        aufgebaut (O(Katalog)); danach hängt der Aufwand einer Suche von der
+        Zahl der Kandidaten ab. Unter dem Lock, damit parallele Schreiber die
+        Index-Mengen nicht während der Suche verändern.
+        """
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = TrigramIndex()
+                self._search_index.add_all(self.products.values())
+            ids = sorted(self._search_index.search((text or "").strip(), category))
+            end = None if limit is None else offset + limit
+            return {product_id: self.products[product_id] for product_id in ids[offset:end]}
+
+    def _fts_fields(self, product: Product) -> tuple:
+        """Wortlisten je Feld (name, description, sku), bei Änderung neu erzeugt"""
+        entry = self._fts_index.get(product.id)
+        if entry is None or entry[0] != (product.name, product.description, product.sku):
+            fields = (product.name, product.description, product.sku)
+            entry = (fields, tuple(_fts_tokens(value) for value in fields))
+            self._fts_index[product.id] = entry
+        return entry[1]
+
+    def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        """Präfixsuche über Name, Beschreibung und SKU mit feldgewichtetem Ranking"""
+        terms = _fts_tokens(query)
+        if not terms:
+            return []
+
+        scored = []
+        for product in list(self.products.values()):
+            fields = self._fts_fields(product)
+            score = 0.0
+            for term in terms:
+                term_score = sum(
+                    weight
+                    for weight, words in zip(FTS_WEIGHTS, fields)
+                    if any(word.startswith(term) for word in words)
+                )
+                if not term_score:
+                    break
+                score += term_score
+            else:
+                scored.append((-score, product.id, product))
+        return [product for _, _, product in heapq.nsmallest(limit, scored)]
 
     def delete_product(self, product_id: str) -> None:
         """Produkt aus Memory löschen"""
-        if product_id in self.products:
-            del self.products[product_id]
+        with self._lock:
+            if product_id in self.products:
+                del self.products[product_id]
+                self._products_view = None
+                self._data_version += 1
+                self._unindex_product(product_id)
+                self._fts_index.pop(product_id, None)
 
     def save_movement(self, movement: Movement) -> None:
         """Bewegung im Memory speichern"""
-        self.movements.append(movement)
+        with self._lock:
+            self.movements.append(movement)
+            self._movements_view = None
+            self._data_version += 1
 
-    def load_movements(self) -> List[Movement]:
-        """Alle Bewegungen aus Memory laden"""
-        return self.movements.copy()
+    def _ensure_movements(self) -> None:
+        """Ausstehende Bewegungen erzeugen (siehe _movement_loader)"""
+        if self._movement_loader is None:
+            return
+        with self._lock:
+            loader, self._movement_loader = self._movement_loader, None
+            if loader is not None:
+                self.movements[:0] = loader()
+                self._movements_view = None
 
+    def load_movements(self) -> Sequence[Movement]:
+        """Alle Bewegungen als schreibgeschützten Snapshot (Kopie nur nach Änderungen)"""
+        self._ensure_movements()
+        view = self._movements_view
+        if view is None:
+            with self._lock:
+                if self._movements_view is None:
+                    self._movements_view = tuple(self.movements)
+                view = self._movements_view
+        return view
 
-class JsonRepository(RepositoryPort):
-    """JSON-basiertes Repository - lädt Testdaten aus JSON-Datei"""
+    def iter_movements(
+        self, batch_size: int = 1000, order_by_time: bool = True
+    ) -> Iterator[Movement]:
+        """Bewegungen liefern, ohne die Liste zu kopieren (sortiert nur bei Bedarf)"""
+        self._ensure_movements()
+        if order_by_time:
+            yield from sorted(self.movements, key=_movement_sort_key)
+            return
+        # Länge vorab festhalten: während der Iteration angehängte Bewegungen
+        # gehören nicht mehr zu diesem Durchlauf
+        for index in range(len(self.movements)):
+            yield self.movements[index]
+
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_cursor: Optional[MovementCursor] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        """Bewegungen im Memory filtern und chronologisch sortieren"""
+        self._ensure_movements()
+        return _filter_movements(
+            self.movements,
+            product_id=product_id,
+            movement_type=movement_type,
+            performed_by=performed_by,
+            since=since,
+            until=until,
+            after_cursor=after_cursor,
+            limit=limit,
+        )
+
+    def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        """Bestand ändern und Bewegung speichern (unter Lock, daher atomar)"""
+        with self._lock:
+            product = self.products.get(product_id)
+            if product is None:
+                raise ValueError(f"Produkt {product_id} nicht gefunden")
+            if product.quantity + delta < 0:
+                raise ValueError(_insufficient_stock_message(product.quantity, delta))
+
+            product.update_quantity(delta)
+            if movement is not None:
+                if not movement.product_name:
+                    movement.product_name = product.name
+                self.movements.append(movement)
+                self._movements_view = None
+            self._data_version += 1
+            return product.quantity
+
+    def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        """Stammdaten übernehmen; Bestand = gespeicherter Bestand + Delta (unter Lock)"""
+        with self._lock:
+            current = self.products.get(product.id)
+            if current is None:
+                raise ValueError(f"Produkt {product.id} nicht gefunden")
+            if current.quantity + quantity_delta < 0:
+                raise ValueError(_insufficient_stock_message(current.quantity, quantity_delta))
+
+            # Der Bestand des übergebenen Objekts kann veraltet sein
+            product.quantity = current.quantity + quantity_delta
+            self.products[product.id] = product
+            self._index_product(product)
+            self._products_view = None
+            if movement is not None:
+                if not movement.product_name:
+                    movement.product_name = product.name
+                self.movements.append(movement)
+                self._movements_view = None
+            self._data_version += 1
+            return product.quantity
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte im Memory speichern"""
+        with self._lock:
+            for product in products:
+                self.products[product.id] = product
+                self._index_product(product)
+            self._products_view = None
+            self._data_version += 1
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen im Memory speichern"""
+        with self._lock:
+            self.movements.extend(movements)
+            self._movements_view = None
+            self._data_version += 1
+
+    def _compute_inventory_snapshot(self, snapshot_date: date) -> Dict[str, int]:
+        boundary = end_of_day(snapshot_date)
+        return _stock_at_boundary(
+            list(self.products.values()), self.query_movements(since=boundary), boundary
+        )
+
+    def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        """Bestand am Ende von ``snapshot_date`` berechnen und im Memory ablegen"""
+        with self._lock:
+            quantities = self._compute_inventory_snapshot(snapshot_date)
+            self.inventory_snapshots[snapshot_date] = quantities
+            self._data_version += 1
+            return len(quantities)
+
+    def load_inventory_snapshot(
+        self, at: date, product_id: Optional[str] = None
+    ) -> InventorySnapshot:
+        return _latest_inventory_snapshot(self.inventory_snapshots, at, product_id)
+
+    def data_version(self) -> int:
+        """Anzahl der Schreibzugriffe dieser Instanz"""
+        return self._data_version
+
+    def save_snapshot(self, path) -> None:
+        """Gesamten Zustand als binären Snapshot speichern (siehe adapters/snapshot.py)"""
+        with self._lock:
+            write_snapshot(
+                path,
+                self.load_all_products().values(),
+                self.load_movements(),
+                self.inventory_snapshots,
+            )
+
+    @staticmethod
+    def load_snapshot(path) -> "InMemoryRepository":
+        """
+        In-Memory Repository aus einem binären Snapshot erzeugen
+
+        Raises:
+            FileNotFoundError: Datei existiert nicht
+            SnapshotError: Datei ist kein Snapshot oder hat eine andere Version
+        """
+        products, inventory_snapshots, movement_loader = read_snapshot(path)
+        repository = InMemoryRepository()
+        repository.products = products
+        repository.inventory_snapshots = inventory_snapshots
+        # Bewegungen (oft der Großteil) erst bei der ersten Bewegungsabfrage erzeugen
+        repository._movement_loader = movement_loader
+        return repository
+
+
+_PRODUCT_FIELDS = ("product_id", "name", "description", "price", "quantity", "category", "sku", "notes")
+
+
+def _product_to_json(product: Product) -> dict:
+    """Produkt im Format von data/testdata.json"""
+    data = {
+        "product_id": product.id,
+        "name": product.name,
+        "description": product.description,
+        "price": product.price,
+        "quantity": product.quantity,
+        "category": product.category,
+        "sku": product.sku,
+    }
+    if product.notes is not None:
+        data["notes"] = product.notes
+    return data
+
+
+def _product_from_json(data: dict) -> Product:
+    return Product(
+        id=data["product_id"],
+        name=data["name"],
+        description=data.get("description", ""),
+        price=data["price"],
+        quantity=data.get("quantity", 0),
+        sku=data.get("sku", ""),
+        category=data.get("category", ""),
+        notes=data.get("notes"),
+    )
+
+
+def _movement_to_json(movement: Movement) -> dict:
+    return {
+        "id": movement.id,
+        "product_id": movement.product_id,
+        "product_name": movement.product_name,
+        "quantity_change": movement.quantity_change,
+        "movement_type": movement.movement_type,
+        "reason": movement.reason,
+        "timestamp": movement.timestamp.isoformat(),
+        "performed_by": movement.performed_by,
+    }
+
+
+def _movement_from_json(data: dict) -> Movement:
+    timestamp = data.get("timestamp")
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    else:
+        timestamp = datetime.now()
+
+    return Movement(
+        id=data["id"],
+        product_id=data["product_id"],
+        product_name=data.get("product_name", ""),
+        quantity_change=data["quantity_change"],
+        movement_type=data["movement_type"],
+        reason=data.get("reason"),
+        timestamp=timestamp,
+        performed_by=data.get("performed_by", "system"),
+    )
+
+
+def _fsync_directory(path: Path) -> None:
+    """Verzeichniseintrag nach os.replace dauerhaft machen (nicht unter Windows)"""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonRepository(InMemoryRepository):
+    """
+    JSON-basiertes Repository - lädt Testdaten aus JSON-Datei
+
+    Änderungen werden nicht durch Neuschreiben des ganzen Dokuments
+    gespeichert, sondern als je eine JSON-Zeile an ein Journal
+    (``<json_path>.journal``) angehängt. Das Journal wird alle
+    ``sync_every`` Einträge per fsync auf die Platte gebracht und beim
+    nächsten Start wieder eingespielt. Nach ``compact_after`` Einträgen
+    (oder per ``compact()``) wird das Hauptdokument atomar über eine
+    temporäre Datei und ``os.replace`` neu geschrieben und das Journal geleert.
+
+    Mit ``lazy=True`` wird die Datei beim Start nicht geparst: Produkte werden
+    über einen Byte-Offset-Index (siehe ``json_index``) erst beim ersten
+    Zugriff erzeugt, Bewegungen erst bei der ersten Bewegungsabfrage.
+    """
+
+    def __init__(
+        self,
+        json_path: Optional[str] = None,
+        persist: bool = True,
+        sync_every: int = 64,
+        compact_after: Optional[int] = 10_000,
+        lazy: bool = False,
+    ):
+        """
+        Args:
+            json_path: Pfad zur JSON-Datei (Standard: data/testdata.json)
+            persist: Änderungen im Journal speichern (False = nur im Speicher)
+            sync_every: Anzahl Journal-Einträge pro fsync (1 = jeder Eintrag)
+            compact_after: Journal-Einträge bis zur automatischen Kompaktierung
+                (None = nur manuell per compact())
+            lazy: Einträge erst bei Bedarf parsen (für große Exporte)
+        """
+        super().__init__()
+        if sync_every < 1:
+            raise ValueError("sync_every muss mindestens 1 sein")
 
-    def __init__(self, json_path: Optional[str] = None):
-        self.products: Dict[str, Product] = {}
-        self.movements: List[Movement] = []
-        
         if json_path is None:
             # Standard: data/testdata.json relativ zum Projektverzeichnis
             json_path = Path(__file__).parent.parent.parent / "data" / "testdata.json"
-        
+
         self.json_path = Path(json_path)
+        self.journal_path = self.json_path.with_name(self.json_path.name + ".journal")
+        self.persist = persist
+        self.sync_every = sync_every
+        self.compact_after = compact_after
+        self.lazy = lazy
+
+        # Nicht modellierte Felder (z.B. brand, location) und Metadaten des
+        # Dokuments, damit die Kompaktierung nichts verliert
+        self._extra_fields: Dict[str, dict] = {}
+        self._document: dict = {}
+        self._journal = None
+        self._journal_entries = 0
+        self._unsynced = 0
+        # Lazy-Modus: noch nicht erzeugte Einträge als Byte-Bereiche in self._source
+        self._source = None
+        self._pending_products: Dict[str, tuple] = {}
+        self._pending_movements = None
+
         self._load_from_json()
+        for day, quantities in self._document.pop("inventory_snapshots", {}).items():
+            self.inventory_snapshots[date.fromisoformat(day)] = quantities
+        self._replay_journal()
 
     def _load_from_json(self) -> None:
         """Daten aus JSON-Datei laden"""
         if not self.json_path.exists():
             return
-        
-        with open(self.json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
+
+        if self.lazy:
+            self._source, index = json_index.open_indexed(self.json_path)
+            self._document = index.document
+            self._pending_products = index.products
+            self._pending_movements = index.movements
+            return
+
+        data = json_index.loads(self.json_path.read_bytes())
+
+        self._document = {
+            key: value for key, value in data.items() if key not in ("products", "movements")
+        }
+
         # Produkte laden
         for prod_data in data.get("products", []):
-            product = Product(
-                id=prod_data["product_id"],
-                name=prod_data["name"],
-                description=prod_data.get("description", ""),
-                price=prod_data["price"],
-                quantity=prod_data.get("quantity", 0),
-                sku=prod_data.get("sku", ""),
-                category=prod_data.get("category", ""),
-            )
-            self.products[product.id] = product
-        
+            self._add_loaded_product(prod_data)
+
         # Bewegungen laden
         for mov_data in data.get("movements", []):
-            timestamp = mov_data.get("timestamp")
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp)
-            else:
-                timestamp = datetime.now()
-            
-            movement = Movement(
-                id=mov_data["id"],
-                product_id=mov_data["product_id"],
-                product_name=mov_data.get("product_name", ""),
-                quantity_change=mov_data["quantity_change"],
-                movement_type=mov_data["movement_type"],
-                reason=mov_data.get("reason"),
-                timestamp=timestamp,
-                performed_by=mov_data.get("performed_by", "system"),
-            )
-            self.movements.append(movement)
+            self.movements.append(_movement_from_json(mov_data))
 
-    def save_product(self, product: Product) -> None:
-        """Produkt speichern"""
+    def _add_loaded_product(self, prod_data: dict) -> Product:
+        product = _product_from_json(prod_data)
         self.products[product.id] = product
+        self._index_product(product)
+        extra = {k: v for k, v in prod_data.items() if k not in _PRODUCT_FIELDS}
+        if extra:
+            self._extra_fields[product.id] = extra
+        return product
+
+    # -------------------- Lazy-Modus --------------------
+
+    def _materialize(self, product_id: str) -> None:
+        """Ein einzelnes Produkt aus der Datei erzeugen, falls noch ausstehend"""
+        if product_id not in self._pending_products:
+            return
+        with self._lock:
+            span = self._pending_products.pop(product_id, None)
+            if span is not None:
+                self._add_loaded_product(json_index.loads(self._source[span[0]:span[1]]))
+                self._products_view = None
+                self._release_source()
+
+    def _ensure_products(self) -> None:
+        """Alle ausstehenden Produkte erzeugen (für Zugriffe auf den Gesamtbestand)"""
+        if not self._pending_products:
+            return
+        with self._lock:
+            # In Dateireihenfolge lesen: sequentieller Zugriff auf die mmap
+            spans = sorted(self._pending_products.values())
+            self._pending_products = {}
+            for start, end in spans:
+                self._add_loaded_product(json_index.loads(self._source[start:end]))
+            self._products_view = None
+            self._release_source()
+
+    def _ensure_movements(self) -> None:
+        """Bewegungen aus der Datei parsen (erst bei der ersten Bewegungsabfrage)"""
+        if self._pending_movements is None:
+            return
+        with self._lock:
+            if self._pending_movements is None:
+                return
+            spans = self._pending_movements
+            self._pending_movements = None
+            # Die Einträge liegen lückenlos in einer Liste: ein einziger
+            # Dekodier-Aufruf statt einer pro Bewegung
+            raw = b"[" + self._source[spans[0]:spans[-1]] + b"]" if spans else b"[]"
+            loaded = [_movement_from_json(data) for data in json_index.loads(raw)]
+            # Aus dem Journal eingespielte Bewegungen folgen auf die der Datei;
+            # nach abgebrochener Kompaktierung doppelte IDs verwerfen
+            loaded_ids = {movement.id for movement in loaded}
+            self.movements[:] = loaded + [m for m in self.movements if m.id not in loaded_ids]
+            self._movements_view = None
+            self._release_source()
+
+    def _release_source(self) -> None:
+        """mmap schließen, sobald nichts mehr aus der Datei gelesen werden muss"""
+        if self._source is None or self._pending_products or self._pending_movements is not None:
+            return
+        self._source.close()
+        self._source = None
+
+    # -------------------- Journal --------------------
+
+    def _replay_journal(self) -> None:
+        """Journal nach dem Laden des Hauptdokuments einspielen"""
+        if not self.journal_path.exists():
+            return
+
+        # Nach einem Absturz zwischen Kompaktierung und Leeren des Journals
+        # sind Bewegungen schon im Dokument enthalten -> per ID überspringen
+        movement_ids = {movement.id for movement in self.movements}
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Unvollständige letzte Zeile nach einem Absturz
+                    break
+                self._apply_entry(entry, movement_ids)
+                self._journal_entries += 1
+
+    def _apply_entry(self, entry: dict, movement_ids: set) -> None:
+        op = entry["op"]
+        if op == "product":
+            product = _product_from_json(entry["product"])
+            self._materialize(product.id)
+            self.products[product.id] = product
+            self._index_product(product)
+        elif op == "delete":
+            self._pending_products.pop(entry["product_id"], None)
+            self.products.pop(entry["product_id"], None)
+            self._unindex_product(entry["product_id"])
+            self._extra_fields.pop(entry["product_id"], None)
+        elif op == "movement":
+            movement = _movement_from_json(entry["movement"])
+            if movement.id not in movement_ids:
+                movement_ids.add(movement.id)
+                self.movements.append(movement)
+            # Bestandsänderungen speichern den neuen Bestand absolut (idempotent)
+            self._materialize(movement.product_id)
+            if "quantity" in entry and movement.product_id in self.products:
+                self.products[movement.product_id].quantity = entry["quantity"]
+        elif op == "quantity":
+            self._materialize(entry["product_id"])
+            if entry["product_id"] in self.products:
+                self.products[entry["product_id"]].quantity = entry["quantity"]
+        elif op == "inventory_snapshot":
+            self.inventory_snapshots[date.fromisoformat(entry["date"])] = entry["quantities"]
+
+    def _append(self, entries: Iterable[dict]) -> None:
+        """Einträge an das Journal anhängen (Aufrufer hält self._lock)"""
+        if not self.persist:
+            return
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+        count = 0
+        for entry in entries:
+            self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+        if not count:
+            return
+        self._journal.flush()
+        self._journal_entries += count
+        self._unsynced += count
+
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        if self.compact_after is not None and self._journal_entries >= self.compact_after:
+            self.compact()
+
+    def sync(self) -> None:
+        """Gepufferte Journal-Einträge per fsync dauerhaft speichern"""
+        with self._lock:
+            if self._journal is not None and self._unsynced:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            self._unsynced = 0
+
+    def compact(self) -> None:
+        """Hauptdokument atomar neu schreiben und Journal leeren"""
+        if not self.persist:
+            return
+
+        with self._lock:
+            self._ensure_products()
+            self._ensure_movements()
+            products = []
+            for product in self.products.values():
+                data = _product_to_json(product)
+                data.update(self._extra_fields.get(product.id, {}))
+                products.append(data)
+            document = dict(self._document)
+            document["products"] = products
+            document["movements"] = [_movement_to_json(m) for m in self.movements]
+            if self.inventory_snapshots:
+                document["inventory_snapshots"] = {
+                    day.isoformat(): quantities
+                    for day, quantities in sorted(self.inventory_snapshots.items())
+                }
+
+            self.json_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=self.json_path.name + ".", suffix=".tmp", dir=self.json_path.parent
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(document, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.json_path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            _fsync_directory(self.json_path.parent)
+
+            # Erst nach dem Umbenennen leeren: ein Absturz dazwischen spielt
+            # das Journal nur erneut (idempotent) ein
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self.journal_path.unlink(missing_ok=True)
+            self._journal_entries = 0
+            self._unsynced = 0
+
+    def close(self) -> None:
+        """Journal synchronisieren und schließen"""
+        with self._lock:
+            self.sync()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def __del__(self):
+        """Cleanup bei Destruktion"""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    # -------------------- Lesezugriffe --------------------
 
     def load_product(self, product_id: str) -> Optional[Product]:
-        """Produkt laden"""
-        return self.products.get(product_id)
+        self._materialize(product_id)
+        return super().load_product(product_id)
 
-    def load_all_products(self) -> Dict[str, Product]:
-        """Alle Produkte laden"""
-        return self.products.copy()
+    def load_all_products(self) -> Mapping[str, Product]:
+        self._ensure_products()
+        return super().load_all_products()
+
+    def iter_products(self, batch_size: int = 1000) -> Iterator[Product]:
+        self._ensure_products()
+        return super().iter_products(batch_size)
+
+    def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        self._ensure_products()
+        return super().search_products(text, category, limit=limit, offset=offset)
+
+    def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        self._ensure_products()
+        return super().full_text_search(query, limit=limit)
+
+    # -------------------- Schreibzugriffe --------------------
+
+    def save_product(self, product: Product) -> None:
+        """Produkt speichern und im Journal vermerken"""
+        with self._lock:
+            # Zusatzfelder aus der Datei übernehmen, bevor sie überschrieben werden
+            self._materialize(product.id)
+            super().save_product(product)
+            self._append([{"op": "product", "product": _product_to_json(product)}])
 
     def delete_product(self, product_id: str) -> None:
-        """Produkt löschen"""
-        if product_id in self.products:
-            del self.products[product_id]
+        """Produkt löschen und im Journal vermerken"""
+        with self._lock:
+            self._materialize(product_id)
+            if product_id not in self.products:
+                return
+            super().delete_product(product_id)
+            self._extra_fields.pop(product_id, None)
+            self._append([{"op": "delete", "product_id": product_id}])
 
     def save_movement(self, movement: Movement) -> None:
-        """Bewegung speichern"""
-        self.movements.append(movement)
+        """Bewegung speichern und im Journal vermerken"""
+        with self._lock:
+            super().save_movement(movement)
+            self._append([{"op": "movement", "movement": _movement_to_json(movement)}])
 
-    def load_movements(self) -> List[Movement]:
-        """Alle Bewegungen laden"""
-        return self.movements.copy()
+    def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        """Bestand ändern; Bewegung und neuer Bestand bilden einen Journal-Eintrag"""
+        with self._lock:
+            self._materialize(product_id)
+            quantity = super().apply_stock_change(product_id, delta, movement)
+            if movement is None:
+                entry = {"op": "quantity", "product_id": product_id, "quantity": quantity}
+            else:
+                entry = {
+                    "op": "movement",
+                    "movement": _movement_to_json(movement),
+                    "quantity": quantity,
+                }
+            self._append([entry])
+            return quantity
+
+    def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        """Stammdaten und Bestandsänderung speichern; ein Journal-Schreibzugriff"""
+        with self._lock:
+            self._materialize(product.id)
+            quantity = super().update_product(product, quantity_delta, movement)
+            entries = [{"op": "product", "product": _product_to_json(product)}]
+            if movement is not None:
+                entries.append({
+                    "op": "movement",
+                    "movement": _movement_to_json(movement),
+                    "quantity": quantity,
+                })
+            self._append(entries)
+            return quantity
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte speichern (ein Journal-Eintrag je Produkt)"""
+        products = list(products)
+        with self._lock:
+            for product in products:
+                self._materialize(product.id)
+            super().save_products(products)
+            self._append({"op": "product", "product": _product_to_json(p)} for p in products)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen speichern (ein Journal-Eintrag je Bewegung)"""
+        movements = list(movements)
+        with self._lock:
+            super().save_movements(movements)
+            self._append({"op": "movement", "movement": _movement_to_json(m)} for m in movements)
+
+    def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        """Snapshot berechnen und als ein Journal-Eintrag speichern"""
+        with self._lock:
+            self._ensure_products()
+            count = super().save_inventory_snapshot(snapshot_date)
+            self._append([
+                {
+                    "op": "inventory_snapshot",
+                    "date": snapshot_date.isoformat(),
+                    "quantities": self.inventory_snapshots[snapshot_date],
+                }
+            ])
+            return count
 
 
 class RepositoryFactory:
     """Factory für Repository-Instanzen"""
 
     @staticmethod
-    def create_repository(repository_type: str = "memory", db_path: Optional[str] = None) -> RepositoryPort:
+    def create_repository(
+        repository_type: str = "memory",
+        db_path: Optional[str] = None,
+        profile: Optional[str] = None,
+    ) -> RepositoryPort:
         """
         Repository basierend auf Typ erstellen
 
         Args:
-            repository_type: "memory", "json", "sqlite" oder andere
-            db_path: Pfad zur SQLite Datenbank (nur für "sqlite")
+            repository_type: "memory", "json", "snapshot", "sqlite", "movement-log"
+                oder andere
+            db_path: Pfad zur SQLite Datenbank bzw. zum Snapshot (nur für "sqlite",
+                "movement-log" und "snapshot")
+            profile: SQLite Performance-Profil "durable", "balanced" oder "bulk-load"
+                (nur für "sqlite" und "movement-log", None = SQLite-Standardeinstellungen)
 
         Returns:
             RepositoryPort Instanz
@@ -149,11 +970,16 @@ class RepositoryFactory:
         Raises:
             ValueError: Unbekannter Repository-Typ
             ImportError: SQLAlchemy nicht verfügbar für sqlite
+            FileNotFoundError: Snapshot-Datei existiert nicht (nur für "snapshot")
         """
         if repository_type == "memory":
             return InMemoryRepository()
         elif repository_type == "json":
             return JsonRepository()
+        elif repository_type == "snapshot":
+            if db_path is None:
+                db_path = str(Path(__file__).parent.parent.parent / "data" / "warehouse.snapshot")
+            return InMemoryRepository.load_snapshot(db_path)
         elif repository_type == "sqlite":
             if not SQLALCHEMY_AVAILABLE:
                 raise ImportError(
@@ -161,7 +987,13 @@ class RepositoryFactory:
                 )
             if db_path is None:
                 db_path = str(Path(__file__).parent.parent.parent / "data" / "warehouse.db")
-            return SqliteRepository(db_path)
+            return SqliteRepository(db_path, profile=profile)
+        elif repository_type == "movement-log":
+            # Produkte in SQLite, Bewegungen im mmap-Log neben der Datenbank
+            from .movement_log import MovementLogRepository
+
+            products = RepositoryFactory.create_repository("sqlite", db_path, profile)
+            return MovementLogRepository(products.db_path + ".movements", products)
         else:
             raise ValueError(f"Unbekannter Repository-Typ: {repository_type}")
 
@@ -169,46 +1001,91 @@ class RepositoryFactory:
 class SqliteRepository(RepositoryPort):
     """SQLite-basiertes Repository mit SQLAlchemy ORM"""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile=None):
         """
         Initialisiere SQLite Repository
 
         Args:
             db_path: Pfad zur SQLite Datenbank-Datei
+            profile: Performance-Profil (Name aus SQLITE_PROFILES oder PRAGMA-Dictionary)
         """
         if not SQLALCHEMY_AVAILABLE:
             raise ImportError("SQLAlchemy erforderlich für SqliteRepository")
 
         self.db_path = str(db_path)
         self.db_url = f"sqlite:///{self.db_path}"
-        self.engine, self.SessionLocal = create_db_session(self.db_url)
+        self.profile = profile
+        self.engine, self.SessionLocal = create_db_session(self.db_url, profile=profile)
         
-        # Stelle sicher, dass Schema existiert
-        init_db(self.db_url)
+        # Stelle sicher, dass Schema existiert (auf derselben Engine)
+        init_db(engine=self.engine)
+        self.fts_available = has_products_fts(self.engine)
+        self.search_index_available = has_products_search(self.engine)
+
+        # Eigene Verbindung nur für PRAGMA data_version (siehe data_version)
+        self._version_connection = None
+        self._version_lock = threading.Lock()
+        self._seen_version = None
+        self._data_version = 0
+
+    @staticmethod
+    def _product_select():
+        """SELECT für Produkte inkl. Kategoriename per JOIN (kein Lazy-Load pro Zeile)"""
+        return select(
+            ProductORM.id,
+            ProductORM.name,
+            ProductORM.description,
+            ProductORM.price,
+            ProductORM.quantity,
+            ProductORM.sku,
+            CategoryORM.name.label("category_name"),
+            ProductORM.created_at,
+            ProductORM.updated_at,
+            ProductORM.notes,
+        ).outerjoin(CategoryORM, ProductORM.category_id == CategoryORM.id)
 
-    def _product_orm_to_domain(self, product_orm) -> Optional[Product]:
-        """Konvertiere ORM-Produkt zu Domain-Model"""
-        if product_orm is None:
+    def _product_row_to_domain(self, row) -> Optional[Product]:
+        """Konvertiere Ergebniszeile von ``_product_select`` zu Domain-Model"""
+        if row is None:
             return None
-        
+
         return Product(
-            id=product_orm.id,
-            name=product_orm.name,
-            description=product_orm.description or "",
-            price=product_orm.price,
-            quantity=product_orm.quantity,
-            sku=product_orm.sku,
-            category=product_orm.category.name if product_orm.category else "",
-            created_at=product_orm.created_at or datetime.now(),
-            updated_at=product_orm.updated_at or datetime.now(),
-            notes=product_orm.notes,
+            id=row.id,
+            name=row.name,
+            description=row.description or "",
+            price=row.price,
+            quantity=row.quantity,
+            sku=row.sku,
+            category=row.category_name or "",
+            created_at=row.created_at or datetime.now(),
+            updated_at=row.updated_at or datetime.now(),
+            notes=row.notes,
         )
 
-    def _domain_to_product_orm(self, product: Product):
+    def _category_id(self, session, name: str, cache: Optional[dict] = None) -> Optional[str]:
+        """ID der Kategorie mit diesem Namen liefern, fehlende Kategorien anlegen"""
+        if not name:
+            return None
+        if cache is not None and name in cache:
+            return cache[name]
+
+        category_id = session.execute(
+            select(CategoryORM.id).where(CategoryORM.name == name)
+        ).scalar()
+        if category_id is None:
+            category_id = f"CAT-{uuid.uuid4().hex[:12]}"
+            session.add(CategoryORM(id=category_id, name=name))
+            session.flush()
+        if cache is not None:
+            cache[name] = category_id
+        return category_id
+
+    def _domain_to_product_orm(self, product: Product, category_id: Optional[str] = None):
         """Konvertiere Domain-Model zu ORM-Produkt"""
         return ProductORM(
             id=product.id,
             warehouse_id="WH001",  # Default Warehouse
+            category_id=category_id,
             sku=product.sku,
             name=product.name,
             description=product.description,
@@ -219,20 +1096,34 @@ class SqliteRepository(RepositoryPort):
             notes=product.notes,
         )
 
-    def _movement_orm_to_domain(self, movement_orm) -> Optional[Movement]:
-        """Konvertiere ORM-Bewegung zu Domain-Model"""
-        if movement_orm is None:
+    @staticmethod
+    def _movement_select():
+        """SELECT für Bewegungen inkl. Produktname per JOIN (kein Lazy-Load pro Zeile)"""
+        return select(
+            MovementORM.id,
+            MovementORM.product_id,
+            ProductORM.name.label("product_name"),
+            MovementORM.quantity_change,
+            MovementORM.movement_type,
+            MovementORM.reason,
+            MovementORM.timestamp,
+            MovementORM.performed_by,
+        ).outerjoin(ProductORM, MovementORM.product_id == ProductORM.id)
+
+    def _movement_row_to_domain(self, row) -> Optional[Movement]:
+        """Konvertiere Ergebniszeile von ``_movement_select`` zu Domain-Model"""
+        if row is None:
             return None
-        
+
         return Movement(
-            id=movement_orm.id,
-            product_id=movement_orm.product_id,
-            product_name=movement_orm.product.name if movement_orm.product else "",
-            quantity_change=movement_orm.quantity_change,
-            movement_type=movement_orm.movement_type,
-            reason=movement_orm.reason,
-            timestamp=movement_orm.timestamp or datetime.now(),
-            performed_by=movement_orm.performed_by,
+            id=row.id,
+            product_id=row.product_id,
+            product_name=row.product_name or "",
+            quantity_change=row.quantity_change,
+            movement_type=row.movement_type,
+            reason=row.reason,
+            timestamp=row.timestamp or datetime.now(),
+            performed_by=row.performed_by,
         )
 
     def _domain_to_movement_orm(self, movement: Movement):
@@ -262,10 +1153,13 @@ class SqliteRepository(RepositoryPort):
                 existing.price = product.price
                 existing.quantity = product.quantity
                 existing.sku = product.sku
+                existing.category_id = self._category_id(session, product.category)
                 existing.updated_at = datetime.now()
             else:
                 # Insert
-                product_orm = self._domain_to_product_orm(product)
+                product_orm = self._domain_to_product_orm(
+                    product, self._category_id(session, product.category)
+                )
                 session.add(product_orm)
             
             session.commit()
@@ -276,8 +1170,10 @@ class SqliteRepository(RepositoryPort):
         """Produkt laden"""
         session = self.SessionLocal()
         try:
-            product_orm = session.query(ProductORM).filter(ProductORM.id == product_id).first()
-            return self._product_orm_to_domain(product_orm)
+            row = session.execute(
+                self._product_select().where(ProductORM.id == product_id)
+            ).first()
+            return self._product_row_to_domain(row)
         finally:
             session.close()
 
@@ -285,11 +1181,98 @@ class SqliteRepository(RepositoryPort):
         """Alle Produkte laden"""
         session = self.SessionLocal()
         try:
-            products_orm = session.query(ProductORM).all()
-            return {
-                product_orm.id: self._product_orm_to_domain(product_orm)
-                for product_orm in products_orm
-            }
+            rows = session.execute(self._product_select())
+            return {row.id: self._product_row_to_domain(row) for row in rows}
+        finally:
+            session.close()
+
+    def iter_products(self, batch_size: int = 1000) -> Iterator[Product]:
+        """
+        Produkte nach ID sortiert streamen
+
+        Mit ``yield_per`` holt SQLAlchemy jeweils nur ``batch_size`` Zeilen vom
+        SQLite-Cursor; der Speicherbedarf ist unabhängig von der Tabellengröße.
+        Die Lesetransaktion bleibt offen, bis der Iterator erschöpft oder
+        geschlossen ist.
+        """
+        stmt = self._product_select().order_by(ProductORM.id)
+        session = self.SessionLocal()
+        try:
+            result = session.execute(stmt.execution_options(yield_per=batch_size))
+            for row in result:
+                yield self._product_row_to_domain(row)
+        finally:
+            session.close()
+
+    def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        """
+        Produkte per SQL suchen
+
+        Ab ``MIN_INDEXED_SEARCH`` Zeichen liefert der Trigramm-Index
+        ``products_search`` die Kandidaten (MATCH auf eine Phrase = Teilstring
+        von "<id> <name>", ohne Groß-/Kleinschreibung); der Aufwand hängt dann
+        von der Zahl der Treffer ab, nicht von der Katalog-Größe. Kürzere
+        Suchtexte und Datenbanken ohne Trigramm-Tokenizer fallen auf
+        ``LIKE '%text%'`` zurück, das die ganze Tabelle liest. Der
+        Kategoriefilter läuft über den Join auf ``categories`` und
+        ``idx_products_category``; Sortierung, Limit und Offset übernimmt SQLite,
+        sodass nur die Treffer der angefragten Seite geladen werden.
+        """
+        stmt = self._product_select()
+        if category:
+            stmt = stmt.where(CategoryORM.name == category)
+        text = (text or "").strip()
+        if text and self.search_index_available and len(text) >= MIN_INDEXED_SEARCH:
+            search = table("products_search", column("rowid"))
+            stmt = stmt.join(search, search.c.rowid == literal_column("products.rowid")).where(
+                literal_column("products_search").op("MATCH")(_trigram_phrase(text))
+            )
+        elif text:
+            haystack = ProductORM.id + literal(" ") + ProductORM.name
+            stmt = stmt.where(haystack.ilike(f"%{_escape_like(text)}%", escape="\\"))
+        stmt = stmt.order_by(ProductORM.id).offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        session = self.SessionLocal()
+        try:
+            rows = session.execute(stmt)
+            return {row.id: self._product_row_to_domain(row) for row in rows}
+        finally:
+            session.close()
+
+    def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        """
+        Rangierte Präfixsuche über den FTS5-Index ``products_fts``
+
+        Sortiert wird nach bm25 mit den Feldgewichten ``FTS_WEIGHTS``. Ohne
+        FTS5-Unterstützung fällt die Suche auf ``search_products`` zurück.
+        """
+        match = _fts_match_query(query)
+        if not match:
+            return []
+        if not self.fts_available:
+            return list(self.search_products(query, limit=limit).values())
+
+        fts = table("products_fts", column("rowid"))
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        stmt = (
+            self._product_select()
+            .join(fts, fts.c.rowid == literal_column("products.rowid"))
+            .where(text("products_fts MATCH :match").bindparams(match=match))
+            .order_by(text(f"bm25(products_fts, {weights})"), ProductORM.id)
+            .limit(limit)
+        )
+        session = self.SessionLocal()
+        try:
+            rows = session.execute(stmt)
+            return [self._product_row_to_domain(row) for row in rows]
         finally:
             session.close()
 
@@ -318,13 +1301,355 @@ class SqliteRepository(RepositoryPort):
         """Alle Lagerbewegungen laden"""
         session = self.SessionLocal()
         try:
-            movements_orm = session.query(MovementORM).all()
-            return [self._movement_orm_to_domain(m) for m in movements_orm]
+            rows = session.execute(self._movement_select())
+            return [self._movement_row_to_domain(row) for row in rows]
+        finally:
+            session.close()
+
+    def iter_movements(
+        self, batch_size: int = 1000, order_by_time: bool = True
+    ) -> Iterator[Movement]:
+        """
+        Lagerbewegungen streamen (``yield_per``, konstanter Speicherbedarf)
+
+        Die Sortierung nach Zeit nutzt ``idx_movements_timestamp``.
+        """
+        stmt = self._movement_select()
+        if order_by_time:
+            stmt = stmt.order_by(MovementORM.timestamp, MovementORM.id)
+        session = self.SessionLocal()
+        try:
+            result = session.execute(stmt.execution_options(yield_per=batch_size))
+            for row in result:
+                yield self._movement_row_to_domain(row)
         finally:
             session.close()
 
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_cursor: Optional[MovementCursor] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        """
+        Lagerbewegungen gefiltert und seitenweise laden
+
+        Filter und Sortierung laufen in SQL über die Indizes
+        ``idx_movements_product``, ``idx_movements_user`` und
+        ``idx_movements_timestamp``. Die Pagination ist keyset-basiert
+        (``(timestamp, id) > cursor``) und damit unabhängig von der Seitenzahl.
+        """
+        stmt = self._movement_select()
+        if product_id is not None:
+            stmt = stmt.where(MovementORM.product_id == product_id)
+        if movement_type is not None:
+            stmt = stmt.where(MovementORM.movement_type == movement_type)
+        if performed_by is not None:
+            stmt = stmt.where(MovementORM.performed_by == performed_by)
+        if since is not None:
+            stmt = stmt.where(MovementORM.timestamp >= since)
+        if until is not None:
+            stmt = stmt.where(MovementORM.timestamp < until)
+        if after_cursor is not None:
+            stmt = stmt.where(
+                tuple_(MovementORM.timestamp, MovementORM.id) > tuple_(*after_cursor)
+            )
+        stmt = stmt.order_by(MovementORM.timestamp, MovementORM.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        session = self.SessionLocal()
+        try:
+            rows = session.execute(stmt)
+            return [self._movement_row_to_domain(row) for row in rows]
+        finally:
+            session.close()
+
+    def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        """
+        Bestand atomar ändern und Bewegung speichern
+
+        Ein bedingtes ``UPDATE ... SET quantity = quantity + ?`` und das Einfügen
+        der Bewegung laufen in einer Transaktion mit einem Commit. Parallele
+        Kassen können sich so keine Bestandsänderungen gegenseitig überschreiben.
+        """
+        table = ProductORM.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == product_id, table.c.quantity + delta >= 0)
+            .values(quantity=table.c.quantity + delta, updated_at=datetime.now())
+            .returning(table.c.quantity, table.c.name)
+        )
+        session = self.SessionLocal()
+        try:
+            row = session.execute(stmt).first()
+            if row is None:
+                # Nur im Fehlerfall: Ursache für die Fehlermeldung ermitteln
+                available = session.execute(
+                    select(table.c.quantity).where(table.c.id == product_id)
+                ).scalar()
+                if available is None:
+                    raise ValueError(f"Produkt {product_id} nicht gefunden")
+                raise ValueError(_insufficient_stock_message(available, delta))
+
+            if movement is not None:
+                session.add(self._domain_to_movement_orm(movement))
+            session.commit()
+            if movement is not None and not movement.product_name:
+                movement.product_name = row.name
+            return row.quantity
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        """
+        Stammdaten und Bestandsänderung in einem bedingten UPDATE speichern
+
+        ``quantity`` wird nur als ``quantity + ?`` geschrieben, nie aus dem
+        übergebenen Produkt; Bewegung und UPDATE teilen sich eine Transaktion.
+        """
+        table = ProductORM.__table__
+        session = self.SessionLocal()
+        try:
+            stmt = (
+                update(table)
+                .where(table.c.id == product.id, table.c.quantity + quantity_delta >= 0)
+                .values(
+                    name=product.name,
+                    description=product.description,
+                    price=product.price,
+                    sku=product.sku,
+                    category_id=self._category_id(session, product.category),
+                    quantity=table.c.quantity + quantity_delta,
+                    updated_at=datetime.now(),
+                )
+                .returning(table.c.quantity)
+            )
+            quantity = session.execute(stmt).scalar()
+            if quantity is None:
+                available = session.execute(
+                    select(table.c.quantity).where(table.c.id == product.id)
+                ).scalar()
+                if available is None:
+                    raise ValueError(f"Produkt {product.id} nicht gefunden")
+                raise ValueError(_insufficient_stock_message(available, quantity_delta))
+
+            if movement is not None:
+                session.add(self._domain_to_movement_orm(movement))
+            session.commit()
+            if movement is not None and not movement.product_name:
+                movement.product_name = product.name
+            product.quantity = quantity
+            return quantity
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """
+        Mehrere Produkte in einer Transaktion speichern (Upsert)
+
+        Statt SELECT + INSERT + COMMIT pro Produkt wird ein einziges
+        ``INSERT ... ON CONFLICT DO UPDATE`` per executemany ausgeführt.
+        Bestehende Produkte werden wie in ``save_product`` aktualisiert.
+        """
+        table = ProductORM.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                "name": stmt.excluded.name,
+                "description": stmt.excluded.description,
+                "price": stmt.excluded.price,
+                "quantity": stmt.excluded.quantity,
+                "sku": stmt.excluded.sku,
+                "category_id": stmt.excluded.category_id,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        session = self.SessionLocal()
+        try:
+            now = datetime.now()
+            categories: Dict[str, Optional[str]] = {}
+            for chunk in _chunked(products, BULK_BATCH_SIZE):
+                rows = [
+                    {
+                        "id": product.id,
+                        "warehouse_id": "WH001",  # Default Warehouse
+                        "category_id": self._category_id(session, product.category, categories),
+                        "sku": product.sku,
+                        "name": product.name,
+                        "description": product.description,
+                        "price": product.price,
+                        "quantity": product.quantity,
+                        "created_at": product.created_at,
+                        "updated_at": now,
+                        "notes": product.notes,
+                    }
+                    for product in chunk
+                ]
+                session.execute(stmt, rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Lagerbewegungen in einer Transaktion speichern (executemany)"""
+        stmt = MovementORM.__table__.insert()
+        session = self.SessionLocal()
+        try:
+            for chunk in _chunked(movements, BULK_BATCH_SIZE):
+                rows = [
+                    {
+                        "id": movement.id,
+                        "product_id": movement.product_id,
+                        "warehouse_id": "WH001",  # Default Warehouse
+                        "quantity_change": movement.quantity_change,
+                        "movement_type": movement.movement_type,
+                        "reason": movement.reason,
+                        "timestamp": movement.timestamp,
+                        "performed_by": movement.performed_by,
+                    }
+                    for movement in chunk
+                ]
+                session.execute(stmt, rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        """
+        Snapshot mit einer einzigen Anweisung schreiben
+
+        ``INSERT INTO inventory_snapshots ... SELECT`` über alle Produkte, der
+        Bestand am Tagesende ergibt sich aus ``quantity`` abzüglich der
+        Bewegungen ab dem Folgetag (gruppiert per ``idx_movements_timestamp``).
+        Ein vorhandener Snapshot des Tages wird per ``ON CONFLICT`` ersetzt.
+        """
+        boundary = end_of_day(snapshot_date)
+        products = ProductORM.__table__
+        movements = MovementORM.__table__
+        snapshots = InventorySnapshotORM.__table__
+
+        later = (
+            select(
+                movements.c.product_id,
+                func.sum(movements.c.quantity_change).label("delta"),
+            )
+            .where(movements.c.timestamp >= boundary)
+            .group_by(movements.c.product_id)
+            .subquery()
+        )
+        quantity = products.c.quantity - func.coalesce(later.c.delta, 0)
+        rows = (
+            select(
+                products.c.warehouse_id,
+                products.c.id,
+                quantity,
+                quantity * products.c.price,
+                literal(snapshot_date.isoformat()),
+            )
+            .select_from(products.outerjoin(later, later.c.product_id == products.c.id))
+            .where(products.c.created_at < boundary)
+        )
+        stmt = sqlite_insert(snapshots).from_select(
+            ["warehouse_id", "product_id", "quantity", "total_value", "snapshot_date"], rows
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                snapshots.c.warehouse_id, snapshots.c.product_id, snapshots.c.snapshot_date,
+            ],
+            set_={
+                "quantity": stmt.excluded.quantity,
+                "total_value": stmt.excluded.total_value,
+            },
+        )
+
+        session = self.SessionLocal()
+        try:
+            count = session.execute(stmt).rowcount
+            session.commit()
+            return count
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def load_inventory_snapshot(
+        self, at: date, product_id: Optional[str] = None
+    ) -> InventorySnapshot:
+        """Jüngsten Stichtag suchen (``idx_inventory_snapshots_date``), dann seine Zeilen laden"""
+        snapshots = InventorySnapshotORM.__table__
+        latest = select(func.max(snapshots.c.snapshot_date)).where(
+            snapshots.c.snapshot_date <= at.isoformat()
+        )
+        if product_id is not None:
+            latest = latest.where(snapshots.c.product_id == product_id)
+
+        session = self.SessionLocal()
+        try:
+            day = session.execute(latest).scalar()
+            if day is None:
+                return None, {}
+            stmt = select(snapshots.c.product_id, snapshots.c.quantity).where(
+                snapshots.c.snapshot_date == day
+            )
+            if product_id is not None:
+                stmt = stmt.where(snapshots.c.product_id == product_id)
+            quantities = {row.product_id: row.quantity for row in session.execute(stmt)}
+            return date.fromisoformat(day), quantities
+        finally:
+            session.close()
+
+    def data_version(self) -> int:
+        """
+        Datenstand über ``PRAGMA data_version``
+
+        SQLite ändert den PRAGMA-Wert einer Verbindung, sobald eine andere
+        Verbindung einen Commit ausführt, auch aus einem anderen Prozess. Dafür
+        wird eine eigene Verbindung gehalten, über die nie geschrieben wird;
+        jede Änderung des Werts erhöht den zurückgegebenen Zähler.
+        """
+        with self._version_lock:
+            if self._version_connection is None:
+                self._version_connection = self.engine.raw_connection()
+            cursor = self._version_connection.cursor()
+            try:
+                cursor.execute("PRAGMA data_version")
+                value = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+            if value != self._seen_version:
+                self._seen_version = value
+                self._data_version += 1
+            return self._data_version
+
     def close(self) -> None:
         """Datenbank-Verbindung schließen"""
+        with self._version_lock:
+            if self._version_connection is not None:
+                self._version_connection.close()
+                self._version_connection = None
         self.engine.dispose()
     
     def __del__(self):
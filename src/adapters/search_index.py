@@ -0,0 +1,134 @@
+"""Trigramm-Index für die Teilstring-Suche der In-Memory-Repositories
+
+Jeder Suchtext ("<id> <name>" in Kleinbuchstaben) wird in Trigramme
+zerlegt; der Index hält je Trigramm die Menge der Produkt-IDs. Ein
+Suchtext ab drei Zeichen wird über die Schnittmenge der Trigramm-Mengen
+gefunden (beginnend mit der kleinsten) und gegen den gespeicherten Text
+geprüft. Der Aufwand hängt damit von der Zahl der Kandidaten ab, nicht
+von der Katalog-Größe.
+
+Damit auch ein oder zwei Zeichen über den Index laufen, wird jeder Text
+am Ende mit zwei Füllzeichen (``"\\0"``) verlängert: dann beginnt an jeder
+Position ein Trigramm, und ein kurzer Suchtext kommt genau dann vor, wenn
+ein Trigramm mit ihm beginnt. Dafür werden die (von der Katalog-Größe
+unabhängig begrenzten) Trigramm-Schlüssel durchsucht.
+
+Der Index wird von den Schreibzugriffen gepflegt (``add``/``remove``);
+Produkte, die direkt verändert und nicht gespeichert werden, findet die
+Suche mit ihrem zuletzt gespeicherten Namen.
+"""
+
+from typing import Dict, Iterable, Optional, Set
+
+from ..domain.product import Product
+
+_PADDING = "\0\0"
+
+
+def search_text(product: Product) -> str:
+    """Durchsuchter Text eines Produkts"""
+    return f"{product.id} {product.name}".lower()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = text + _PADDING
+    return {padded[i:i + 3] for i in range(len(text))}
+
+
+class TrigramIndex:
+    """Trigramm -> Produkt-IDs, dazu Suchtext und Kategorie je Produkt"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._texts: Dict[str, str] = {}
+        self._categories: Dict[str, str] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, product: Product) -> None:
+        """Produkt (neu) aufnehmen; unveränderte Produkte kosten nur einen Vergleich"""
+        text = search_text(product)
+        category = product.category or ""
+        old_text = self._texts.get(product.id)
+        if old_text == text and self._categories.get(product.id) == category:
+            return
+        if old_text is not None:
+            self.remove(product.id)
+
+        self._texts[product.id] = text
+        for gram in _trigrams(text):
+            self._postings.setdefault(gram, set()).add(product.id)
+        self._categories[product.id] = category
+        self._by_category.setdefault(category, set()).add(product.id)
+
+    def add_all(self, products: Iterable[Product]) -> None:
+        for product in products:
+            self.add(product)
+
+    def remove(self, product_id: str) -> None:
+        """Produkt entfernen (unbekannte IDs werden ignoriert)"""
+        text = self._texts.pop(product_id, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            ids = self._postings[gram]
+            ids.discard(product_id)
+            if not ids:
+                del self._postings[gram]
+        category = self._categories.pop(product_id)
+        ids = self._by_category[category]
+        ids.discard(product_id)
+        if not ids:
+            del self._by_category[category]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._texts.clear()
+        self._categories.clear()
+        self._by_category.clear()
+
+    def _matching(self, text: str) -> Set[str]:
+        if len(text) < 3:
+            # Kurzer Suchtext: Vereinigung aller Trigramme, die mit ihm beginnen
+            matches: Set[str] = set()
+            for gram, ids in self._postings.items():
+                if gram.startswith(text):
+                    matches |= ids
+            return matches
+
+        postings = []
+        for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            ids = self._postings.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            candidates = candidates & ids
+            if not candidates:
+                return candidates
+        # Trigramme sagen nichts über ihre Reihenfolge: Treffer am Text prüfen
+        return {product_id for product_id in candidates if text in self._texts[product_id]}
+
+    def search(self, text: str = "", category: Optional[str] = None) -> Set[str]:
+        """
+        IDs der Produkte, deren Suchtext ``text`` enthält (ohne Groß-/Kleinschreibung)
+
+        Args:
+            text: Suchtext ("" = alle)
+            category: nur Produkte dieser Kategorie (None/"" = alle)
+        """
+        text = text.lower()
+        if not text:
+            if category:
+                return set(self._by_category.get(category, ()))
+            return set(self._texts)
+
+        matches = self._matching(text)
+        if category:
+            # Schnittmenge läuft über die kleinere der beiden Mengen
+            return matches & self._by_category.get(category, set())
+        return matches
@@ -0,0 +1,304 @@
+"""Snapshot - binäres Abbild des Zustands eines In-Memory Repositorys
+
+Aufbau (little-endian)::
+
+    Kopf       MAGIC, Version, Anzahl Strings/Produkte/Bewegungen/Bestandszeilen,
+               Länge String-Blob
+    Strings    Offsets (int64, Anzahl + 1) und UTF-8-Blob aller eindeutigen Strings
+    Produkte   eine Spalte je Feld: String-Indizes (int32, -1 = None), price (float64),
+               quantity, created_at, updated_at (int64, Zeiten in µs seit 1970)
+    Bestände   Bestands-Snapshots, eine Zeile je Stichtag und Produkt: Stichtag
+               (int32, ``date.toordinal``), Produkt-ID (int32, String-Index), quantity (int64)
+    Bewegungen String-Spalten (int32) sowie quantity_change und timestamp (int64)
+
+Die Datei wird in einem Stück gelesen; jede Spalte wird per
+``array.frombytes`` ohne Parsen übernommen. Produkte werden sofort erzeugt,
+Bewegungen erst bei der ersten Bewegungsabfrage. Die Zeilen der
+Bestands-Snapshots liegen nach Stichtag gruppiert vor. Gleiche Strings (Kategorien,
+Bewegungstypen, Benutzer, Produktnamen) liegen nur einmal in der Tabelle
+und werden beim Laden als dasselbe Objekt geteilt.
+"""
+
+import gc
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import groupby, repeat, starmap
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+
+MAGIC = b"LAGSNP"
+SNAPSHOT_VERSION = 2
+
+_HEADER = struct.Struct("<6sHIIIIQ")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+PRODUCT_STRING_FIELDS = ("id", "name", "description", "sku", "category", "notes")
+MOVEMENT_STRING_FIELDS = (
+    "id", "product_id", "product_name", "movement_type", "reason", "performed_by",
+)
+
+
+class SnapshotError(ValueError):
+    """Datei ist kein (kompatibler) Snapshot"""
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _datetimes(column: array) -> Iterator[datetime]:
+    """µs seit 1970 in datetime umwandeln (timedelta(0, 0, µs), ohne Python-Schleife)"""
+    return map(_EPOCH.__add__, map(timedelta, repeat(0), repeat(0), column))
+
+
+def _column_bytes(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class _StringTable:
+    """Eindeutige Strings sammeln und als Indizes referenzieren"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def ref(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.values)
+            self.values.append(value)
+        return position
+
+
+def write_snapshot(
+    path,
+    products: Iterable[Product],
+    movements: Iterable[Movement],
+    inventory_snapshots: Optional[Mapping[date, Mapping[str, int]]] = None,
+) -> None:
+    """
+    Produkte, Bewegungen und Bestands-Snapshots atomar (temporäre Datei +
+    os.replace) als Snapshot schreiben
+    """
+    strings = _StringTable()
+
+    product_refs = {field: array("i") for field in PRODUCT_STRING_FIELDS}
+    prices = array("d")
+    product_ints = {field: array("q") for field in ("quantity", "created_at", "updated_at")}
+    product_count = 0
+    for product in products:
+        for field, column in product_refs.items():
+            column.append(strings.ref(getattr(product, field)))
+        prices.append(product.price)
+        product_ints["quantity"].append(product.quantity)
+        product_ints["created_at"].append(_to_micros(product.created_at))
+        product_ints["updated_at"].append(_to_micros(product.updated_at))
+        product_count += 1
+
+    # Vor den Bewegungen: Produkt-IDs gelöschter Produkte landen so noch im
+    # Teil der String-Tabelle, der beim Laden sofort dekodiert wird
+    snapshot_dates = array("i")
+    snapshot_products = array("i")
+    snapshot_quantities = array("q")
+    for snapshot_date, quantities in (inventory_snapshots or {}).items():
+        ordinal = snapshot_date.toordinal()
+        for product_id, quantity in quantities.items():
+            snapshot_dates.append(ordinal)
+            snapshot_products.append(strings.ref(product_id))
+            snapshot_quantities.append(quantity)
+
+    movement_refs = {field: array("i") for field in MOVEMENT_STRING_FIELDS}
+    changes = array("q")
+    timestamps = array("q")
+    movement_count = 0
+    for movement in movements:
+        for field, column in movement_refs.items():
+            column.append(strings.ref(getattr(movement, field)))
+        changes.append(movement.quantity_change)
+        timestamps.append(_to_micros(movement.timestamp))
+        movement_count += 1
+
+    encoded = [value.encode("utf-8") for value in strings.values]
+    offsets = array("q", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    blob = b"".join(encoded)
+
+    sections = [
+        _HEADER.pack(
+            MAGIC, SNAPSHOT_VERSION, len(encoded), product_count, movement_count,
+            len(snapshot_dates), len(blob),
+        ),
+        _column_bytes(offsets),
+        blob,
+        *(_column_bytes(product_refs[field]) for field in PRODUCT_STRING_FIELDS),
+        _column_bytes(prices),
+        *(_column_bytes(column) for column in product_ints.values()),
+        _column_bytes(snapshot_dates),
+        _column_bytes(snapshot_products),
+        _column_bytes(snapshot_quantities),
+        *(_column_bytes(movement_refs[field]) for field in MOVEMENT_STRING_FIELDS),
+        _column_bytes(changes),
+        _column_bytes(timestamps),
+    ]
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(sections)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+class _Reader:
+    """Spalten nacheinander aus dem gelesenen Puffer übernehmen"""
+
+    def __init__(self, data: bytes, position: int):
+        self.data = memoryview(data)
+        self.position = position
+
+    def column(self, typecode: str, count: int) -> array:
+        column = array(typecode)
+        size = column.itemsize * count
+        if self.position + size > len(self.data):
+            raise SnapshotError("Snapshot ist unvollständig")
+        column.frombytes(self.data[self.position:self.position + size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        self.position += size
+        return column
+
+    def raw(self, size: int) -> memoryview:
+        chunk = self.data[self.position:self.position + size]
+        self.position += size
+        return chunk
+
+
+def _decode_strings(blob: bytes, offsets: array, start: int, stop: int) -> List[str]:
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(start, stop)]
+
+
+@contextmanager
+def _gc_paused():
+    """Zyklischen GC pausieren, während Millionen neuer Objekte entstehen"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def read_snapshot(
+    path,
+) -> Tuple[Dict[str, Product], Dict[date, Dict[str, int]], Callable[[], List[Movement]]]:
+    """
+    Snapshot lesen
+
+    Returns:
+        (Produkte nach ID, Bestands-Snapshots je Stichtag, Funktion, die die
+        Bewegungen in Speicherreihenfolge erzeugt). Die Bewegungen werden erst
+        beim Aufruf dieser Funktion aufgebaut, damit ein Start mit großer
+        Historie nicht auf Millionen von Objekten wartet.
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        raise SnapshotError(f"{path} ist kein Snapshot")
+    (
+        magic, version, string_count, product_count, movement_count, snapshot_rows, blob_size
+    ) = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} ist kein Snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Snapshot-Version {version} wird nicht unterstützt")
+
+    reader = _Reader(data, _HEADER.size)
+    offsets = reader.column("q", string_count + 1)
+    blob = bytes(reader.raw(blob_size))
+    product_columns = [reader.column("i", product_count) for _ in PRODUCT_STRING_FIELDS]
+    prices = reader.column("d", product_count)
+    quantities, created, updated = (reader.column("q", product_count) for _ in range(3))
+    snapshot_dates = reader.column("i", snapshot_rows)
+    snapshot_products = reader.column("i", snapshot_rows)
+    snapshot_quantities = reader.column("q", snapshot_rows)
+    movement_columns = [reader.column("i", movement_count) for _ in MOVEMENT_STRING_FIELDS]
+    changes = reader.column("q", movement_count)
+    timestamps = reader.column("q", movement_count)
+
+    # Produkte und Bestands-Snapshots werden vor den Bewegungen geschrieben,
+    # ihre Strings liegen also am Anfang der Tabelle; nur dieser Teil wird
+    # sofort dekodiert. Index -1 (None) zeigt jeweils auf das angehängte
+    # letzte Element.
+    product_string_count = 1 + max(
+        (max(column, default=-1) for column in (*product_columns, snapshot_products)),
+        default=-1,
+    )
+    head = _decode_strings(blob, offsets, 0, product_string_count)
+
+    # Zeilen über map/zip/starmap aufbauen: die Schleifen laufen in C,
+    # in Python bleibt nur der Konstruktor der Dataclass
+    def text(strings: List[Optional[str]], column: array):
+        return map(strings.__getitem__, column)
+
+    strings = head + [None]
+    ids, names, descriptions, skus, categories, notes = product_columns
+    with _gc_paused():
+        products: Dict[str, Product] = {
+            product.id: product
+            for product in starmap(
+                Product,
+                zip(
+                    text(strings, ids), text(strings, names), text(strings, descriptions),
+                    prices, quantities, text(strings, skus), text(strings, categories),
+                    _datetimes(created), _datetimes(updated), text(strings, notes),
+                ),
+            )
+        }
+
+    inventory_snapshots: Dict[date, Dict[str, int]] = {
+        date.fromordinal(ordinal): {product_id: quantity for _, product_id, quantity in rows}
+        for ordinal, rows in groupby(
+            zip(snapshot_dates, text(strings, snapshot_products), snapshot_quantities),
+            key=itemgetter(0),
+        )
+    }
+
+    def load_movements() -> List[Movement]:
+        strings = head + _decode_strings(blob, offsets, product_string_count, string_count)
+        strings.append(None)
+        ids, product_ids, product_names, types, reasons, users = movement_columns
+        with _gc_paused():
+            return list(
+                starmap(
+                    Movement,
+                    zip(
+                        text(strings, ids), text(strings, product_ids),
+                        text(strings, product_names), changes, text(strings, types),
+                        text(strings, reasons), _datetimes(timestamps), text(strings, users),
+                    ),
+                )
+            )
+
+    return products, inventory_snapshots, load_movements
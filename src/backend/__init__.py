@@ -1,5 +1,6 @@
 """Backend - Anwendungsschicht (Use Cases)"""
 
 from .use_cases import WarehouseUseCases
+from .async_use_cases import AsyncWarehouseUseCases
 
-__all__ = ["WarehouseUseCases"]
+__all__ = ["WarehouseUseCases", "AsyncWarehouseUseCases"]
@@ -0,0 +1,267 @@
+"""Backend Use Cases - asynchrone Variante auf AsyncRepositoryPort"""
+
+import asyncio
+from concurrent.futures import Executor
+from datetime import date, datetime
+from functools import partial
+from typing import Dict, List, Optional
+
+from ..domain.ids import new_movement_id
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import AsyncRepositoryPort
+from .category_report import LazyProcessPool, build_category_report
+from .report_cache import ReportCache
+from .use_cases import (
+    apply_product_changes,
+    apply_stock_delta,
+    build_inventory_report,
+    correction_movement,
+    default_snapshot_date,
+    initial_stock_movement,
+    stock_query_window,
+)
+
+
+class AsyncWarehouseUseCases:
+    """
+    Kern-Use-Cases der Lagerverwaltung für nicht-blockierende Aufrufer
+
+    Gleiche Semantik wie WarehouseUseCases; alle Methoden sind Coroutinen,
+    sodass viele gleichzeitige Anfragen ihre I/O überlappen können.
+    """
+
+    def __init__(
+        self,
+        repository: AsyncRepositoryPort,
+        report_cache: Optional[ReportCache] = None,
+        report_pool: Optional[Executor] = None,
+    ):
+        self.repository = repository
+        self.report_cache = report_cache if report_cache is not None else ReportCache()
+        self.report_pool = report_pool if report_pool is not None else LazyProcessPool()
+
+    def close(self) -> None:
+        """Prozess-Pool der Reports beenden (das Repository bleibt offen)"""
+        self.report_pool.shutdown()
+
+    # CRUD
+    async def create_product(
+        self,
+        product_id: str,
+        name: str,
+        description: str,
+        price: float,
+        category: str = "",
+        quantity: int = 0,
+        sku: str = "",
+        notes: Optional[str] = None,
+    ) -> Product:
+        if await self.repository.load_product(product_id) is not None:
+            raise ValueError(f"Produkt mit ID {product_id} existiert bereits")
+
+        product = Product(
+            id=product_id,
+            name=name,
+            description=description,
+            price=price,
+            quantity=quantity,
+            category=category,
+            sku=sku,
+            notes=notes,
+        )
+        await self.repository.save_product(product)
+        if quantity > 0:
+            await self.repository.save_movement(initial_stock_movement(product))
+        return product
+
+    async def read_product(self, product_id: str) -> Optional[Product]:
+        return await self.repository.load_product(product_id)
+
+    async def list_products(
+        self,
+        search: str = "",
+        category: str = "Alle",
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        search = (search or "").strip()
+        category = (category or "").strip()
+        if category == "Alle":
+            category = ""
+
+        if not search and not category and limit is None and not offset:
+            return await self.repository.load_all_products()
+
+        return await self.repository.search_products(
+            search, category or None, limit=limit, offset=offset
+        )
+
+    async def search_products(self, query: str, limit: int = 20) -> List[Product]:
+        """Volltextsuche (Name, Beschreibung, SKU), beste Treffer zuerst"""
+        return await self.repository.full_text_search(query, limit=limit)
+
+    async def update_product(
+        self,
+        product_id: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        price: Optional[float] = None,
+        category: Optional[str] = None,
+        quantity: Optional[int] = None,
+        sku: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> Product:
+        product = await self.repository.load_product(product_id)
+        if product is None:
+            raise ValueError(f"Produkt {product_id} nicht gefunden")
+
+        quantity_delta = apply_product_changes(
+            product, name, description, price, category, quantity, sku, notes
+        )
+        # Der geladene Bestand wird nie zurückgeschrieben: Stammdaten und
+        # Bestandsdelta samt Korrekturbewegung werden atomar gespeichert, damit
+        # zwischenzeitliche Buchungen (z.B. Kassen-Scans) erhalten bleiben
+        movement = correction_movement(product, quantity_delta) if quantity_delta else None
+        product.quantity = await self.repository.update_product(product, quantity_delta, movement)
+        return product
+
+    async def delete_product(self, product_id: str) -> bool:
+        if await self.repository.load_product(product_id) is None:
+            return False
+        await self.repository.delete_product(product_id)
+        return True
+
+    async def list_movements(
+        self,
+        product_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        return await self.repository.query_movements(
+            product_id=product_id, since=since, until=until, limit=limit
+        )
+
+    # Bestandsbuchungen
+    async def add_to_stock(
+        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    ) -> int:
+        """Bestand erhöhen, liefert den neuen Bestand"""
+        movement = Movement(
+            id=new_movement_id(),
+            product_id=product_id,
+            product_name="",  # wird vom Repository ergänzt
+            quantity_change=quantity,
+            movement_type="IN",
+            reason=reason,
+            performed_by=user,
+        )
+        return await self.repository.apply_stock_change(product_id, quantity, movement)
+
+    async def remove_from_stock(
+        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    ) -> int:
+        """Bestand verringern, liefert den neuen Bestand"""
+        movement = Movement(
+            id=new_movement_id(),
+            product_id=product_id,
+            product_name="",  # wird vom Repository ergänzt
+            quantity_change=-quantity,
+            movement_type="OUT",
+            reason=reason,
+            performed_by=user,
+        )
+        return await self.repository.apply_stock_change(product_id, -quantity, movement)
+
+    # Bestand zum Stichtag
+    async def take_inventory_snapshot(self, snapshot_date: Optional[date] = None) -> int:
+        """Täglicher Snapshot-Job (Standard: gestriger Tag), liefert die Anzahl Produkte"""
+        if snapshot_date is None:
+            snapshot_date = default_snapshot_date()
+        return await self.repository.save_inventory_snapshot(snapshot_date)
+
+    async def stock_at(self, product_id: Optional[str], at: date) -> Dict[str, int]:
+        """Bestand am Ende des Tages ``at`` (siehe WarehouseUseCases.stock_at)"""
+        snapshot_date, quantities = await self.repository.load_inventory_snapshot(
+            at, product_id
+        )
+        direction, since, until = stock_query_window(at, snapshot_date, date.today())
+        if product_id is None:
+            products = [product async for product in self.repository.iter_products()]
+        else:
+            product = await self.repository.load_product(product_id)
+            products = [] if product is None else [product]
+
+        if direction < 0:
+            quantities = {product.id: product.quantity for product in products}
+        movements = await self.repository.query_movements(
+            product_id=product_id, since=since, until=until
+        )
+        return apply_stock_delta(products, quantities, movements, direction, at)
+
+    # Report A: Lagerstandsreport
+    async def _cached_report(self, key: tuple, build):
+        """Report aus dem Cache liefern oder mit der Coroutine-Funktion ``build`` erzeugen"""
+        version = await self.repository.data_version()
+        report = self.report_cache.lookup(key, version)
+        if report is None:
+            report = await build()
+            self.report_cache.store(key, version, report)
+        return report
+
+    async def generate_inventory_report(self) -> Dict[str, object]:
+        async def build():
+            return build_inventory_report(await self.repository.load_all_products())
+
+        return await self._cached_report(("inventory",), build)
+
+    async def generate_inventory_report_at(self, at: date) -> Dict[str, object]:
+        """Report A zum Stichtag, bewertet mit den aktuellen Preisen"""
+
+        async def build():
+            products, quantities = await asyncio.gather(
+                self.repository.load_all_products(), self.stock_at(None, at)
+            )
+            report = build_inventory_report(products, quantities)
+            report["as_of"] = at
+            return report
+
+        return await self._cached_report(("inventory_at", at), build)
+
+    async def generate_inventory_report_by_category(self, workers: int = 1) -> Dict[str, object]:
+        """Report A mit Zwischensummen je Kategorie; die Aufbereitung läuft außerhalb der Loop"""
+
+        async def build():
+            products = await self.repository.load_all_products()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                partial(build_category_report, products.values(), workers, self.report_pool),
+            )
+
+        return await self._cached_report(("inventory_by_category",), build)
+
+    async def generate_inventory_report_text(self) -> str:
+        """Lagerstandsreport als Text, Produkte wie synchron nach ID sortiert"""
+        from ..adapters.report import iter_inventory_report, render_report
+
+        async def build():
+            products = [product async for product in self.repository.iter_products()]
+            return render_report(iter_inventory_report(products))
+
+        return await self._cached_report(("inventory_text",), build)
+
+    async def generate_movement_report_text(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> str:
+        from ..adapters.report import ConsoleReportAdapter
+
+        async def build():
+            products, movements = await asyncio.gather(
+                self.repository.load_all_products(),
+                self.repository.query_movements(since=since, until=until),
+            )
+            return ConsoleReportAdapter(products, movements).generate_movement_report()
+
+        return await self._cached_report(("movement_text", since, until), build)
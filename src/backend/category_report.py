@@ -0,0 +1,209 @@
+"""Lagerstandsreport mit Zwischensummen je Kategorie, optional parallel
+
+Die Produkte werden nach Kategorie in Partitionen aufgeteilt; jede
+Partition wird unabhängig aufbereitet (Positionen als Dictionaries, Summen
+und Textblock je Kategorie), bei ``workers > 1`` in einem
+``ProcessPoolExecutor``. Das Zusammenführen ist unabhängig von
+Partitionierung und Worker-Anzahl:
+
+- Positionen werden nach Produkt-ID gemischt (jede Partition ist sortiert)
+- Kategorien liegen vollständig in genau einer Partition und werden nach
+  Namen sortiert, ihre Textblöcke ebenso
+- Summen werden mit ``math.fsum`` gebildet, das exakt gerundet und damit
+  unabhängig von der Reihenfolge der Summanden ist
+
+Ein Report mit 8 Workern ist daher bitgleich mit dem sequentiellen.
+
+Unterhalb von ``PARALLEL_THRESHOLD`` Produkten wird immer sequentiell
+gearbeitet: Start und Datentransfer der Prozesse kosten mehr, als die
+Verteilung einspart.
+"""
+
+import heapq
+import math
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..domain.product import Product
+
+# (id, name, category, price, quantity) - schlanker als Product beim Pickling
+ProductRow = Tuple[str, str, str, float, int]
+# Ergebnis einer Partition: Positionen, Summen je Kategorie, Textblock je Kategorie
+PartitionResult = Tuple[List[Dict[str, object]], Dict[str, Dict[str, object]], Dict[str, str]]
+
+# Ab so vielen Produkten wird mit workers > 1 tatsächlich parallel gearbeitet
+PARALLEL_THRESHOLD = 100_000
+
+
+class LazyProcessPool(Executor):
+    """
+    ProcessPoolExecutor, der erst beim ersten Auftrag gestartet wird
+
+    Danach bleibt der Pool bestehen und wird von allen folgenden Reports
+    wiederverwendet, bis ``shutdown`` aufgerufen wird (ein späterer
+    Auftrag startet ihn neu).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            pool = self._pool
+        return pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def effective_workers(count: int, workers: int, threshold: int = PARALLEL_THRESHOLD) -> int:
+    """Tatsächliche Worker-Anzahl: 1 bei weniger als ``threshold`` Produkten"""
+    if workers < 1:
+        raise ValueError("workers muss mindestens 1 sein")
+    return workers if count >= threshold else 1
+
+
+def partition_by_category(rows: Iterable[ProductRow], partitions: int) -> List[List[ProductRow]]:
+    """
+    Zeilen nach Kategorie auf höchstens ``partitions`` Partitionen verteilen
+
+    Große Kategorien werden zuerst der jeweils kleinsten Partition
+    zugeordnet; die Zuordnung hängt nur von den Daten ab.
+    """
+    if partitions < 1:
+        raise ValueError("partitions muss mindestens 1 sein")
+    by_category: Dict[str, List[ProductRow]] = {}
+    for row in rows:
+        by_category.setdefault(row[2], []).append(row)
+
+    buckets: List[List[ProductRow]] = [[] for _ in range(min(partitions, len(by_category)))]
+    # (Größe, Index) als Heap: kleinste Partition zuerst, bei Gleichstand kleinster Index
+    sizes = [(0, index) for index in range(len(buckets))]
+    for category in sorted(by_category, key=lambda c: (-len(by_category[c]), c)):
+        size, index = heapq.heappop(sizes)
+        buckets[index].extend(by_category[category])
+        heapq.heappush(sizes, (size + len(by_category[category]), index))
+    return buckets
+
+
+def summarize_partition(rows: List[ProductRow]) -> PartitionResult:
+    """
+    Positionen (sortiert nach ID), Summen und Textblöcke je Kategorie einer Partition
+
+    Läuft im Worker-Prozess und muss daher auf Modulebene liegen. Die
+    Positionen werden hier schon als fertige Dictionaries und der Text je
+    Kategorie als ein String erzeugt, damit im aufrufenden Prozess nur
+    noch gemischt und verkettet wird.
+    """
+    items: List[Dict[str, object]] = []
+    values: Dict[str, List[float]] = {}
+    quantities: Dict[str, int] = {}
+    lines: Dict[str, List[str]] = {}
+    for product_id, name, category, price, quantity in sorted(rows, key=itemgetter(0)):
+        item_total = price * quantity
+        items.append({
+            "id": product_id,
+            "name": name,
+            "category": category,
+            "quantity": quantity,
+            "price": price,
+            "total_value": item_total,
+        })
+        values.setdefault(category, []).append(item_total)
+        quantities[category] = quantities.get(category, 0) + quantity
+        lines.setdefault(category, []).append(
+            f"  {product_id} | {name} | {quantity} x {price:.2f} € = {item_total:.2f} €\n"
+        )
+
+    categories: Dict[str, Dict[str, object]] = {}
+    texts: Dict[str, str] = {}
+    for category, category_values in values.items():
+        total = math.fsum(category_values)
+        categories[category] = {
+            "category": category,
+            "products": len(category_values),
+            "quantity": quantities[category],
+            "total_value": total,
+        }
+        texts[category] = "".join([
+            f"Kategorie: {category or '(ohne)'}\n",
+            *lines[category],
+            f"  Zwischensumme: {len(category_values)} Produkte, "
+            f"{quantities[category]} Stück, {total:.2f} €\n",
+            "\n",
+        ])
+    return items, categories, texts
+
+
+def build_category_report(
+    products: Iterable[Product],
+    workers: int = 1,
+    executor: Optional[Executor] = None,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+) -> Dict[str, object]:
+    """
+    Report A mit Zwischensummen je Kategorie aufbauen
+
+    Args:
+        products: Produkte (Reihenfolge egal)
+        workers: Anzahl Partitionen bzw. Prozesse (1 = im aufrufenden Prozess)
+        executor: bestehender Executor (z.B. der langlebige Pool der Use Cases);
+            sonst wird bei paralleler Aufbereitung ein Pool für diesen Aufruf erzeugt
+        parallel_threshold: Mindestanzahl Produkte für parallele Aufbereitung
+
+    Returns:
+        Dictionary wie ``build_inventory_report`` (Positionen mit Kategorie,
+        sortiert nach ID), zusätzlich ``categories`` (sortiert nach Namen)
+        und ``text`` (Report als Text, gegliedert nach Kategorien)
+    """
+    rows = [
+        (product.id, product.name, product.category or "", product.price, product.quantity)
+        for product in products
+    ]
+    workers = effective_workers(len(rows), workers, parallel_threshold)
+    partitions = partition_by_category(rows, workers)
+
+    if len(partitions) <= 1:
+        results = [summarize_partition(partition) for partition in partitions]
+    elif executor is not None:
+        results = list(executor.map(summarize_partition, partitions))
+    else:
+        with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+            results = list(pool.map(summarize_partition, partitions))
+
+    items = list(heapq.merge(*(items for items, _, _ in results), key=itemgetter("id")))
+    categories: Dict[str, Dict[str, object]] = {}
+    texts: Dict[str, str] = {}
+    for _, partition_categories, partition_texts in results:
+        categories.update(partition_categories)
+        texts.update(partition_texts)
+    names = sorted(categories)
+    total_value = math.fsum(item["total_value"] for item in items)
+
+    return {
+        "title": "Lagerstandsreport",
+        "generated_at": datetime.now(),
+        "items": items,
+        "categories": [categories[name] for name in names],
+        "total_value": total_value,
+        "text": "".join([
+            "=" * 60 + "\n",
+            "LAGERSTANDSREPORT JE KATEGORIE\n",
+            "=" * 60 + "\n",
+            "\n",
+            *(texts[name] for name in names),
+            "-" * 60 + "\n",
+            f"Gesamtwert Lager: {total_value:.2f} €\n",
+            "=" * 60 + "\n",
+        ]),
+    }
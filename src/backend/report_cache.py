@@ -0,0 +1,78 @@
+"""Report-Cache - fertige Reports je Datenstand des Repositorys"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ReportCache:
+    """
+    LRU-Cache für generierte Reports (Text und Dictionary)
+
+    Schlüssel sind (Report-Typ, Parameter, ``data_version`` des Repositorys).
+    Solange sich der Datenstand nicht ändert, liefert ein erneuter Aufruf
+    denselben Report ohne Zugriff auf das Repository. Einträge eines älteren
+    Datenstands werden beim nächsten Speichern verworfen.
+
+    Gecachte Reports werden geteilt und dürfen vom Aufrufer nicht verändert werden.
+    """
+
+    def __init__(self, max_size: int = 32):
+        if max_size < 1:
+            raise ValueError("max_size muss mindestens 1 sein")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, int], object]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable, version: int):
+        """Gecachten Report liefern oder None"""
+        with self._lock:
+            value = self._entries.get((key, version))
+            if value is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end((key, version))
+                self.hits += 1
+            return value
+
+    def store(self, key: Hashable, version: int, value) -> None:
+        with self._lock:
+            if self._version is not None and version < self._version:
+                # Während des Aufbaus wurde bereits ein neuerer Stand gespeichert
+                return
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._entries[(key, version)] = value
+            self._entries.move_to_end((key, version))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key: Hashable, version: int, build: Callable[[], T]) -> T:
+        """
+        Report zum Datenstand ``version`` aus dem Cache liefern oder erzeugen
+
+        ``build`` läuft ohne Lock; ``version`` muss vor dem Aufbau gelesen
+        werden, damit ein parallel geschriebener Stand nie unter einer
+        neueren Version landet.
+        """
+        value = self.lookup(key, version)
+        if value is None:
+            value = build()
+            self.store(key, version, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self) -> Dict[str, int]:
+        """Cache-Statistik: Treffer, Fehlzugriffe und Größe"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
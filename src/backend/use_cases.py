@@ -1,18 +1,221 @@
 """Backend Use Cases - Kernlogik"""
 
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+from concurrent.futures import Executor
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple
 
+from ..domain.ids import new_movement_id
 from ..domain.product import Product
-from ..domain.warehouse import Movement
+from ..domain.warehouse import Movement, end_of_day
 from ..ports import RepositoryPort
+from ..reports.export import DEFAULT_CHUNK_SIZE, export_report
+from .category_report import LazyProcessPool, build_category_report
+from .report_cache import ReportCache
+
+
+def initial_stock_movement(product: Product) -> Movement:
+    """Bewegung für den Startbestand eines neuen Produkts"""
+    return Movement(
+        id=new_movement_id(),
+        product_id=product.id,
+        product_name=product.name,
+        quantity_change=product.quantity,
+        movement_type="IN",
+        reason="Startbestand",
+        performed_by="system",
+    )
+
+
+def correction_movement(product: Product, quantity_delta: int) -> Movement:
+    """Bewegung für eine manuelle Bestandskorrektur"""
+    return Movement(
+        id=new_movement_id(),
+        product_id=product.id,
+        product_name=product.name,
+        quantity_change=quantity_delta,
+        movement_type="CORRECTION",
+        reason="Bestandskorrektur",
+        performed_by="system",
+    )
+
+
+def iter_movement_pages(
+    repository: RepositoryPort,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    page_size: int = 1000,
+) -> Iterator[Movement]:
+    """
+    Bewegungen im Zeitraum sortiert nach (timestamp, id) liefern
+
+    Gelesen wird seitenweise per Keyset-Pagination (``after_cursor``), sodass
+    höchstens page_size Bewegungen gleichzeitig geladen sind.
+    """
+    cursor = None
+    while True:
+        page = repository.query_movements(
+            since=since, until=until, after_cursor=cursor, limit=page_size
+        )
+        yield from page
+        if len(page) < page_size:
+            return
+        last = page[-1]
+        cursor = (last.timestamp, last.id)
+
+
+def apply_product_changes(
+    product: Product,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    price: Optional[float] = None,
+    category: Optional[str] = None,
+    quantity: Optional[int] = None,
+    sku: Optional[str] = None,
+    notes: Optional[str] = None,
+) -> int:
+    """
+    Geänderte Felder auf das Produkt übertragen (None = unverändert)
+
+    Der Bestand wird nicht gesetzt, sondern als Delta zurückgegeben, damit er
+    atomar über ``apply_stock_change`` geändert werden kann.
+
+    Raises:
+        ValueError: Negativer Preis oder Bestand
+    """
+    if name is not None:
+        product.name = name
+    if description is not None:
+        product.description = description
+    if price is not None:
+        if price < 0:
+            raise ValueError("Preis kann nicht negativ sein")
+        product.price = price
+    if category is not None:
+        product.category = category
+    quantity_delta = 0
+    if quantity is not None:
+        if quantity < 0:
+            raise ValueError("Bestand kann nicht negativ sein")
+        quantity_delta = quantity - product.quantity
+    if sku is not None:
+        product.sku = sku
+    if notes is not None:
+        product.notes = notes
+
+    product.updated_at = datetime.now()
+    return quantity_delta
+
+
+def build_inventory_report(
+    products: Dict[str, Product], quantities: Optional[Mapping[str, int]] = None
+) -> Dict[str, object]:
+    """
+    Report A (Lagerstandsreport) als Dictionary aufbauen
+
+    Args:
+        products: Produkte nach ID
+        quantities: Bestand je Produkt-ID zu einem Stichtag; nur diese Produkte
+            erscheinen dann im Report (None = aktueller Bestand aller Produkte)
+    """
+    items: List[Dict[str, object]] = []
+    total_value = 0.0
+
+    for product_id, product in products.items():
+        if quantities is None:
+            quantity = product.quantity
+        elif product_id in quantities:
+            quantity = quantities[product_id]
+        else:
+            continue
+        item_total = product.price * quantity
+        total_value += item_total
+        items.append(
+            {
+                "id": product_id,
+                "name": product.name,
+                "quantity": quantity,
+                "price": product.price,
+                "total_value": item_total,
+            }
+        )
+
+    return {
+        "title": "Lagerstandsreport",
+        "generated_at": datetime.now(),
+        "items": items,
+        "total_value": total_value,
+    }
+
+
+def stock_query_window(
+    at: date, snapshot_date: Optional[date], today: date
+) -> Tuple[int, datetime, Optional[datetime]]:
+    """
+    Bewegungsfenster für den Bestand am Ende von ``at`` bestimmen
+
+    Liegt der Snapshot näher am Stichtag als heute, wird von ihm aus vorwärts
+    gerechnet, sonst vom aktuellen Bestand aus rückwärts. In beiden Fällen
+    werden nur die Bewegungen zwischen Ausgangspunkt und Stichtag gelesen.
+
+    Returns:
+        (Richtung +1/-1, since, until) für ``query_movements``
+    """
+    boundary = end_of_day(at)
+    if snapshot_date is not None and at - snapshot_date <= today - at:
+        return 1, end_of_day(snapshot_date), boundary
+    return -1, boundary, None
+
+
+def apply_stock_delta(
+    products: Iterable[Product],
+    base: Mapping[str, int],
+    movements: Iterable[Movement],
+    direction: int,
+    at: date,
+) -> Dict[str, int]:
+    """Bewegungen auf den Ausgangsbestand anwenden (nur Produkte, die am Stichtag existierten)"""
+    stock = dict(base)
+    for movement in movements:
+        stock[movement.product_id] = (
+            stock.get(movement.product_id, 0) + direction * movement.quantity_change
+        )
+    boundary = end_of_day(at)
+    return {
+        product.id: stock.get(product.id, 0)
+        for product in products
+        if product.created_at < boundary
+    }
+
+
+def default_snapshot_date() -> date:
+    """Stichtag des täglichen Snapshot-Jobs: der zuletzt abgeschlossene Tag"""
+    return date.today() - timedelta(days=1)
 
 
 class WarehouseUseCases:
-    """Kern-Use-Cases der Lagerverwaltung"""
+    """
+    Kern-Use-Cases der Lagerverwaltung
+
+    Reports werden je Datenstand des Repositorys (``data_version``) im
+    ``report_cache`` gehalten; ohne Schreibzugriff dazwischen liefert ein
+    erneuter Aufruf denselben (nicht zu verändernden) Report sofort.
+    Parallele Reports laufen in einem langlebigen ``report_pool``, der erst
+    beim ersten Bedarf gestartet und mit ``close()`` beendet wird.
+    """
 
-    def __init__(self, repository: RepositoryPort):
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        report_cache: Optional[ReportCache] = None,
+        report_pool: Optional[Executor] = None,
+    ):
         self.repository = repository
+        self.report_cache = report_cache if report_cache is not None else ReportCache()
+        self.report_pool = report_pool if report_pool is not None else LazyProcessPool()
+
+    def close(self) -> None:
+        """Prozess-Pool der Reports beenden (das Repository bleibt offen)"""
+        self.report_pool.shutdown()
 
     # CRUD
     def create_product(
@@ -41,42 +244,34 @@ class WarehouseUseCases:
         )
         self.repository.save_product(product)
         if quantity > 0:
-            movement = Movement(
-                id=f"mov_{datetime.now().timestamp()}",
-                product_id=product_id,
-                product_name=name,
-                quantity_change=quantity,
-                movement_type="IN",
-                reason="Startbestand",
-                performed_by="system",
-            )
-            self.repository.save_movement(movement)
+            self.repository.save_movement(initial_stock_movement(product))
         return product
 
     def read_product(self, product_id: str) -> Optional[Product]:
         return self.repository.load_product(product_id)
 
     def list_products(
-        self, search: str = "", category: str = "Alle"
+        self,
+        search: str = "",
+        category: str = "Alle",
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> Dict[str, Product]:
-        products = self.repository.load_all_products()
-        search = (search or "").strip().lower()
+        search = (search or "").strip()
         category = (category or "").strip()
+        if category == "Alle":
+            category = ""
 
-        if not search and (not category or category == "Alle"):
-            return products
+        if not search and not category and limit is None and not offset:
+            return self.repository.load_all_products()
 
-        filtered: Dict[str, Product] = {}
-        for product_id, product in products.items():
-            if category and category != "Alle" and product.category != category:
-                continue
-            if search:
-                hay = f"{product_id} {product.name}".lower()
-                if search not in hay:
-                    continue
-            filtered[product_id] = product
+        return self.repository.search_products(
+            search, category or None, limit=limit, offset=offset
+        )
 
-        return filtered
+    def search_products(self, query: str, limit: int = 20) -> List[Product]:
+        """Volltextsuche (Name, Beschreibung, SKU), beste Treffer zuerst"""
+        return self.repository.full_text_search(query, limit=limit)
 
     def update_product(
         self,
@@ -93,40 +288,14 @@ class WarehouseUseCases:
         if product is None:
             raise ValueError(f"Produkt {product_id} nicht gefunden")
 
-        if name is not None:
-            product.name = name
-        if description is not None:
-            product.description = description
-        if price is not None:
-            if price < 0:
-                raise ValueError("Preis kann nicht negativ sein")
-            product.price = price
-        if category is not None:
-            product.category = category
-        quantity_delta = 0
-        if quantity is not None:
-            if quantity < 0:
-                raise ValueError("Bestand kann nicht negativ sein")
-            quantity_delta = quantity - product.quantity
-            product.quantity = quantity
-        if sku is not None:
-            product.sku = sku
-        if notes is not None:
-            product.notes = notes
-
-        product.updated_at = datetime.now()
-        self.repository.save_product(product)
-        if quantity_delta:
-            movement = Movement(
-                id=f"mov_{datetime.now().timestamp()}",
-                product_id=product.id,
-                product_name=product.name,
-                quantity_change=quantity_delta,
-                movement_type="CORRECTION",
-                reason="Bestandskorrektur",
-                performed_by="system",
-            )
-            self.repository.save_movement(movement)
+        quantity_delta = apply_product_changes(
+            product, name, description, price, category, quantity, sku, notes
+        )
+        # Der geladene Bestand wird nie zurückgeschrieben: Stammdaten und
+        # Bestandsdelta samt Korrekturbewegung werden atomar gespeichert, damit
+        # zwischenzeitliche Buchungen (z.B. Kassen-Scans) erhalten bleiben
+        movement = correction_movement(product, quantity_delta) if quantity_delta else None
+        product.quantity = self.repository.update_product(product, quantity_delta, movement)
         return product
 
     def delete_product(self, product_id: str) -> bool:
@@ -135,47 +304,162 @@ class WarehouseUseCases:
         self.repository.delete_product(product_id)
         return True
 
-    def list_movements(self) -> List[Movement]:
-        return self.repository.load_movements()
+    def list_movements(
+        self,
+        product_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        return self.repository.query_movements(
+            product_id=product_id, since=since, until=until, limit=limit
+        )
+
+    # Bestand zum Stichtag
+    def take_inventory_snapshot(self, snapshot_date: Optional[date] = None) -> int:
+        """Täglicher Snapshot-Job (Standard: gestriger Tag), liefert die Anzahl Produkte"""
+        if snapshot_date is None:
+            snapshot_date = default_snapshot_date()
+        return self.repository.save_inventory_snapshot(snapshot_date)
+
+    def stock_at(self, product_id: Optional[str], at: date) -> Dict[str, int]:
+        """
+        Bestand am Ende des Tages ``at``
+
+        Ausgehend vom nächstgelegenen Snapshot (oder vom aktuellen Bestand)
+        werden nur die Bewegungen bis zum Stichtag nachgerechnet, der Aufwand
+        hängt also nicht von der Länge der Historie ab.
+
+        Args:
+            product_id: Produkt-ID oder None für alle Produkte
+            at: Stichtag
+
+        Returns:
+            Bestand je Produkt-ID (Produkte, die es am Stichtag noch nicht gab, fehlen)
+        """
+        snapshot_date, quantities = self.repository.load_inventory_snapshot(at, product_id)
+        direction, since, until = stock_query_window(at, snapshot_date, date.today())
+        if product_id is None:
+            products = list(self.repository.iter_products())
+        else:
+            product = self.repository.load_product(product_id)
+            products = [] if product is None else [product]
+
+        if direction < 0:
+            quantities = {product.id: product.quantity for product in products}
+        movements = self.repository.query_movements(
+            product_id=product_id, since=since, until=until
+        )
+        return apply_stock_delta(products, quantities, movements, direction, at)
 
     # Report A: Lagerstandsreport
+    def _cached_report(self, key: tuple, build):
+        """Report aus dem Cache liefern, solange sich der Datenstand nicht geändert hat"""
+        return self.report_cache.get_or_build(key, self.repository.data_version(), build)
+
     def generate_inventory_report(self) -> Dict[str, object]:
-        products = self.repository.load_all_products()
-        items: List[Dict[str, object]] = []
-        total_value = 0.0
-
-        for product_id, product in products.items():
-            item_total = product.get_total_value()
-            total_value += item_total
-            items.append(
-                {
-                    "id": product_id,
-                    "name": product.name,
-                    "quantity": product.quantity,
-                    "price": product.price,
-                    "total_value": item_total,
-                }
+        return self._cached_report(
+            ("inventory",), lambda: build_inventory_report(self.repository.load_all_products())
+        )
+
+    def generate_inventory_report_at(self, at: date) -> Dict[str, object]:
+        """Report A zum Stichtag (z.B. Jahresinventur), bewertet mit den aktuellen Preisen"""
+
+        def build():
+            report = build_inventory_report(
+                self.repository.load_all_products(), self.stock_at(None, at)
             )
+            report["as_of"] = at
+            return report
+
+        return self._cached_report(("inventory_at", at), build)
 
-        return {
-            "title": "Lagerstandsreport",
-            "generated_at": datetime.now(),
-            "items": items,
-            "total_value": total_value,
-        }
+    def generate_inventory_report_by_category(self, workers: int = 1) -> Dict[str, object]:
+        """
+        Report A mit Zwischensummen je Kategorie (siehe backend/category_report.py)
+
+        Mit workers > 1 und ab ``PARALLEL_THRESHOLD`` Produkten werden die
+        Kategorien im ``report_pool`` aufbereitet; das Ergebnis ist
+        unabhängig von der Worker-Anzahl.
+        """
+        return self._cached_report(
+            ("inventory_by_category",),
+            lambda: build_category_report(
+                self.repository.iter_products(), workers, self.report_pool
+            ),
+        )
 
     def generate_inventory_report_text(self) -> str:
-        from ..adapters.report import ConsoleReportAdapter
+        from ..adapters.report import render_report
 
-        products = self.repository.load_all_products()
-        movements = self.repository.load_movements()
-        adapter = ConsoleReportAdapter(products, movements)
-        return adapter.generate_inventory_report()
+        return self._cached_report(
+            ("inventory_text",), lambda: render_report(self.iter_inventory_report_lines())
+        )
+
+    def generate_movement_report_text(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> str:
+        from ..adapters.report import render_report
+
+        return self._cached_report(
+            ("movement_text", since, until),
+            lambda: render_report(self.iter_movement_report_lines(since, until)),
+        )
+
+    def iter_inventory_report_lines(self, batch_size: int = 1000) -> Iterator[str]:
+        """Lagerstandsreport zeilenweise, Produkte sortiert nach ID in Blöcken gelesen"""
+        from ..adapters.report import iter_inventory_report
 
-    def generate_movement_report_text(self) -> str:
-        from ..adapters.report import ConsoleReportAdapter
+        # Der Lagerstandsreport braucht keine Bewegungen
+        return iter_inventory_report(self.repository.iter_products(batch_size))
+
+    def iter_movement_report_lines(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        page_size: int = 1000,
+    ) -> Iterator[str]:
+        """Bewegungsprotokoll zeilenweise, Bewegungen seitenweise nach (timestamp, id)"""
+        from ..adapters.report import iter_movement_report
+
+        return iter_movement_report(
+            iter_movement_pages(self.repository, since, until, page_size)
+        )
+
+    def export_inventory_report(
+        self, path, fmt: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """Report A als CSV/JSON Lines/Parquet exportieren (siehe reports/export.py)"""
+        return export_report(
+            "inventory", self.repository.iter_products(chunk_size), path, fmt, chunk_size
+        )
+
+    def export_movement_report(
+        self,
+        path,
+        fmt: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Report B exportieren; Bewegungen werden seitenweise zu je chunk_size gelesen"""
+        movements = iter_movement_pages(self.repository, since, until, chunk_size)
+        return export_report("movements", movements, path, fmt, chunk_size)
+
+    def write_inventory_report_text(self, out: TextIO, batch_size: int = 1000) -> int:
+        """Lagerstandsreport in einen Stream schreiben, liefert die Zeilenzahl"""
+        from ..adapters.report import write_report
+
+        return write_report(self.iter_inventory_report_lines(batch_size), out)
+
+    def write_movement_report_text(
+        self,
+        out: TextIO,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        page_size: int = 1000,
+    ) -> int:
+        """Bewegungsprotokoll in einen Stream schreiben, liefert die Zeilenzahl"""
+        from ..adapters.report import write_report
 
-        products = self.repository.load_all_products()
-        movements = self.repository.load_movements()
-        adapter = ConsoleReportAdapter(products, movements)
-        return adapter.generate_movement_report()
+        return write_report(self.iter_movement_report_lines(since, until, page_size), out)
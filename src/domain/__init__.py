@@ -1,6 +1,7 @@
 """Domain Layer - Geschäftslogik und Entity-Modelle"""
 
+from .ids import IdGenerator, new_movement_id
 from .product import Product
 from .warehouse import Warehouse
 
-__all__ = ["Product", "Warehouse"]
+__all__ = ["IdGenerator", "Product", "Warehouse", "new_movement_id"]
@@ -0,0 +1,68 @@
+"""ID-Generator - eindeutige, zeitlich sortierbare IDs (Snowflake-Stil)"""
+
+import itertools
+import os
+import secrets
+import threading
+import time
+
+# Umgebungsvariable für eine feste Knoten-ID (z.B. je Kassenplatz)
+NODE_ID_ENV = "LAGER_NODE_ID"
+NODE_BITS = 24
+
+
+def _default_node_id() -> int:
+    value = os.environ.get(NODE_ID_ENV)
+    if value:
+        return int(value, 0)
+    return secrets.randbits(NODE_BITS)
+
+
+class IdGenerator:
+    """
+    Erzeugt IDs der Form ``<prefix><ms:12 hex><node:6 hex><sequenz:10 hex>``
+
+    - Millisekunden seit 1970: IDs sind lexikographisch nach Erzeugungszeit
+      sortierbar und eignen sich für Keyset-Pagination über die ID
+    - Knoten-ID (24 Bit): trennt Prozesse bzw. Rechner; aus ``LAGER_NODE_ID``
+      oder zufällig je Prozess
+    - Sequenz: prozessweiter Zähler, der nie zurückgesetzt wird; damit sind
+      IDs innerhalb eines Prozesses auch bei Tausenden pro Millisekunde und
+      über Threads hinweg eindeutig (``next`` auf ``itertools.count`` ist atomar)
+
+    Läuft die Systemuhr zurück, wird die zuletzt verwendete Millisekunde
+    beibehalten, sodass die Reihenfolge erhalten bleibt. Die Vorlage wird
+    unter einem Lock und nur vorwärts erneuert; ein Thread mit einer älteren
+    Millisekunde kann die neuere Vorlage eines anderen nicht überschreiben.
+    """
+
+    def __init__(self, prefix: str = "", node_id: int = None):
+        if node_id is None:
+            node_id = _default_node_id()
+        if not 0 <= node_id < 1 << NODE_BITS:
+            raise ValueError(f"Knoten-ID muss zwischen 0 und {(1 << NODE_BITS) - 1} liegen")
+
+        self.prefix = prefix
+        self.node_id = node_id
+        self._sequence = itertools.count()
+        self._last_ms = -1
+        self._template = ""
+        self._lock = threading.Lock()
+
+    def __call__(self, _now=time.time_ns) -> str:
+        ms = _now() // 1_000_000
+        if ms > self._last_ms:
+            # Präfix, Zeit und Knoten ändern sich höchstens einmal pro Millisekunde;
+            # dazwischen wird ohne Lock nur die Sequenz in die Vorlage eingesetzt
+            with self._lock:
+                if ms > self._last_ms:
+                    prefix = self.prefix.replace("%", "%%")
+                    self._template = f"{prefix}{ms:012x}{self.node_id:06x}%010x"
+                    self._last_ms = ms
+        # Sequenz erst nach der Vorlage ziehen: eine spätere ID hat damit nie
+        # eine kleinere Millisekunde oder Sequenz als eine zuvor abgeschlossene
+        template = self._template
+        return template % next(self._sequence)
+
+
+new_movement_id = IdGenerator("mov_")
@@ -1,11 +1,17 @@
 """Product Domain Model"""
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+def intern_text(value: Optional[str]) -> Optional[str]:
+    """Häufig wiederholte Strings (Kategorien, Typen, Benutzer) nur einmal halten"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class Product:
     """
     Basis-Produktklasse für die Lagerverwaltung.
@@ -31,6 +37,7 @@ class Product:
             raise ValueError("Preis kann nicht negativ sein")
         if self.quantity < 0:
             raise ValueError("Bestand kann nicht negativ sein")
+        self.category = intern_text(self.category)
 
     def update_quantity(self, amount: int) -> None:
         """
@@ -1,15 +1,29 @@
 """Warehouse Domain Model"""
 
+import math
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
 
-from .product import Product
+from .product import Product, intern_text
 
 
-@dataclass
+def end_of_day(day: date) -> datetime:
+    """Erster Zeitpunkt nach ``day``; Bestand "am Tag X" = Bestand vor diesem Zeitpunkt"""
+    return datetime.combine(day + timedelta(days=1), time.min)
+
+
+@dataclass(slots=True)
 class Movement:
-    """Bewegungsprotokoll-Eintrag für Lagerbestände"""
+    """
+    Bewegungsprotokoll-Eintrag für Lagerbestände
+
+    Bei Millionen Bewegungen im Speicher zählt jedes Byte: die Klasse hat
+    ``__slots__`` statt eines ``__dict__``, und die sich wiederholenden
+    Strings (Produktname, Typ, Benutzer) werden interniert, sodass alle
+    Bewegungen eines Produkts dasselbe String-Objekt referenzieren.
+    ``product_name`` bleibt der Name zum Zeitpunkt der Bewegung.
+    """
 
     id: str
     product_id: str
@@ -20,36 +34,169 @@ class Movement:
     timestamp: datetime = field(default_factory=datetime.now)
     performed_by: str = "system"
 
+    def __post_init__(self):
+        self.product_name = intern_text(self.product_name)
+        self.movement_type = intern_text(self.movement_type)
+        self.performed_by = intern_text(self.performed_by)
+
 
 class Warehouse:
-    """Verwaltungsklasse für das Lager"""
+    """
+    Verwaltungsklasse für das Lager
+
+    Gesamtwert, Gesamtbestand und die Summen je Kategorie werden laufend
+    mitgeführt und bei jeder Änderung über das Lager in O(1) angepasst, statt
+    bei jeder Abfrage über alle Produkte zu summieren. Wird ein Produkt
+    direkt geändert (z.B. Preis oder Kategorie, auch über ein Repository,
+    das dasselbe Objekt hält), muss danach ``product_changed`` bzw.
+    ``set_quantity`` aufgerufen werden; ``verify_totals`` prüft die
+    laufenden Summen gegen eine Neuberechnung. Der Lagerstandsbericht
+    rechnet die Positionswerte immer aus dem aktuellen Produkt.
+    """
 
     def __init__(self, name: str):
         self.name = name
         self.products: Dict[str, Product] = {}
         self.movements: list[Movement] = []
+        # Beitrag je Produkt zum Zeitpunkt der letzten Erfassung: (Kategorie, Wert, Menge)
+        self._entries: Dict[str, Tuple[str, float, int]] = {}
+        self._total_value = 0.0
+        self._total_quantity = 0
+        # Kategorie -> [Wert, Menge, Anzahl Produkte]
+        self._category_totals: Dict[str, list] = {}
+
+    # -------------------- laufende Summen --------------------
+
+    def _book(self, entry: Tuple[str, float, int], sign: int) -> None:
+        category, value, quantity = entry
+        self._total_value += sign * value
+        self._total_quantity += sign * quantity
+        totals = self._category_totals.setdefault(category, [0.0, 0, 0])
+        totals[0] += sign * value
+        totals[1] += sign * quantity
+        totals[2] += sign
+        if not totals[2]:
+            del self._category_totals[category]
+
+    def _track(self, product: Product) -> None:
+        entry = (product.category, product.get_total_value(), product.quantity)
+        self._entries[product.id] = entry
+        self._book(entry, 1)
+
+    def _untrack(self, product_id: str) -> None:
+        self._book(self._entries.pop(product_id), -1)
+
+    def product_changed(self, product_id: str) -> None:
+        """Summen nach einer direkten Änderung eines Produkts (Preis, Menge, Kategorie) anpassen"""
+        if product_id not in self.products:
+            raise ValueError(f"Produkt mit ID {product_id} existiert nicht")
+        self._untrack(product_id)
+        self._track(self.products[product_id])
+
+    def refresh_totals(self) -> None:
+        """Alle Summen aus den Produkten neu aufbauen (O(n))"""
+        self._entries.clear()
+        self._total_value = 0.0
+        self._total_quantity = 0
+        self._category_totals.clear()
+        for product in self.products.values():
+            self._track(product)
+
+    def verify_totals(self) -> bool:
+        """
+        Laufende Summen gegen eine Neuberechnung aus den Produkten prüfen
+
+        Returns:
+            True, wenn alle Summen übereinstimmen (Werte mit Rundungstoleranz)
+        """
+        expected = Warehouse(self.name)
+        expected.products = self.products
+        expected.refresh_totals()
+
+        def same_value(a: float, b: float) -> bool:
+            return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+
+        if not same_value(self._total_value, expected._total_value):
+            return False
+        if self._total_quantity != expected._total_quantity:
+            return False
+        if self._category_totals.keys() != expected._category_totals.keys():
+            return False
+        return all(
+            same_value(totals[0], expected._category_totals[category][0])
+            and totals[1:] == expected._category_totals[category][1:]
+            for category, totals in self._category_totals.items()
+        )
+
+    # -------------------- Produkte und Bewegungen --------------------
 
     def add_product(self, product: Product) -> None:
         """Produkt zum Lager hinzufügen"""
         if product.id in self.products:
             raise ValueError(f"Produkt mit ID {product.id} existiert bereits")
         self.products[product.id] = product
+        self._track(product)
+
+    def remove_product(self, product_id: str) -> None:
+        """Produkt aus dem Lager entfernen (unbekannte IDs werden ignoriert)"""
+        if self.products.pop(product_id, None) is not None:
+            self._untrack(product_id)
 
     def get_product(self, product_id: str) -> Optional[Product]:
         """Produkt nach ID abrufen"""
         return self.products.get(product_id)
 
+    def update_quantity(self, product_id: str, amount: int) -> None:
+        """
+        Bestand eines Produkts ändern
+
+        Raises:
+            ValueError: wenn das Produkt fehlt oder der Bestand negativ würde
+        """
+        product = self.products.get(product_id)
+        if product is None:
+            raise ValueError(f"Produkt mit ID {product_id} existiert nicht")
+        product.update_quantity(amount)
+        self.product_changed(product_id)
+
+    def set_quantity(self, product_id: str, quantity: int) -> None:
+        """
+        Bestand auf einen anderswo (z.B. im Repository) gebuchten Wert setzen
+
+        Raises:
+            ValueError: wenn das Produkt fehlt oder der Bestand negativ ist
+        """
+        product = self.products.get(product_id)
+        if product is None:
+            raise ValueError(f"Produkt mit ID {product_id} existiert nicht")
+        if quantity < 0:
+            raise ValueError("Bestand kann nicht negativ sein")
+        product.quantity = quantity
+        self.product_changed(product_id)
+
     def record_movement(self, movement: Movement) -> None:
-        """Lagerbewegung protokollieren"""
+        """Lagerbewegung protokollieren und auf den Bestand anwenden"""
         if movement.product_id not in self.products:
             raise ValueError(
                 f"Produkt mit ID {movement.product_id} existiert nicht"
             )
+        self.update_quantity(movement.product_id, movement.quantity_change)
         self.movements.append(movement)
 
     def get_total_inventory_value(self) -> float:
-        """Gesamtwert aller Bestände berechnen"""
-        return sum(product.get_total_value() for product in self.products.values())
+        """Gesamtwert aller Bestände (laufende Summe, O(1))"""
+        return self._total_value
+
+    def get_total_quantity(self) -> int:
+        """Gesamtbestand in Stück (laufende Summe, O(1))"""
+        return self._total_quantity
+
+    def get_category_totals(self) -> Dict[str, dict]:
+        """Wert, Bestand und Anzahl Produkte je Kategorie"""
+        return {
+            category: {"total_value": value, "quantity": quantity, "products": count}
+            for category, (value, quantity, count) in self._category_totals.items()
+        }
 
     def get_inventory_report(self) -> Dict[str, dict]:
         """
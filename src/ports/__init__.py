@@ -1,11 +1,18 @@
 """Ports - Schnittstellen für externe Abhängigkeiten (Abstraktion)"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..domain.product import Product
 from ..domain.warehouse import Movement
 
+# Position für Keyset-Pagination: (timestamp, id) der letzten Bewegung einer Seite
+MovementCursor = Tuple[datetime, str]
+
+# Bestandsabbild: (Stichtag, Bestand je Produkt-ID); Stichtag None = kein Snapshot
+InventorySnapshot = Tuple[Optional[date], Dict[str, int]]
+
 
 class RepositoryPort(ABC):
     """Port für Datenpersistenz"""
@@ -22,7 +29,56 @@ class RepositoryPort(ABC):
 
     @abstractmethod
     def load_all_products(self) -> Dict[str, Product]:
-        """Alle Produkte laden"""
+        """Alle Produkte laden (Ergebnis nur lesen, Implementierungen dürfen es teilen)"""
+        pass
+
+    @abstractmethod
+    def iter_products(self, batch_size: int = 1000) -> Iterator[Product]:
+        """
+        Alle Produkte als Stream liefern, sortiert nach ID
+
+        Im Gegensatz zu load_all_products wird nie der gesamte Bestand auf
+        einmal materialisiert; intern wird in Blöcken von batch_size gelesen.
+        """
+        pass
+
+    @abstractmethod
+    def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        """
+        Produkte nach Text und Kategorie suchen, sortiert nach ID
+
+        Args:
+            text: Teilstring von Produkt-ID oder Name (Groß-/Kleinschreibung egal)
+            category: exakter Kategoriename oder None für alle Kategorien
+            limit: maximale Anzahl Treffer (None = alle)
+            offset: Anzahl zu überspringender Treffer
+
+        Returns:
+            Dictionary mit Product-IDs als Keys
+        """
+        pass
+
+    @abstractmethod
+    def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        """
+        Rangierte Präfix-Volltextsuche über Name, Beschreibung und SKU
+
+        Jedes Wort der Anfrage muss als Wortanfang in einem der Felder
+        vorkommen ("5w30 castrol", "H7 55W").
+
+        Args:
+            query: Suchbegriffe, durch Leer- oder Satzzeichen getrennt
+            limit: maximale Anzahl Treffer (Top-k)
+
+        Returns:
+            Produkte, bester Treffer zuerst
+        """
         pass
 
     @abstractmethod
@@ -37,9 +93,270 @@ class RepositoryPort(ABC):
 
     @abstractmethod
     def load_movements(self) -> List[Movement]:
+        """Alle Lagerbewegungen laden (Ergebnis nur lesen, Implementierungen dürfen es teilen)"""
+        pass
+
+    @abstractmethod
+    def iter_movements(
+        self, batch_size: int = 1000, order_by_time: bool = True
+    ) -> Iterator[Movement]:
+        """
+        Alle Lagerbewegungen als Stream liefern
+
+        Args:
+            batch_size: Anzahl Bewegungen, die intern pro Block gelesen werden
+            order_by_time: nach (timestamp, id) sortieren, sonst Speicherreihenfolge
+        """
+        pass
+
+    @abstractmethod
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_cursor: Optional[MovementCursor] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        """
+        Lagerbewegungen gefiltert laden, sortiert nach (timestamp, id)
+
+        Args:
+            product_id: nur Bewegungen dieses Produkts
+            movement_type: nur Bewegungen dieses Typs ("IN", "OUT", ...)
+            performed_by: nur Bewegungen dieses Benutzers
+            since: Zeitpunkt ab dem Bewegungen geliefert werden (inklusive)
+            until: Zeitpunkt bis zu dem Bewegungen geliefert werden (exklusive)
+            after_cursor: (timestamp, id) der letzten Bewegung der vorherigen Seite
+            limit: maximale Anzahl Bewegungen (None = alle)
+
+        Returns:
+            Liste von Movement-Objekten in chronologischer Reihenfolge
+        """
+        pass
+
+    @abstractmethod
+    def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        """
+        Bestand atomar ändern und Bewegung protokollieren
+
+        Args:
+            product_id: ID des Produkts
+            delta: Mengenänderung (negativ zum Entnehmen)
+            movement: Zu speichernde Bewegung (product_name wird ggf. ergänzt);
+                None, wenn die Bewegung anderswo protokolliert wird
+
+        Returns:
+            Neuer Bestand
+
+        Raises:
+            ValueError: Produkt nicht gefunden oder Bestand würde negativ
+        """
+        pass
+
+    @abstractmethod
+    def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        """
+        Stammdaten eines bestehenden Produkts speichern, Bestand nur als Delta
+
+        Der Bestand aus ``product`` wird nie geschrieben; parallel gebuchte
+        Bestandsänderungen bleiben damit erhalten. Stammdaten, Bestandsänderung
+        und Bewegung werden atomar (eine Transaktion) gespeichert.
+
+        Args:
+            product: Produkt mit geänderten Stammdaten
+            quantity_delta: Mengenänderung (0 = Bestand unverändert)
+            movement: Zu speichernde Bewegung (None = Bewegung wird anderswo protokolliert)
+
+        Returns:
+            Neuer Bestand (``product.quantity`` wird darauf gesetzt)
+
+        Raises:
+            ValueError: Produkt nicht gefunden oder Bestand würde negativ
+        """
+        pass
+
+    @abstractmethod
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte in einem Schritt speichern (Bulk-Import)"""
+        pass
+
+    @abstractmethod
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Lagerbewegungen in einem Schritt speichern (Bulk-Import)"""
+        pass
+
+    @abstractmethod
+    def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        """
+        Bestand aller Produkte am Ende von ``snapshot_date`` als Snapshot speichern
+
+        Der Bestand ergibt sich aus dem aktuellen Bestand abzüglich aller
+        Bewegungen ab dem Folgetag; der Job darf also auch nachträglich laufen.
+        Ein vorhandener Snapshot desselben Tages wird ersetzt.
+
+        Returns:
+            Anzahl gespeicherter Produkte
+        """
+        pass
+
+    @abstractmethod
+    def load_inventory_snapshot(
+        self, at: date, product_id: Optional[str] = None
+    ) -> InventorySnapshot:
+        """
+        Jüngsten Snapshot mit Stichtag <= ``at`` laden
+
+        Args:
+            at: Spätester Stichtag
+            product_id: Nur dieses Produkt (jüngster Snapshot, der es enthält)
+
+        Returns:
+            (Stichtag, Bestand je Produkt-ID) oder (None, {}) ohne passenden Snapshot
+        """
+        pass
+
+    @abstractmethod
+    def data_version(self) -> int:
+        """
+        Monoton steigender Datenstand
+
+        Der Wert ändert sich nach jedem Schreibzugriff (Produkte, Bewegungen,
+        Snapshots) und bleibt ohne Schreibzugriff gleich. Er eignet sich als
+        Schlüsselbestandteil für Caches abgeleiteter Daten (z.B. Reports).
+        Absolute Werte haben keine Bedeutung und sind nur innerhalb einer
+        Repository-Instanz vergleichbar.
+        """
+        pass
+
+
+class AsyncRepositoryPort(ABC):
+    """
+    Asynchroner Port für Datenpersistenz
+
+    Awaitable Gegenstücke zu allen Methoden von RepositoryPort mit
+    identischer Semantik, für Aufrufer, die nicht auf I/O blockieren dürfen.
+    """
+
+    @abstractmethod
+    async def save_product(self, product: Product) -> None:
+        """Produkt speichern"""
+        pass
+
+    @abstractmethod
+    async def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt laden"""
+        pass
+
+    @abstractmethod
+    async def load_all_products(self) -> Dict[str, Product]:
+        """Alle Produkte laden"""
+        pass
+
+    @abstractmethod
+    def iter_products(self, batch_size: int = 1000) -> AsyncIterator[Product]:
+        """Alle Produkte als asynchronen Stream liefern (``async for``)"""
+        pass
+
+    @abstractmethod
+    async def search_products(
+        self,
+        text: str = "",
+        category: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Product]:
+        """Produkte nach Text und Kategorie suchen (siehe RepositoryPort)"""
+        pass
+
+    @abstractmethod
+    async def full_text_search(self, query: str, limit: int = 20) -> List[Product]:
+        """Rangierte Präfix-Volltextsuche (siehe RepositoryPort)"""
+        pass
+
+    @abstractmethod
+    async def delete_product(self, product_id: str) -> None:
+        """Produkt löschen"""
+        pass
+
+    @abstractmethod
+    async def save_movement(self, movement: Movement) -> None:
+        """Lagerbewegung speichern"""
+        pass
+
+    @abstractmethod
+    async def load_movements(self) -> List[Movement]:
         """Alle Lagerbewegungen laden"""
         pass
 
+    @abstractmethod
+    def iter_movements(
+        self, batch_size: int = 1000, order_by_time: bool = True
+    ) -> AsyncIterator[Movement]:
+        """Alle Lagerbewegungen als asynchronen Stream liefern (``async for``)"""
+        pass
+
+    @abstractmethod
+    async def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_cursor: Optional[MovementCursor] = None,
+        limit: Optional[int] = None,
+    ) -> List[Movement]:
+        """Lagerbewegungen gefiltert laden (siehe RepositoryPort)"""
+        pass
+
+    @abstractmethod
+    async def apply_stock_change(
+        self, product_id: str, delta: int, movement: Optional[Movement] = None
+    ) -> int:
+        """Bestand atomar ändern und Bewegung protokollieren (siehe RepositoryPort)"""
+        pass
+
+    @abstractmethod
+    async def update_product(
+        self, product: Product, quantity_delta: int = 0, movement: Optional[Movement] = None
+    ) -> int:
+        """Stammdaten speichern, Bestand nur als Delta (siehe RepositoryPort)"""
+        pass
+
+    @abstractmethod
+    async def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte in einem Schritt speichern"""
+        pass
+
+    @abstractmethod
+    async def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Lagerbewegungen in einem Schritt speichern"""
+        pass
+
+    @abstractmethod
+    async def save_inventory_snapshot(self, snapshot_date: date) -> int:
+        """Bestands-Snapshot für das Ende von ``snapshot_date`` speichern (siehe RepositoryPort)"""
+        pass
+
+    @abstractmethod
+    async def load_inventory_snapshot(
+        self, at: date, product_id: Optional[str] = None
+    ) -> InventorySnapshot:
+        """Jüngsten Snapshot mit Stichtag <= ``at`` laden (siehe RepositoryPort)"""
+        pass
+
+    @abstractmethod
+    async def data_version(self) -> int:
+        """Monoton steigender Datenstand (siehe RepositoryPort)"""
+        pass
+
 
 class ReportPort(ABC):
     """Port für Report-Generierung"""
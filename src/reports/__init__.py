@@ -1,3 +1,19 @@
-"""Reports Module - Report-Generierung"""
+"""Reports Module - Report-Export und Auswertungen"""
 
-__all__ = ["InventoryReport", "MovementReport"]
+from .export import (
+    DEFAULT_CHUNK_SIZE,
+    FORMATS,
+    LAYOUTS,
+    ExportLayout,
+    export_report,
+    format_from_path,
+)
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "FORMATS",
+    "LAYOUTS",
+    "ExportLayout",
+    "export_report",
+    "format_from_path",
+]
@@ -0,0 +1,72 @@
+"""Kommandozeile für den Report-Export
+
+Beispiele::
+
+    python -m src.reports inventory bestand.csv
+    python -m src.reports movements bewegungen_2025.parquet --since 2025-01-01 --until 2026-01-01
+    python -m src.reports movements export.txt --format jsonl --db data/warehouse.db
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from .export import DEFAULT_CHUNK_SIZE, FORMATS, LAYOUTS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.reports",
+        description=(
+            "Lagerstandsreport (inventory) oder Bewegungsprotokoll (movements) exportieren"
+        ),
+    )
+    parser.add_argument("report", choices=sorted(LAYOUTS))
+    parser.add_argument("output", help="Zieldatei; Format aus der Endung, falls --format fehlt")
+    parser.add_argument("--format", dest="fmt", choices=sorted(FORMATS))
+    parser.add_argument(
+        "--repository", default="sqlite", help="Repository-Typ (Standard: sqlite)"
+    )
+    parser.add_argument(
+        "--db", dest="db_path", help="Pfad zur Datenbank (Standard: data/warehouse.db)"
+    )
+    parser.add_argument(
+        "--since", type=datetime.fromisoformat, help="nur Bewegungen ab (ISO-Datum)"
+    )
+    parser.add_argument(
+        "--until", type=datetime.fromisoformat, help="nur Bewegungen vor (ISO-Datum)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from ..adapters.repository import RepositoryFactory
+    from ..backend import WarehouseUseCases
+
+    repository = RepositoryFactory.create_repository(args.repository, db_path=args.db_path)
+    try:
+        use_cases = WarehouseUseCases(repository)
+        if args.report == "inventory":
+            count = use_cases.export_inventory_report(args.output, args.fmt, args.chunk_size)
+        else:
+            count = use_cases.export_movement_report(
+                args.output, args.fmt, args.since, args.until, args.chunk_size
+            )
+    except (ValueError, ImportError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    finally:
+        close = getattr(repository, "close", None)
+        if close is not None:
+            close()
+
+    print(f"{count} Zeilen nach {args.output} exportiert")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Analytics - spaltenbasierte Auswertungen mit NumPy (optional)
+
+Produkte und Bewegungen werden einmal in Spalten umgewandelt (ein
+NumPy-Array je Feld, Strings als Integer-Codes, Zeitstempel als int64 in
+µs seit 1970). Summen, Gruppierungen nach Kategorie, Typ, Produkt und Tag
+laufen danach vollständig vektorisiert, also ohne Python-Schleife pro
+Bewegung. Für das Movement-Log werden die Spalten direkt aus der mmap
+übernommen, ohne Movement-Objekte zu erzeugen.
+
+NumPy ist optional (``pip install .[analytics]``); ohne NumPy lässt sich
+das Modul importieren, die Funktionen werfen dann ImportError.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - abhängig von der Installation
+    np = None
+
+
+MOVEMENT_TYPES = ("IN", "OUT", "CORRECTION")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_DAY = 86_400_000_000
+_EPOCH_DAY = date(1970, 1, 1)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Für Analytics wird NumPy benötigt (pip install .[analytics])"
+        )
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+class _Codes:
+    """Strings fortlaufend nummerieren (erster Auftritt = kleinster Code)"""
+
+    def __init__(self, initial: Iterable[str] = ()):
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+        for value in initial:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _sum_by_code(codes, weights, size: int):
+    """Summe je Code; ganzzahlige Gewichte bleiben ganzzahlig"""
+    sums = np.bincount(codes, weights=weights, minlength=size)
+    if weights.dtype.kind in "iu":
+        # bincount rechnet in float64; Summen < 2**53 sind exakt
+        return sums.astype(np.int64)
+    return sums
+
+
+# -------------------- Produkte --------------------
+
+
+@dataclass
+class ProductColumns:
+    """Produkte als Spalten"""
+
+    ids: List[str]
+    categories: List[str]
+    category_codes: "np.ndarray"  # int32, Index in categories
+    prices: "np.ndarray"  # float64
+    quantities: "np.ndarray"  # int64
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductColumns":
+        _require_numpy()
+        categories = _Codes()
+        ids: List[str] = []
+        codes: List[int] = []
+        prices: List[float] = []
+        quantities: List[int] = []
+        for product in products:
+            ids.append(product.id)
+            codes.append(categories.code(product.category or ""))
+            prices.append(product.price)
+            quantities.append(product.quantity)
+        return cls(
+            ids=ids,
+            categories=categories.values,
+            category_codes=np.array(codes, dtype=np.int32),
+            prices=np.array(prices, dtype=np.float64),
+            quantities=np.array(quantities, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def values(self):
+        """Gesamtwert je Produkt (Preis * Bestand)"""
+        return self.prices * self.quantities
+
+    def total_value(self) -> float:
+        return float(np.dot(self.prices, self.quantities))
+
+    def total_quantity(self) -> int:
+        return int(self.quantities.sum())
+
+    def value_by_category(self) -> Dict[str, float]:
+        sums = _sum_by_code(self.category_codes, self.values(), len(self.categories))
+        return dict(zip(self.categories, sums.tolist()))
+
+    def quantity_by_category(self) -> Dict[str, int]:
+        sums = _sum_by_code(self.category_codes, self.quantities, len(self.categories))
+        return dict(zip(self.categories, sums.tolist()))
+
+
+# -------------------- Bewegungen --------------------
+
+
+@dataclass
+class MovementColumns:
+    """Bewegungen als Spalten"""
+
+    timestamps: "np.ndarray"  # int64, µs seit 1970
+    quantities: "np.ndarray"  # int64
+    types: List[str]
+    type_codes: "np.ndarray"  # int32, Index in types
+    product_ids: List[str]
+    product_codes: "np.ndarray"  # int32, Index in product_ids
+
+    @classmethod
+    def from_movements(cls, movements: Iterable[Movement]) -> "MovementColumns":
+        """Spalten aus Movement-Objekten aufbauen (ein Durchlauf)"""
+        _require_numpy()
+        types = _Codes(MOVEMENT_TYPES)
+        products = _Codes()
+        timestamps: List[int] = []
+        quantities: List[int] = []
+        type_codes: List[int] = []
+        product_codes: List[int] = []
+        for movement in movements:
+            timestamps.append(_to_micros(movement.timestamp))
+            quantities.append(movement.quantity_change)
+            type_codes.append(types.code(movement.movement_type))
+            product_codes.append(products.code(movement.product_id))
+        return cls(
+            timestamps=np.array(timestamps, dtype=np.int64),
+            quantities=np.array(quantities, dtype=np.int64),
+            types=types.values,
+            type_codes=np.array(type_codes, dtype=np.int32),
+            product_ids=products.values,
+            product_codes=np.array(product_codes, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_movement_log(cls, log) -> "MovementColumns":
+        """
+        Spalten direkt aus einem MovementLog übernehmen
+
+        Zeitstempel und Mengen werden aus der mmap kopiert (ohne Python-Objekte
+        pro Bewegung); die String-Spalten enthalten Heap-Offsets, die über
+        ``np.unique`` auf fortlaufende Codes abgebildet werden.
+        """
+        _require_numpy()
+        from ..adapters.movement_log import FIELDS, PRODUCT_ID, QUANTITY, TIMESTAMP, TYPE
+
+        records = np.frombuffer(log.records(), dtype="<i8").reshape(-1, FIELDS)
+        type_codes, types = cls._decode_column(log, records[:, TYPE], MOVEMENT_TYPES)
+        product_codes, product_ids = cls._decode_column(log, records[:, PRODUCT_ID])
+        return cls(
+            timestamps=records[:, TIMESTAMP].copy(),
+            quantities=records[:, QUANTITY].copy(),
+            types=types,
+            type_codes=type_codes,
+            product_ids=product_ids,
+            product_codes=product_codes,
+        )
+
+    @staticmethod
+    def _decode_column(
+        log, offsets, initial: Iterable[str] = ()
+    ) -> Tuple["np.ndarray", List[str]]:
+        unique, inverse = np.unique(offsets, return_inverse=True)
+        # Derselbe String kann (aus mehreren Prozessen) an mehreren Offsets liegen
+        names = _Codes(initial)
+        mapping = np.array(
+            [names.code(log.string(int(offset))) for offset in unique], dtype=np.int32
+        )
+        return mapping[inverse.reshape(-1)], names.values
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> "MovementColumns":
+        """Bewegungen mit since <= timestamp < until"""
+        mask = np.ones(len(self), dtype=bool)
+        if since is not None:
+            mask &= self.timestamps >= _to_micros(since)
+        if until is not None:
+            mask &= self.timestamps < _to_micros(until)
+        return MovementColumns(
+            timestamps=self.timestamps[mask],
+            quantities=self.quantities[mask],
+            types=self.types,
+            type_codes=self.type_codes[mask],
+            product_ids=self.product_ids,
+            product_codes=self.product_codes[mask],
+        )
+
+    def totals(self) -> Dict[str, int]:
+        """Summe IN (Zugänge), Summe OUT (Abgänge, positiv), Netto und Anzahl"""
+        quantities = self.quantities
+        net = int(quantities.sum())
+        total_in = int(np.maximum(quantities, 0).sum())
+        return {
+            "in": total_in,
+            "out": total_in - net,
+            "net": net,
+            "count": len(quantities),
+        }
+
+    def net_by_type(self) -> Dict[str, int]:
+        sums = _sum_by_code(self.type_codes, self.quantities, len(self.types))
+        return dict(zip(self.types, sums.tolist()))
+
+    def net_by_product(self) -> Dict[str, int]:
+        sums = _sum_by_code(self.product_codes, self.quantities, len(self.product_ids))
+        return dict(zip(self.product_ids, sums.tolist()))
+
+    def per_day(self) -> Dict[date, Dict[str, int]]:
+        """IN/OUT/Netto/Anzahl je Kalendertag, aufsteigend nach Datum"""
+        if not len(self):
+            return {}
+        days = self.timestamps // _DAY
+        first = int(days.min())
+        offsets = days - first
+        size = int(offsets.max()) + 1
+
+        counts = np.bincount(offsets, minlength=size)
+        ins = _sum_by_code(offsets, np.maximum(self.quantities, 0), size)
+        nets = _sum_by_code(offsets, self.quantities, size)
+
+        result: Dict[date, Dict[str, int]] = {}
+        for offset in np.flatnonzero(counts).tolist():
+            total_in, net = int(ins[offset]), int(nets[offset])
+            result[_EPOCH_DAY + timedelta(days=first + offset)] = {
+                "in": total_in,
+                "out": total_in - net,
+                "net": net,
+                "count": int(counts[offset]),
+            }
+        return result
@@ -0,0 +1,236 @@
+"""Export - Report A und Report B als CSV, JSON Lines oder Parquet
+
+Die Zeilen werden aus einem Iterable (z.B. ``repository.iter_products()``
+oder seitenweise gelesenen Bewegungen) in Blöcken fester Größe
+(``chunk_size``) geschrieben; es liegt also nie der gesamte Report im
+Speicher. Jede Ausgabedatei entsteht als temporäre Datei und wird erst
+nach vollständigem Schreiben per ``os.replace`` an ihren Platz gelegt.
+
+Format der Dateien (für Weiterverarbeitung z.B. mit pandas oder DuckDB):
+
+- CSV: UTF-8, Komma als Trennzeichen, Kopfzeile, Dezimalpunkt,
+  Zeitstempel im ISO-Format
+- JSON Lines: ein Objekt je Zeile mit den Spalten als Schlüsseln
+- Parquet: eine Row Group je Block, Zeitstempel als ``timestamp[us]``;
+  benötigt pyarrow (``pip install .[export]``)
+"""
+
+import csv
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - abhängig von der Installation
+    pa = pq = None
+
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Für den Parquet-Export wird pyarrow benötigt (pip install .[export])")
+
+
+# -------------------- Zeilen --------------------
+
+
+def inventory_rows(products: Iterable[Product]) -> Iterator[tuple]:
+    """Report A: eine Zeile je Produkt"""
+    for product in products:
+        yield (
+            product.id,
+            product.name,
+            product.category,
+            product.quantity,
+            product.price,
+            product.get_total_value(),
+        )
+
+
+def movement_rows(movements: Iterable[Movement]) -> Iterator[tuple]:
+    """Report B: eine Zeile je Bewegung"""
+    for m in movements:
+        yield (
+            m.timestamp,
+            m.id,
+            m.product_id,
+            m.product_name,
+            m.movement_type,
+            m.quantity_change,
+            m.reason,
+            m.performed_by,
+        )
+
+
+@dataclass(frozen=True)
+class ExportLayout:
+    """Spalten eines Reports: Namen, Typen ("str", "int", "float", "timestamp") und Zeilen"""
+
+    columns: Tuple[str, ...]
+    types: Tuple[str, ...]
+    rows: Callable[[Iterable], Iterator[tuple]]
+
+
+LAYOUTS: Dict[str, ExportLayout] = {
+    "inventory": ExportLayout(
+        columns=("id", "name", "category", "quantity", "price", "total_value"),
+        types=("str", "str", "str", "int", "float", "float"),
+        rows=inventory_rows,
+    ),
+    "movements": ExportLayout(
+        columns=(
+            "timestamp", "id", "product_id", "product_name", "movement_type",
+            "quantity_change", "reason", "performed_by",
+        ),
+        types=("timestamp", "str", "str", "str", "str", "int", "str", "str"),
+        rows=movement_rows,
+    ),
+}
+
+
+def chunked(rows: Iterable[tuple], chunk_size: int) -> Iterator[List[tuple]]:
+    """Zeilen in Blöcke von höchstens chunk_size aufteilen"""
+    if chunk_size < 1:
+        raise ValueError("chunk_size muss mindestens 1 sein")
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _text_values(row: tuple) -> tuple:
+    return tuple(value.isoformat() if isinstance(value, datetime) else value for value in row)
+
+
+# -------------------- Formate --------------------
+
+
+def write_csv(layout: ExportLayout, rows: Iterable[tuple], out, chunk_size: int) -> int:
+    """Zeilen als CSV in einen Text-Stream schreiben (mit ``newline=""`` geöffnet)"""
+    writer = csv.writer(out)
+    writer.writerow(layout.columns)
+    count = 0
+    for chunk in chunked(rows, chunk_size):
+        writer.writerows(map(_text_values, chunk))
+        count += len(chunk)
+    return count
+
+
+def write_jsonl(layout: ExportLayout, rows: Iterable[tuple], out, chunk_size: int) -> int:
+    """Zeilen als JSON Lines in einen Text-Stream schreiben"""
+    count = 0
+    for chunk in chunked(rows, chunk_size):
+        out.write("".join(
+            json.dumps(dict(zip(layout.columns, _text_values(row))), ensure_ascii=False) + "\n"
+            for row in chunk
+        ))
+        count += len(chunk)
+    return count
+
+
+def _parquet_schema(layout: ExportLayout):
+    types = {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "timestamp": pa.timestamp("us"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in zip(layout.columns, layout.types)])
+
+
+def write_parquet(layout: ExportLayout, rows: Iterable[tuple], out, chunk_size: int) -> int:
+    """Zeilen als Parquet in einen Binär-Stream schreiben (eine Row Group je Block)"""
+    _require_pyarrow()
+    schema = _parquet_schema(layout)
+    count = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in chunked(rows, chunk_size):
+            columns = [list(column) for column in zip(*chunk)]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+
+# Format -> (Schreibfunktion, Binärmodus)
+FORMATS: Dict[str, Tuple[Callable[..., int], bool]] = {
+    "csv": (write_csv, False),
+    "jsonl": (write_jsonl, False),
+    "parquet": (write_parquet, True),
+}
+
+
+def format_from_path(path) -> str:
+    """Format aus der Dateiendung ableiten (.csv, .jsonl/.ndjson, .parquet)"""
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix == "ndjson":
+        return "jsonl"
+    if suffix not in FORMATS:
+        raise ValueError(f"Unbekanntes Exportformat: {Path(path).name}")
+    return suffix
+
+
+def export_report(
+    report: str,
+    records: Iterable,
+    path,
+    fmt: str = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Report in eine Datei exportieren
+
+    Args:
+        report: "inventory" (Report A, records = Produkte) oder
+            "movements" (Report B, records = Bewegungen)
+        records: Produkte bzw. Bewegungen in Ausgabereihenfolge
+        path: Zieldatei
+        fmt: "csv", "jsonl" oder "parquet" (None = aus der Dateiendung)
+        chunk_size: Zeilen pro Block
+
+    Returns:
+        Anzahl exportierter Zeilen
+
+    Raises:
+        ValueError: Unbekannter Report oder Format
+        ImportError: pyarrow fehlt (nur Parquet)
+    """
+    if report not in LAYOUTS:
+        raise ValueError(f"Unbekannter Report: {report}")
+    if fmt is None:
+        fmt = format_from_path(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unbekanntes Exportformat: {fmt}")
+    write, binary = FORMATS[fmt]
+    if binary:
+        _require_pyarrow()
+    layout = LAYOUTS[report]
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        if binary:
+            with os.fdopen(fd, "wb") as out:
+                count = write(layout, layout.rows(records), out, chunk_size)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+                count = write(layout, layout.rows(records), out, chunk_size)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return count
@@ -1,8 +1,8 @@
 """Services - Business Logic Layer"""
 
-from datetime import datetime
 from typing import Dict, List, Optional
 
+from ..domain.ids import new_movement_id
 from ..domain.product import Product
 from ..domain.warehouse import Movement, Warehouse
 from ..ports import RepositoryPort
@@ -41,7 +41,7 @@ class WarehouseService:
         # Startbestand als Movement protokollieren (für konsistente History + Report B)
         if initial_quantity > 0:
             movement = Movement(
-                id=f"mov_{datetime.now().timestamp()}",
+                id=new_movement_id(),
                 product_id=product_id,
                 product_name=product.name,
                 quantity_change=initial_quantity,
@@ -57,50 +57,38 @@ class WarehouseService:
         self, product_id: str, quantity: int, reason: str = "", user: str = "system"
     ) -> None:
         """Bestand erhöhen"""
-        product = self.repository.load_product(product_id)
-        if not product:
-            raise ValueError(f"Produkt {product_id} nicht gefunden")
-
-        product.update_quantity(quantity)
-        self.repository.save_product(product)
-
         movement = Movement(
-            id=f"mov_{datetime.now().timestamp()}",
+            id=new_movement_id(),
             product_id=product_id,
-            product_name=product.name,
+            product_name="",  # wird vom Repository ergänzt
             quantity_change=quantity,
             movement_type="IN",
             reason=reason,
             performed_by=user,
         )
-        self.repository.save_movement(movement)
+        quantity = self.repository.apply_stock_change(product_id, quantity, movement)
+        self._stock_changed(product_id, quantity)
 
     def remove_from_stock(
         self, product_id: str, quantity: int, reason: str = "", user: str = "system"
     ) -> None:
         """Bestand verringern"""
-        product = self.repository.load_product(product_id)
-        if not product:
-            raise ValueError(f"Produkt {product_id} nicht gefunden")
-
-        if product.quantity < quantity:
-            raise ValueError(
-                f"Unzureichender Bestand. Verfügbar: {product.quantity}, Angefordert: {quantity}"
-            )
-
-        product.update_quantity(-quantity)
-        self.repository.save_product(product)
-
         movement = Movement(
-            id=f"mov_{datetime.now().timestamp()}",
+            id=new_movement_id(),
             product_id=product_id,
-            product_name=product.name,
+            product_name="",  # wird vom Repository ergänzt
             quantity_change=-quantity,
             movement_type="OUT",
             reason=reason,
             performed_by=user,
         )
-        self.repository.save_movement(movement)
+        quantity = self.repository.apply_stock_change(product_id, -quantity, movement)
+        self._stock_changed(product_id, quantity)
+
+    def _stock_changed(self, product_id: str, quantity: int) -> None:
+        """Gebuchten Bestand ins Lager übernehmen (Summen bleiben konsistent)"""
+        if self.warehouse.get_product(product_id) is not None:
+            self.warehouse.set_quantity(product_id, quantity)
 
     def get_product(self, product_id: str) -> Optional[Product]:
         """Produkt abrufen"""
@@ -116,5 +104,4 @@ class WarehouseService:
 
     def get_total_inventory_value(self) -> float:
         """Gesamtwert des Lagerbestands berechnen"""
-        products = self.repository.load_all_products()
-        return sum(p.get_total_value() for p in products.values())
\ No newline at end of file
+        return sum(p.get_total_value() for p in self.repository.iter_products())
\ No newline at end of file
@@ -10,10 +10,12 @@ def main():
     app = QApplication(sys.argv)
 
     # SQLite Database - speichert Produkte in data/warehouse.db
-    repo = RepositoryFactory.create_repository("sqlite")
+    repo = RepositoryFactory.create_repository("sqlite", profile="balanced")
     use_cases = WarehouseUseCases(repo)
 
     window = WarehouseMainWindow(use_cases)
     window.show()
 
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+    use_cases.close()
+    sys.exit(exit_code)
\ No newline at end of file
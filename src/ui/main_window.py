@@ -12,6 +12,7 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QComboBox,
     QTextEdit,
+    QFileDialog,
 )
 
 from ..backend import WarehouseUseCases
@@ -210,7 +211,7 @@ class WarehouseMainWindow(QMainWindow):
         movements = self.use_cases.list_movements()
         self.movements_table.setRowCount(len(movements))
 
-        for row, movement in enumerate(sorted(movements, key=lambda m: m.timestamp)):
+        for row, movement in enumerate(movements):
             self.movements_table.setItem(
                 row,
                 0,
@@ -248,6 +249,21 @@ class WarehouseMainWindow(QMainWindow):
         button_layout.addWidget(movement_btn)
         layout.addLayout(button_layout)
 
+        export_layout = QHBoxLayout()
+        export_inventory_btn = QPushButton("Lagerbestand exportieren...")
+        export_movement_btn = QPushButton("Bewegungen exportieren...")
+
+        export_inventory_btn.clicked.connect(
+            lambda: self._export_report(self.use_cases.export_inventory_report, "lagerbestand")
+        )
+        export_movement_btn.clicked.connect(
+            lambda: self._export_report(self.use_cases.export_movement_report, "bewegungen")
+        )
+
+        export_layout.addWidget(export_inventory_btn)
+        export_layout.addWidget(export_movement_btn)
+        layout.addLayout(export_layout)
+
         self.report_output = QTextEdit()
         self.report_output.setReadOnly(True)
         self.report_output.setPlaceholderText("Waehle einen Report aus.")
@@ -263,3 +279,22 @@ class WarehouseMainWindow(QMainWindow):
     def _show_movement_report(self):
         report = self.use_cases.generate_movement_report_text()
         self.report_output.setPlainText(report)
+
+    def _export_report(self, export, default_name: str):
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Report exportieren",
+            f"{default_name}.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl);;Parquet (*.parquet)",
+        )
+        if not path:
+            return
+        fmt = {"CSV": "csv", "JSON Lines": "jsonl", "Parquet": "parquet"}[
+            selected_filter.split(" (")[0]
+        ]
+        try:
+            count = export(path, fmt)
+        except (ValueError, ImportError, OSError) as e:
+            QMessageBox.critical(self, "Fehler", str(e))
+            return
+        QMessageBox.information(self, "Erfolg", f"{count} Zeilen nach {path} exportiert.")
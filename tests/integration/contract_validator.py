@@ -10,9 +10,21 @@ REQUIRED_REPOSITORY_METHODS = [
     "save_product",
     "load_product",
     "load_all_products",
+    "iter_products",
+    "search_products",
+    "full_text_search",
     "delete_product",
     "save_movement",
     "load_movements",
+    "iter_movements",
+    "query_movements",
+    "apply_stock_change",
+    "update_product",
+    "save_products",
+    "save_movements",
+    "save_inventory_snapshot",
+    "load_inventory_snapshot",
+    "data_version",
 ]
 
 
@@ -0,0 +1,132 @@
+"""Unit Tests - spaltenbasierte Analytics (NumPy)"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.adapters.movement_log import MovementLog
+from src.adapters.report import ConsoleReportAdapter
+from src.domain.product import Product
+from src.domain.warehouse import Movement, Warehouse
+from src.reports.analytics import MovementColumns, ProductColumns
+
+
+def _products():
+    return [
+        Product(id="P1", name="Öl", description="", price=9.5, quantity=4, category="Pflege"),
+        Product(id="P2", name="Reifen", description="", price=80.0, quantity=8, category="Teile"),
+        Product(id="P3", name="Wachs", description="", price=12.0, quantity=0, category="Pflege"),
+        Product(id="P4", name="Sonstiges", description="", price=1.25, quantity=3),
+    ]
+
+
+def _movements():
+    start = datetime(2026, 3, 1, 8, 0)
+    changes = [5, -2, 7, -1, -3, 4, 2, -6]
+    types = ["IN", "OUT", "IN", "OUT", "CORRECTION", "IN", "IN", "OUT"]
+    return [
+        Movement(
+            id=f"mov_{i}",
+            product_id=f"P{i % 3 + 1}",
+            product_name="x",
+            quantity_change=change,
+            movement_type=types[i],
+            timestamp=start + timedelta(hours=10 * i),
+        )
+        for i, change in enumerate(changes)
+    ]
+
+
+class TestProductColumns:
+    def test_totals_match_object_loop(self):
+        products = _products()
+        warehouse = Warehouse("Test")
+        for product in products:
+            warehouse.add_product(product)
+
+        columns = ProductColumns.from_products(products)
+
+        assert columns.total_value() == pytest.approx(warehouse.get_total_inventory_value())
+        assert columns.total_quantity() == 15
+
+    def test_per_category(self):
+        columns = ProductColumns.from_products(_products())
+
+        assert columns.value_by_category() == pytest.approx(
+            {"Pflege": 38.0, "Teile": 640.0, "": 3.75}
+        )
+        assert columns.quantity_by_category() == {"Pflege": 4, "Teile": 8, "": 3}
+
+    def test_empty(self):
+        columns = ProductColumns.from_products([])
+        assert columns.total_value() == 0.0
+        assert columns.value_by_category() == {}
+
+
+class TestMovementColumns:
+    def test_totals_match_movement_report(self):
+        movements = _movements()
+        totals = MovementColumns.from_movements(movements).totals()
+
+        report = ConsoleReportAdapter({}, movements).generate_movement_report()
+        assert (
+            f"Summe IN: {totals['in']} | Summe OUT: {totals['out']} | Netto: {totals['net']}"
+            in report
+        )
+        assert totals == {"in": 18, "out": 12, "net": 6, "count": 8}
+
+    def test_net_by_type_and_product(self):
+        columns = MovementColumns.from_movements(_movements())
+
+        assert columns.net_by_type() == {"IN": 18, "OUT": -9, "CORRECTION": -3}
+        assert columns.net_by_product() == {"P1": 6, "P2": -11, "P3": 11}
+
+    def test_per_day(self):
+        per_day = MovementColumns.from_movements(_movements()).per_day()
+
+        assert list(per_day) == [date(2026, 3, d) for d in (1, 2, 3, 4)]
+        assert per_day[date(2026, 3, 1)] == {"in": 5, "out": 2, "net": 3, "count": 2}
+        assert sum(day["count"] for day in per_day.values()) == 8
+
+    def test_between(self):
+        columns = MovementColumns.from_movements(_movements()).between(
+            since=datetime(2026, 3, 2), until=datetime(2026, 3, 3)
+        )
+        assert columns.totals() == {"in": 7, "out": 1, "net": 6, "count": 2}
+
+    def test_from_movement_log_matches_objects(self, tmp_path):
+        log = MovementLog(tmp_path / "bewegungen.log")
+        try:
+            log.append(_movements())
+            from_log = MovementColumns.from_movement_log(log)
+        finally:
+            log.close()
+
+        from_objects = MovementColumns.from_movements(_movements())
+        assert from_log.totals() == from_objects.totals()
+        assert from_log.net_by_type() == from_objects.net_by_type()
+        assert from_log.net_by_product() == from_objects.net_by_product()
+        assert from_log.per_day() == from_objects.per_day()
+
+    def test_large_aggregates_are_vectorised(self):
+        """Aggregationen über 10 Mio. Bewegungen ohne Python-Schleife pro Bewegung"""
+        count = 10_000_000
+        rng = np.random.default_rng(1)
+        columns = MovementColumns(
+            timestamps=np.sort(rng.integers(0, 365 * 86_400_000_000, count)),
+            quantities=rng.integers(-50, 50, count),
+            types=["IN", "OUT", "CORRECTION"],
+            type_codes=rng.integers(0, 3, count, dtype=np.int32),
+            product_ids=[f"P{i}" for i in range(1000)],
+            product_codes=rng.integers(0, 1000, count, dtype=np.int32),
+        )
+
+        totals = columns.totals()
+        per_day = columns.per_day()
+        by_product = columns.net_by_product()
+
+        assert totals["net"] == int(columns.quantities.sum())
+        assert sum(day["net"] for day in per_day.values()) == totals["net"]
+        assert sum(by_product.values()) == totals["net"]
@@ -0,0 +1,186 @@
+"""Unit Tests - Asynchroner Repository-Port und Use Cases"""
+
+import asyncio
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from src.adapters.async_repository import ThreadedAsyncRepository
+from src.adapters.repository import InMemoryRepository, RepositoryFactory
+from src.backend import AsyncWarehouseUseCases, WarehouseUseCases
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+def _movement(i: int, change: int) -> Movement:
+    return Movement(
+        id=f"mov_async_{i}",
+        product_id="P1",
+        product_name="",
+        quantity_change=change,
+        movement_type="IN" if change > 0 else "OUT",
+        timestamp=datetime(2026, 3, 1, 8, 0),
+    )
+
+
+class RecordingRepository(InMemoryRepository):
+    """Merkt sich, auf welchem Thread geschrieben wurde"""
+
+    def __init__(self):
+        super().__init__()
+        self.writer_threads = set()
+
+    def apply_stock_change(self, product_id, delta, movement):
+        self.writer_threads.add(threading.current_thread().name)
+        return super().apply_stock_change(product_id, delta, movement)
+
+
+class TestThreadedAsyncRepository:
+    """Tests für den Thread-Pool-Adapter"""
+
+    def test_writes_run_on_single_writer_thread(self):
+        inner = RecordingRepository()
+        inner.save_product(Product(id="P1", name="Öl", description="", price=5.0, quantity=0))
+
+        async def scenario():
+            async with ThreadedAsyncRepository(inner, max_readers=4) as repo:
+                await asyncio.gather(
+                    *(repo.apply_stock_change("P1", 1, _movement(i, 1)) for i in range(50))
+                )
+                product, movements = await asyncio.gather(
+                    repo.load_product("P1"), repo.query_movements(product_id="P1")
+                )
+                return product, movements
+
+        product, movements = asyncio.run(scenario())
+
+        assert product.quantity == 50
+        assert len(movements) == 50
+        assert len(inner.writer_threads) == 1
+        assert next(iter(inner.writer_threads)).startswith("repository-writer")
+
+    def test_concurrent_stock_requests_on_sqlite(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+        inner = RepositoryFactory.create_repository("sqlite", db_path=str(tmp_path / "a.db"))
+        inner.save_product(
+            Product(id="P1", name="Öl", description="", price=5.0, quantity=10, sku="S1")
+        )
+
+        async def scenario():
+            async with ThreadedAsyncRepository(inner) as repo:
+                results = await asyncio.gather(
+                    *(repo.apply_stock_change("P1", -1, _movement(i, -1)) for i in range(15)),
+                    return_exceptions=True,
+                )
+                return results, await repo.load_product("P1")
+
+        try:
+            results, product = asyncio.run(scenario())
+        finally:
+            inner.close()
+
+        assert product.quantity == 0
+        assert sum(isinstance(r, ValueError) for r in results) == 5
+
+    def test_iter_products_streams_in_batches(self):
+        inner = InMemoryRepository()
+        for i in range(10):
+            inner.save_product(
+                Product(id=f"P{i}", name="Öl", description="", price=1.0, quantity=i)
+            )
+
+        async def scenario():
+            async with ThreadedAsyncRepository(inner) as repo:
+                return [p.id async for p in repo.iter_products(batch_size=3)]
+
+        assert asyncio.run(scenario()) == [f"P{i}" for i in range(10)]
+
+    def test_invalid_reader_count(self):
+        with pytest.raises(ValueError):
+            ThreadedAsyncRepository(InMemoryRepository(), max_readers=0)
+
+
+class TestAsyncWarehouseUseCases:
+    """Tests für die asynchronen Use Cases"""
+
+    def test_crud_and_stock_flow(self):
+        async def scenario():
+            async with ThreadedAsyncRepository(InMemoryRepository()) as repo:
+                use_cases = AsyncWarehouseUseCases(repo)
+                await use_cases.create_product("A-1", "Batterie 12V", "", 80.0,
+                                               category="Batterien", quantity=3)
+                await use_cases.add_to_stock("A-1", 2, reason="Lieferung")
+                remaining = await use_cases.remove_from_stock("A-1", 4, reason="Verkauf")
+                updated = await use_cases.update_product("A-1", price=90.0, quantity=6)
+                found = await use_cases.list_products(search="batt", category="Batterien")
+                report = await use_cases.generate_inventory_report()
+                movements = await use_cases.list_movements(product_id="A-1")
+                deleted = await use_cases.delete_product("A-1")
+                return remaining, updated, found, report, movements, deleted
+
+        remaining, updated, found, report, movements, deleted = asyncio.run(scenario())
+
+        assert remaining == 1
+        assert updated.quantity == 6 and updated.price == 90.0
+        assert list(found) == ["A-1"]
+        assert report["total_value"] == 540.0
+        assert [m.movement_type for m in movements] == ["IN", "IN", "OUT", "CORRECTION"]
+        assert deleted is True
+
+    def test_stock_at_from_snapshot(self):
+        async def scenario():
+            inner = InMemoryRepository()
+            inner.save_product(
+                Product(id="A-1", name="Öl", description="", price=5.0, quantity=7,
+                        created_at=datetime(2026, 1, 1))
+            )
+            inner.save_movements([
+                Movement("mov_1", "A-1", "Öl", 3, "IN", timestamp=datetime(2026, 2, 1, 9)),
+                Movement("mov_2", "A-1", "Öl", 4, "IN", timestamp=datetime(2026, 2, 3, 9)),
+            ])
+            async with ThreadedAsyncRepository(inner) as repo:
+                use_cases = AsyncWarehouseUseCases(repo)
+                await use_cases.take_inventory_snapshot(date(2026, 2, 1))
+                stock = await use_cases.stock_at("A-1", date(2026, 2, 2))
+                report = await use_cases.generate_inventory_report_at(date(2026, 2, 3))
+                return stock, report
+
+        stock, report = asyncio.run(scenario())
+
+        assert stock == {"A-1": 3}
+        assert report["total_value"] == 35.0
+
+    def test_reports_cached_until_write(self):
+        async def scenario():
+            async with ThreadedAsyncRepository(InMemoryRepository()) as repo:
+                use_cases = AsyncWarehouseUseCases(repo)
+                await use_cases.create_product("A-1", "Öl", "", 5.0, quantity=2)
+                first = await use_cases.generate_inventory_report_text()
+                again = await use_cases.generate_inventory_report_text()
+                await use_cases.add_to_stock("A-1", 1)
+                after = await use_cases.generate_inventory_report_text()
+                return first, again, after
+
+        first, again, after = asyncio.run(scenario())
+
+        assert again is first
+        assert "Gesamtwert Lager: 15.00 €" in after
+
+    def test_inventory_text_matches_sync(self):
+        inner = InMemoryRepository()
+        # Einfügereihenfolge weicht von der ID-Reihenfolge ab
+        for product_id in ("C-3", "A-1", "B-2"):
+            inner.save_product(
+                Product(id=product_id, name=f"Artikel {product_id}", description="",
+                        price=2.5, quantity=4, category="Pflege")
+            )
+
+        async def scenario():
+            async with ThreadedAsyncRepository(inner) as repo:
+                return await AsyncWarehouseUseCases(repo).generate_inventory_report_text()
+
+        text = asyncio.run(scenario())
+
+        assert text == WarehouseUseCases(inner).generate_inventory_report_text()
+        assert text.index("ID: A-1") < text.index("ID: B-2") < text.index("ID: C-3")
@@ -1,7 +1,14 @@
 """Unit Tests - Backend Use Cases"""
 
-from src.adapters.repository import InMemoryRepository
+import io
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository, RepositoryFactory
 from src.backend import WarehouseUseCases
+from src.domain.product import Product
+from src.domain.warehouse import Movement
 
 
 class TestWarehouseUseCases:
@@ -94,3 +101,205 @@ class TestWarehouseUseCases:
         movements = self.use_cases.list_movements()
         assert len(movements) == 1
         assert movements[0].movement_type == "IN"
+
+
+class TestStockAt:
+    """Tests fuer Bestands-Snapshots und Bestand zum Stichtag"""
+
+    def setup_method(self):
+        self.repo = InMemoryRepository()
+        self.use_cases = WarehouseUseCases(self.repo)
+        self.repo.save_products([
+            Product(
+                id="P1", name="Oel", description="", price=10.0, quantity=0,
+                created_at=datetime(2025, 1, 1),
+            ),
+            Product(
+                id="P2", name="Reifen", description="", price=80.0, quantity=0,
+                created_at=datetime(2025, 1, 1),
+            ),
+        ])
+        # Ein Jahr Historie: P1 +1 pro Tag, P2 +2 an jedem Montag
+        start = datetime(2025, 1, 1, 12)
+        for day in range(365):
+            timestamp = start + timedelta(days=day)
+            self.repo.apply_stock_change(
+                "P1", 1, Movement(f"mov_a{day}", "P1", "", 1, "IN", timestamp=timestamp)
+            )
+            if timestamp.weekday() == 0:
+                self.repo.apply_stock_change(
+                    "P2", 2, Movement(f"mov_b{day}", "P2", "", 2, "IN", timestamp=timestamp)
+                )
+
+    def _expected(self, at: date):
+        days = (at - date(2025, 1, 1)).days + 1
+        mondays = sum(
+            1 for d in range(days) if (date(2025, 1, 1) + timedelta(days=d)).weekday() == 0
+        )
+        return {"P1": days, "P2": 2 * mondays}
+
+    def test_without_snapshot_counts_back_from_current_stock(self):
+        at = date(2025, 6, 30)
+        assert self.use_cases.stock_at(None, at) == self._expected(at)
+        assert self.use_cases.stock_at("P1", at) == {"P1": self._expected(at)["P1"]}
+
+    def test_from_nearest_snapshot_reads_only_the_delta(self, monkeypatch):
+        for month in range(1, 13):
+            self.use_cases.take_inventory_snapshot(date(2025, month, 1))
+
+        windows = []
+        query = self.repo.query_movements
+
+        def recording_query(**kwargs):
+            windows.append((kwargs["since"], kwargs["until"]))
+            return query(**kwargs)
+
+        monkeypatch.setattr(self.repo, "query_movements", recording_query)
+
+        at = date(2025, 6, 10)
+        assert self.use_cases.stock_at(None, at) == self._expected(at)
+        assert windows == [(datetime(2025, 6, 2), datetime(2025, 6, 11))]
+
+    def test_products_created_later_are_missing(self):
+        self.repo.save_product(Product(id="P3", name="Neu", description="", price=1.0))
+        assert "P3" not in self.use_cases.stock_at(None, date(2025, 12, 31))
+        assert self.use_cases.stock_at("P3", date.today()) == {"P3": 0}
+
+    def test_default_snapshot_is_yesterday(self):
+        self.use_cases.take_inventory_snapshot()
+        snapshot_date, quantities = self.repo.load_inventory_snapshot(date.today())
+        assert snapshot_date == date.today() - timedelta(days=1)
+        assert quantities["P1"] == 365
+
+    def test_year_end_report(self):
+        self.use_cases.take_inventory_snapshot(date(2025, 12, 1))
+        report = self.use_cases.generate_inventory_report_at(date(2025, 12, 31))
+
+        assert report["as_of"] == date(2025, 12, 31)
+        expected = self._expected(date(2025, 12, 31))
+        assert {item["id"]: item["quantity"] for item in report["items"]} == expected
+        assert report["total_value"] == expected["P1"] * 10.0 + expected["P2"] * 80.0
+
+
+class TestReportStreaming:
+    """Tests fuer die gestreamten Text-Reports"""
+
+    def setup_method(self):
+        self.repo = InMemoryRepository()
+        self.use_cases = WarehouseUseCases(self.repo)
+        for i in range(3):
+            self.use_cases.create_product(
+                product_id=f"P{i}", name=f"Artikel {i}", description="", price=2.5, quantity=1
+            )
+        start = datetime(2026, 3, 1, 8)
+        for i in range(250):
+            self.repo.apply_stock_change(
+                f"P{i % 3}", 1,
+                Movement(f"mov_{i:04d}", f"P{i % 3}", "", 1, "IN",
+                         timestamp=start + timedelta(hours=i)),
+            )
+
+    def test_movement_report_paged_matches_adapter(self):
+        from src.adapters.report import ConsoleReportAdapter
+
+        expected = ConsoleReportAdapter({}, self.repo.load_movements()).generate_movement_report()
+        buffer = io.StringIO()
+
+        lines = self.use_cases.write_movement_report_text(buffer, page_size=40)
+
+        assert buffer.getvalue() == expected
+        assert self.use_cases.generate_movement_report_text() == expected
+        assert lines == len(expected.splitlines())
+
+    def test_movement_report_window(self):
+        since = datetime(2026, 3, 2)
+        until = datetime(2026, 3, 3)
+
+        text = self.use_cases.generate_movement_report_text(since, until)
+
+        assert "Gesamtbewegungen: 24" in text
+        assert "2026-03-01" not in text
+
+    def test_inventory_report_stream(self):
+        buffer = io.StringIO()
+
+        self.use_cases.write_inventory_report_text(buffer, batch_size=2)
+
+        assert buffer.getvalue() == self.use_cases.generate_inventory_report_text()
+        assert buffer.getvalue().index("ID: P0") < buffer.getvalue().index("ID: P2")
+        assert "Gesamtwert Lager: 632.50 €" in buffer.getvalue()
+
+
+class TestReportCache:
+    """Tests fuer den Report-Cache je Datenstand"""
+
+    def setup_method(self):
+        self.repo = InMemoryRepository()
+        self.use_cases = WarehouseUseCases(self.repo)
+        self.use_cases.create_product(
+            product_id="P1", name="Oel", description="", price=10.0, quantity=2
+        )
+
+    def test_repeated_reports_are_cached(self):
+        text = self.use_cases.generate_inventory_report_text()
+        report = self.use_cases.generate_inventory_report()
+
+        assert self.use_cases.generate_inventory_report_text() is text
+        assert self.use_cases.generate_inventory_report() is report
+        assert self.use_cases.report_cache.stats()["hits"] == 2
+
+    def test_parameters_are_part_of_key(self):
+        day = datetime(2026, 1, 1)
+        all_movements = self.use_cases.generate_movement_report_text()
+        window = self.use_cases.generate_movement_report_text(day, day + timedelta(days=1))
+
+        assert window != all_movements
+        assert self.use_cases.generate_movement_report_text(day, day + timedelta(days=1)) is window
+
+    def test_write_invalidates(self):
+        before = self.use_cases.generate_inventory_report()
+        movements_before = self.use_cases.generate_movement_report_text()
+
+        self.use_cases.update_product("P1", quantity=5)
+
+        assert self.use_cases.generate_inventory_report()["total_value"] == 50.0
+        assert before["total_value"] == 20.0
+        assert "Gesamtbewegungen: 2" in self.use_cases.generate_movement_report_text()
+        assert "Gesamtbewegungen: 1" in movements_before
+
+    def test_old_versions_are_dropped(self):
+        self.use_cases.generate_inventory_report()
+        self.use_cases.generate_inventory_report_text()
+        self.use_cases.update_product("P1", quantity=3)
+        self.use_cases.generate_inventory_report()
+
+        assert self.use_cases.report_cache.stats()["size"] == 1
+
+
+class TestUpdateProductConcurrency:
+    """update_product darf zwischenzeitliche Buchungen nicht überschreiben"""
+
+    def test_scan_between_load_and_update_survives(self, tmp_path, monkeypatch):
+        pytest.importorskip("sqlalchemy")
+        repo = RepositoryFactory.create_repository("sqlite", db_path=str(tmp_path / "lager.db"))
+        use_cases = WarehouseUseCases(repo)
+        use_cases.create_product("P1", "Oel", "", 10.0, quantity=5, sku="SKU-1")
+        load_product = repo.load_product
+
+        def load_then_scan(product_id):
+            product = load_product(product_id)
+            repo.apply_stock_change(
+                product_id, -2, Movement("mov_scan", product_id, "", -2, "OUT")
+            )
+            return product
+
+        monkeypatch.setattr(repo, "load_product", load_then_scan)
+        try:
+            updated = use_cases.update_product("P1", name="Motoroel", price=12.0)
+        finally:
+            monkeypatch.undo()
+
+        reloaded = repo.load_product("P1")
+        repo.close()
+        assert updated.quantity == 3
+        assert (reloaded.name, reloaded.price, reloaded.quantity) == ("Motoroel", 12.0, 3)
@@ -0,0 +1,147 @@
+"""Unit Tests - CachingRepository"""
+
+import copy
+from datetime import datetime
+
+import pytest
+
+from src.adapters.caching import CachingRepository
+from src.adapters.repository import InMemoryRepository
+from src.backend import WarehouseUseCases
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+class CountingRepository(InMemoryRepository):
+    """In-Memory Repository, das Lesezugriffe zählt"""
+
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+        self.load_alls = 0
+
+    def load_product(self, product_id):
+        self.loads += 1
+        return super().load_product(product_id)
+
+    def load_all_products(self):
+        self.load_alls += 1
+        return super().load_all_products()
+
+
+def _product(product_id: str, quantity: int = 5) -> Product:
+    return Product(id=product_id, name=f"Artikel {product_id}", description="", price=2.0,
+                   quantity=quantity)
+
+
+class TestCachingRepository:
+    """Tests für den Read-Through-Cache"""
+
+    def setup_method(self):
+        self.inner = CountingRepository()
+        self.repo = CachingRepository(self.inner, max_size=2)
+
+    def test_load_product_hits_cache(self):
+        self.repo.save_product(_product("A"))
+
+        first = self.repo.load_product("A")
+        second = self.repo.load_product("A")
+
+        assert first.name == second.name == "Artikel A"
+        assert self.inner.loads == 1
+        assert self.repo.stats()["hits"] == 1
+        assert self.repo.stats()["misses"] == 1
+
+    def test_returned_products_are_copies(self):
+        self.repo.save_product(_product("A"))
+        self.repo.load_product("A").name = "Verändert"
+
+        assert self.repo.load_product("A").name == "Artikel A"
+
+    def test_load_all_products_is_read_only_view(self):
+        self.repo.save_product(_product("A"))
+        products = self.repo.load_all_products()
+
+        # Treffer liefern dieselbe Sicht ohne Kopie, schreiben ist nicht möglich
+        assert self.repo.load_all_products() is products
+        with pytest.raises(TypeError):
+            products["B"] = _product("B")
+
+        # Wer ändern will, kopiert selbst; Cache und Repository bleiben unverändert
+        changed = copy.copy(products["A"])
+        changed.name = "Verändert"
+        self.repo.load_product("A").price = 99.0
+
+        reloaded = self.repo.load_product("A")
+        assert (reloaded.name, reloaded.price) == ("Artikel A", _product("A").price)
+        assert self.repo.load_all_products()["A"].name == "Artikel A"
+
+    def test_missing_product_is_cached(self):
+        assert self.repo.load_product("FEHLT") is None
+        assert self.repo.load_product("FEHLT") is None
+        assert self.inner.loads == 1
+
+    def test_lru_eviction(self):
+        for product_id in "ABC":
+            self.repo.save_product(_product(product_id))
+            self.repo.load_product(product_id)
+
+        assert self.repo.stats()["evictions"] == 1
+        assert self.repo.stats()["size"] == 2
+        self.repo.load_product("A")
+        assert self.inner.loads == 4
+
+    def test_writes_invalidate(self):
+        self.repo.save_product(_product("A", quantity=5))
+        assert self.repo.load_product("A").quantity == 5
+
+        movement = Movement(id="m1", product_id="A", product_name="", quantity_change=3,
+                            movement_type="IN", timestamp=datetime(2026, 1, 1))
+        assert self.repo.apply_stock_change("A", 3, movement) == 8
+        assert self.repo.load_product("A").quantity == 8
+
+        self.repo.delete_product("A")
+        assert self.repo.load_product("A") is None
+
+    def test_load_all_products_memoised_until_write(self):
+        self.repo.save_product(_product("A"))
+        self.repo.load_all_products()
+        self.repo.load_all_products()
+        assert self.inner.load_alls == 1
+
+        # Einzelprodukte werden aus der gemerkten Gesamtliste bedient
+        assert self.repo.load_product("A") is not None
+        assert self.inner.loads == 0
+
+        self.repo.save_product(_product("B"))
+        assert set(self.repo.load_all_products()) == {"A", "B"}
+        assert self.inner.load_alls == 2
+
+    def test_ttl_expiry(self, monkeypatch):
+        import src.adapters.caching as caching
+
+        now = [1000.0]
+        monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+        repo = CachingRepository(self.inner, ttl=10)
+        self.inner.save_product(_product("A"))
+
+        repo.load_product("A")
+        now[0] += 5
+        repo.load_product("A")
+        now[0] += 10
+        repo.load_product("A")
+
+        assert self.inner.loads == 2
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            CachingRepository(self.inner, max_size=0)
+
+    def test_use_cases_on_cache(self):
+        use_cases = WarehouseUseCases(self.repo)
+        use_cases.create_product("A", "Öl", "", 10.0, quantity=2)
+        use_cases.update_product("A", price=12.0, quantity=5)
+
+        assert use_cases.read_product("A").quantity == 5
+        assert use_cases.read_product("A").price == 12.0
+        assert len(use_cases.list_movements()) == 2
@@ -0,0 +1,133 @@
+"""Unit Tests - Lagerstandsreport je Kategorie (sequentiell und parallel)"""
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository
+from src.backend import WarehouseUseCases
+from src.backend.category_report import (
+    LazyProcessPool,
+    build_category_report,
+    effective_workers,
+    partition_by_category,
+)
+from src.domain.product import Product
+
+
+def _products(count: int):
+    return [
+        Product(
+            id=f"P{(i * 7919) % count:05d}",
+            name=f"Artikel {i}",
+            description="",
+            price=0.1 * (i % 13) + 0.01,
+            quantity=i % 17,
+            category=f"Kategorie {i % 5}" if i % 11 else "",
+        )
+        for i in range(count)
+    ]
+
+
+def _without_timestamp(report):
+    return {key: value for key, value in report.items() if key != "generated_at"}
+
+
+class TestCategoryReport:
+    """Tests für build_category_report"""
+
+    def test_partitions_keep_categories_together(self):
+        rows = [(p.id, p.name, p.category, p.price, p.quantity) for p in _products(300)]
+        partitions = partition_by_category(rows, 4)
+
+        assert len(partitions) == 4
+        assert sum(map(len, partitions)) == 300
+        owners = {}
+        for index, partition in enumerate(partitions):
+            for row in partition:
+                assert owners.setdefault(row[2], index) == index
+        assert len(partition_by_category(rows, 50)) == 6
+
+    def test_totals_and_order(self):
+        products = _products(300)
+        report = build_category_report(products)
+
+        assert [item["id"] for item in report["items"]] == sorted(p.id for p in products)
+        assert [c["category"] for c in report["categories"]] == [""] + [
+            f"Kategorie {i}" for i in range(5)
+        ]
+        assert sum(c["products"] for c in report["categories"]) == 300
+        assert sum(c["quantity"] for c in report["categories"]) == sum(
+            p.quantity for p in products
+        )
+        assert report["total_value"] == pytest.approx(
+            sum(p.get_total_value() for p in products)
+        )
+
+    def test_parallel_matches_sequential(self):
+        products = _products(2000)
+        sequential = _without_timestamp(build_category_report(products))
+
+        for workers in (2, 4):
+            parallel = build_category_report(
+                reversed(products), workers=workers, parallel_threshold=0
+            )
+            assert _without_timestamp(parallel) == sequential
+
+    def test_text_per_category(self):
+        products = [
+            Product(id="P2", name="Reifen", description="", price=50.0, quantity=4,
+                    category="Teile"),
+            Product(id="P1", name="Öl", description="", price=10.0, quantity=3),
+        ]
+
+        text = build_category_report(products)["text"]
+
+        assert text.index("Kategorie: (ohne)") < text.index("Kategorie: Teile")
+        assert "  P2 | Reifen | 4 x 50.00 € = 200.00 €\n" in text
+        assert "  Zwischensumme: 1 Produkte, 4 Stück, 200.00 €\n" in text
+        assert "Gesamtwert Lager: 230.00 €\n" in text
+
+    def test_small_catalogue_stays_sequential(self):
+        pool = LazyProcessPool()
+        assert effective_workers(10, 4, threshold=100) == 1
+        assert effective_workers(100, 4, threshold=100) == 4
+
+        build_category_report(_products(50), workers=4, executor=pool, parallel_threshold=100)
+
+        assert pool._pool is None
+
+    def test_pool_is_started_once_and_reused(self):
+        pool = LazyProcessPool(max_workers=2)
+        try:
+            build_category_report(_products(200), workers=2, executor=pool, parallel_threshold=0)
+            started = pool._pool
+            build_category_report(_products(300), workers=2, executor=pool, parallel_threshold=0)
+
+            assert started is not None and pool._pool is started
+        finally:
+            pool.shutdown()
+        assert pool._pool is None
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            build_category_report([], workers=0)
+
+    def test_empty(self):
+        report = build_category_report([], workers=4)
+        assert report["items"] == [] and report["categories"] == []
+        assert report["total_value"] == 0.0
+
+    def test_use_case(self):
+        repo = InMemoryRepository()
+        repo.save_products(_products(50))
+        use_cases = WarehouseUseCases(repo)
+
+        report = use_cases.generate_inventory_report_by_category(workers=2)
+
+        assert len(report["items"]) == 50
+        assert use_cases.generate_inventory_report_by_category() is report
+        assert report["total_value"] == pytest.approx(
+            use_cases.generate_inventory_report()["total_value"]
+        )
+        # 50 Produkte liegen unter der Schwelle, es wird kein Prozess gestartet
+        assert use_cases.report_pool._pool is None
+        use_cases.close()
@@ -1,6 +1,12 @@
 """Tests - Unit Tests für die Geschäftslogik"""
+import gc
+import json
+import tracemalloc
+from datetime import datetime
+
 import pytest
 from src.domain.product import Product
+from src.domain.warehouse import Movement, Warehouse
 from src.adapters.repository import InMemoryRepository
 from src.services import WarehouseService
 
@@ -145,4 +151,177 @@ class TestWarehouseService:
 
         movements = service.get_movements()
         # Startbestand + add + remove = 3
-        assert len(movements) == 3
\ No newline at end of file
+        assert len(movements) == 3
+
+
+class TestWarehouseTotals:
+    """Tests für die laufenden Summen im Warehouse"""
+
+    @pytest.fixture
+    def warehouse(self):
+        warehouse = Warehouse("Test")
+        warehouse.add_product(
+            Product(id="P1", name="Öl", description="", price=10.0, quantity=3, category="Pflege")
+        )
+        warehouse.add_product(
+            Product(
+                id="P2", name="Reifen", description="", price=50.0, quantity=4, category="Teile"
+            )
+        )
+        warehouse.add_product(
+            Product(id="P3", name="Wachs", description="", price=2.5, quantity=2, category="Pflege")
+        )
+        return warehouse
+
+    def test_totals_after_add(self, warehouse):
+        """Test: Summen nach add_product"""
+        assert warehouse.get_total_inventory_value() == 235.0
+        assert warehouse.get_total_quantity() == 9
+        assert warehouse.get_category_totals() == {
+            "Pflege": {"total_value": 35.0, "quantity": 5, "products": 2},
+            "Teile": {"total_value": 200.0, "quantity": 4, "products": 1},
+        }
+        assert warehouse.verify_totals()
+
+    def test_record_movement_updates_totals(self, warehouse):
+        """Test: Bewegung ändert Bestand und Summen"""
+        warehouse.record_movement(Movement("mov_1", "P2", "Reifen", -3, "OUT"))
+
+        assert warehouse.get_product("P2").quantity == 1
+        assert warehouse.get_total_inventory_value() == 85.0
+        assert warehouse.get_category_totals()["Teile"]["quantity"] == 1
+        assert len(warehouse.movements) == 1
+        assert warehouse.verify_totals()
+
+    def test_rejected_movement_keeps_totals(self, warehouse):
+        """Test: Bewegung unter Null wird abgelehnt, Summen bleiben"""
+        with pytest.raises(ValueError):
+            warehouse.record_movement(Movement("mov_1", "P1", "Öl", -10, "OUT"))
+
+        assert warehouse.get_total_inventory_value() == 235.0
+        assert warehouse.movements == []
+
+    def test_remove_product(self, warehouse):
+        """Test: Entfernen zieht Beitrag ab, leere Kategorien verschwinden"""
+        warehouse.remove_product("P2")
+
+        assert warehouse.get_total_inventory_value() == 35.0
+        assert "Teile" not in warehouse.get_category_totals()
+        assert warehouse.verify_totals()
+
+    def test_direct_change_detected_and_synced(self, warehouse):
+        """Test: direkte Änderung am Produkt fällt in der Selbstprüfung auf"""
+        product = warehouse.get_product("P1")
+        product.price = 20.0
+        product.category = "Teile"
+        assert not warehouse.verify_totals()
+
+        warehouse.product_changed("P1")
+
+        assert warehouse.verify_totals()
+        assert warehouse.get_category_totals()["Teile"] == {
+            "total_value": 260.0, "quantity": 7, "products": 2
+        }
+
+    def test_report_uses_live_values(self, warehouse):
+        """Test: Bericht rechnet mit aktuellem Preis, auch ohne product_changed"""
+        warehouse.get_product("P1").price = 20.0
+
+        assert warehouse.get_inventory_report()["P1"]["total_value"] == 60.0
+
+    def test_shared_product_synced_by_service(self):
+        """Test: Buchung über das Repository hält die Summen des Lagers konsistent"""
+        service = WarehouseService(InMemoryRepository())
+        product = service.create_product("P1", "Öl", "", 10.0, "Pflege", initial_quantity=3)
+        # Repository und Lager halten dasselbe Objekt
+        assert service.repository.load_product("P1") is product
+
+        service.add_to_stock("P1", 5)
+        service.remove_from_stock("P1", 2)
+
+        assert service.warehouse.verify_totals()
+        assert service.warehouse.get_total_quantity() == 6
+        assert service.warehouse.get_inventory_report()["P1"]["total_value"] == 60.0
+
+    def test_many_updates_stay_consistent(self, warehouse):
+        """Test: viele kleine Änderungen ohne Drift"""
+        for i in range(1000):
+            warehouse.update_quantity("P3", 1 if i % 3 else -1)
+        assert warehouse.verify_totals()
+
+        warehouse.refresh_totals()
+        assert warehouse.get_total_quantity() == 9 + 332
+
+
+class TestMemoryFootprint:
+    """Tests für die kompakte Darstellung von Product und Movement"""
+
+    def test_no_instance_dict(self):
+        """Test: Slots statt __dict__"""
+        product = Product(id="P001", name="Test", description="", price=1.0)
+        movement = Movement("mov_1", "P001", "Test", 1, "IN")
+        assert not hasattr(product, "__dict__")
+        assert not hasattr(movement, "__dict__")
+
+    def test_repeated_strings_are_shared(self):
+        """Test: gleiche Strings aus getrennt dekodierten Daten werden geteilt"""
+        rows = json.loads(
+            '[{"name": "Reifen", "type": "IN", "user": "lager", "category": "Teile"},'
+            ' {"name": "Reifen", "type": "IN", "user": "lager", "category": "Teile"}]'
+        )
+        first, second = (
+            Movement("mov_%d" % i, "P001", row["name"], 1, row["type"], performed_by=row["user"])
+            for i, row in enumerate(rows)
+        )
+        assert first.product_name is second.product_name
+        assert first.movement_type is second.movement_type
+        assert first.performed_by is second.performed_by
+
+        products = [
+            Product(id=str(i), name="x", description="", price=1.0, category=row["category"])
+            for i, row in enumerate(rows)
+        ]
+        assert products[0].category is products[1].category
+
+    def test_movement_footprint(self):
+        """Test: Speicher pro Bewegung (inkl. Strings und Zeitstempel) gemessen mit tracemalloc"""
+        count = 20_000
+        payload = json.dumps(
+            [
+                {
+                    "id": f"mov_{i:08d}",
+                    "product_id": f"P{i % 100:03d}",
+                    "product_name": f"Produkt {i % 100}",
+                    "quantity_change": i % 7,
+                    "movement_type": "OUT" if i % 2 else "IN",
+                    "timestamp": "2025-01-01T10:00:00",
+                    "performed_by": "lager",
+                }
+                for i in range(count)
+            ]
+        )
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            rows = json.loads(payload)
+            movements = [
+                Movement(
+                    id=row["id"],
+                    product_id=row["product_id"],
+                    product_name=row["product_name"],
+                    quantity_change=row["quantity_change"],
+                    movement_type=row["movement_type"],
+                    timestamp=datetime.fromisoformat(row["timestamp"]),
+                    performed_by=row["performed_by"],
+                )
+                for row in rows
+            ]
+            del rows
+            gc.collect()
+            per_movement = tracemalloc.get_traced_memory()[0] / len(movements)
+        finally:
+            tracemalloc.stop()
+
+        # Mit __dict__ und je Bewegung kopierten Strings lag der Wert bei ~470 Bytes
+        assert per_movement < 320
@@ -0,0 +1,158 @@
+"""Unit Tests - Report-Export (CSV, JSON Lines, Parquet)"""
+
+import csv
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository, RepositoryFactory
+from src.backend import WarehouseUseCases
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+from src.reports import export_report, format_from_path
+from src.reports.__main__ import main
+from src.reports.export import chunked
+
+START = datetime(2025, 1, 1, 8)
+
+
+def _movements(count: int):
+    for i in range(count):
+        yield Movement(
+            id=f"mov_{i:07d}",
+            product_id=f"P{i % 3}",
+            product_name=f"Artikel {i % 3}",
+            quantity_change=1 if i % 4 else -1,
+            movement_type="IN" if i % 4 else "OUT",
+            reason="Lieferung, Teil 1" if i % 4 else None,
+            performed_by="anna",
+            timestamp=START + timedelta(minutes=i),
+        )
+
+
+def _fill(repo) -> None:
+    repo.save_products([
+        Product(id=f"P{i}", name=f"Artikel {i}", description="", price=2.5,
+                quantity=10, sku=f"SKU-{i}", category="Oel")
+        for i in range(3)
+    ])
+    repo.save_movements(_movements(500))
+
+
+class TestExportFormats:
+    """Tests für die einzelnen Formate"""
+
+    def test_chunked(self):
+        assert [len(c) for c in chunked(range(25), 10)] == [10, 10, 5]
+        with pytest.raises(ValueError):
+            list(chunked([], 0))
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "bewegungen.csv"
+
+        assert export_report("movements", _movements(25), path, chunk_size=10) == 25
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 25
+        assert rows[1]["timestamp"] == "2025-01-01T08:01:00"
+        assert rows[1]["reason"] == "Lieferung, Teil 1"
+        assert rows[0]["reason"] == ""
+        assert rows[0]["quantity_change"] == "-1"
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "bestand.jsonl"
+        products = [Product(id="P1", name="Öl", description="", price=4.5, quantity=2)]
+
+        assert export_report("inventory", products, path) == 1
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0]) == {
+            "id": "P1", "name": "Öl", "category": "", "quantity": 2,
+            "price": 4.5, "total_value": 9.0,
+        }
+
+    def test_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "bewegungen.parquet"
+
+        export_report("movements", _movements(25), path, chunk_size=10)
+
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.num_rows == 25
+        assert table.column("timestamp")[1].as_py() == START + timedelta(minutes=1)
+
+    def test_unknown_format_leaves_no_file(self, tmp_path):
+        with pytest.raises(ValueError):
+            format_from_path(tmp_path / "bericht.xlsx")
+        with pytest.raises(ValueError):
+            export_report("movements", [], tmp_path / "bericht.csv", fmt="xlsx")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_export_keeps_previous_file(self, tmp_path):
+        path = tmp_path / "bewegungen.csv"
+        path.write_text("alt")
+
+        def broken():
+            yield from _movements(5)
+            raise RuntimeError("Lesefehler")
+
+        with pytest.raises(RuntimeError):
+            export_report("movements", broken(), path, chunk_size=2)
+
+        assert path.read_text() == "alt"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_memory_is_bounded_by_chunk_size(self, tmp_path):
+        tracemalloc.start()
+        try:
+            export_report("movements", _movements(20_000), tmp_path / "b.jsonl", chunk_size=500)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # 20.000 Bewegungen als Objekte bräuchten ein Vielfaches davon
+        assert peak < 1_000_000
+
+
+class TestExportUseCases:
+    """Tests für Export über Use Cases und Kommandozeile"""
+
+    def test_movement_export_window(self, tmp_path):
+        repo = InMemoryRepository()
+        _fill(repo)
+        use_cases = WarehouseUseCases(repo)
+        path = tmp_path / "januar.csv"
+
+        count = use_cases.export_movement_report(
+            path, since=START + timedelta(minutes=100), until=START + timedelta(minutes=200),
+            chunk_size=30,
+        )
+
+        with open(path, newline="", encoding="utf-8") as f:
+            ids = [row["id"] for row in csv.DictReader(f)]
+        assert count == 100
+        assert ids == [f"mov_{i:07d}" for i in range(100, 200)]
+
+    def test_cli(self, tmp_path, capsys):
+        pytest.importorskip("sqlalchemy")
+        db_path = tmp_path / "lager.db"
+        repo = RepositoryFactory.create_repository("sqlite", db_path=str(db_path))
+        _fill(repo)
+        repo.close()
+
+        assert main(["inventory", str(tmp_path / "bestand.csv"), "--db", str(db_path)]) == 0
+        assert main([
+            "movements", str(tmp_path / "b.txt"), "--format", "jsonl", "--db", str(db_path),
+            "--since", "2025-01-01T09:00",
+        ]) == 0
+
+        assert "3 Zeilen" in capsys.readouterr().out
+        lines = (tmp_path / "b.txt").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 440
+        assert json.loads(lines[0])["timestamp"] == "2025-01-01T09:00:00"
+        assert main(["inventory", str(tmp_path / "bestand.xlsx"), "--db", str(db_path)]) == 1
@@ -0,0 +1,96 @@
+"""Tests - ID-Generator für Bewegungen"""
+import threading
+
+import pytest
+
+from src.domain import ids
+from src.domain.ids import IdGenerator, new_movement_id
+
+
+class TestIdGenerator:
+    """Eindeutigkeit und Sortierbarkeit der erzeugten IDs"""
+
+    def test_format(self):
+        """Test: Präfix plus 28 Hex-Zeichen"""
+        movement_id = new_movement_id()
+        assert movement_id.startswith("mov_")
+        assert len(movement_id) == 4 + 28
+        int(movement_id[4:], 16)
+
+    def test_unique_and_sorted_within_burst(self):
+        """Test: viele IDs in derselben Millisekunde bleiben eindeutig und aufsteigend"""
+        generate = IdGenerator("mov_", node_id=1)
+        generated = [generate() for _ in range(50_000)]
+        assert len(set(generated)) == len(generated)
+        assert generated == sorted(generated)
+
+    def test_unique_across_threads(self):
+        """Test: parallele Erzeugung ohne Kollisionen"""
+        generate = IdGenerator("mov_", node_id=2)
+        results = [[] for _ in range(8)]
+
+        def worker(target):
+            for _ in range(10_000):
+                target.append(generate())
+
+        threads = [threading.Thread(target=worker, args=(r,)) for r in results]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        generated = [movement_id for result in results for movement_id in result]
+        assert len(set(generated)) == len(generated)
+        for result in results:
+            assert result == sorted(result)
+
+    def test_clock_going_backwards_keeps_order(self):
+        """Test: zurückspringende Uhr erzeugt keine kleineren IDs"""
+        generate = IdGenerator("mov_", node_id=3)
+        clock = iter([2_000_000_000, 1_000_000_000, 3_000_000_000])
+        now = lambda: next(clock)
+        first, second, third = generate(now), generate(now), generate(now)
+        assert first < second < third
+
+    def test_stale_refresh_does_not_move_template_back(self):
+        """Test: ein Thread mit älterer Millisekunde überschreibt die neuere Vorlage nicht"""
+        generate = IdGenerator("mov_", node_id=4)
+        generate(lambda: 100_000_000)
+        newer = []
+
+        class Interleaved:
+            """Lässt einen anderen Thread direkt vor dem Lock die Vorlage erneuern"""
+
+            def __init__(self, lock):
+                self.lock = lock
+                self.pending = True
+
+            def __enter__(self):
+                if self.pending:
+                    self.pending = False
+                    newer.append(generate(lambda: 102_000_000))
+                return self.lock.__enter__()
+
+            def __exit__(self, *exc):
+                return self.lock.__exit__(*exc)
+
+        generate._lock = Interleaved(generate._lock)
+        stale = generate(lambda: 101_000_000)
+        following = generate(lambda: 101_000_000)
+
+        assert newer[0] < stale < following
+        assert following[4:16] == f"{102:012x}"
+
+    def test_different_nodes_do_not_collide(self):
+        """Test: gleiche Sequenz, unterschiedliche Knoten"""
+        assert IdGenerator(node_id=1)()[12:] != IdGenerator(node_id=2)()[12:]
+
+    def test_node_id_from_environment(self, monkeypatch):
+        """Test: Knoten-ID aus LAGER_NODE_ID"""
+        monkeypatch.setenv(ids.NODE_ID_ENV, "0x2a")
+        assert IdGenerator().node_id == 42
+
+    def test_invalid_node_id(self):
+        """Test: Knoten-ID außerhalb von 24 Bit"""
+        with pytest.raises(ValueError):
+            IdGenerator(node_id=1 << 24)
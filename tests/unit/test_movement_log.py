@@ -0,0 +1,147 @@
+"""Unit Tests - mmap Movement-Log"""
+
+from datetime import datetime
+
+import pytest
+
+from src.adapters.movement_log import FIELDS, QUANTITY, RECORD_SIZE, MovementLogRepository
+from src.adapters.repository import RepositoryFactory
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+def _movement(i: int, product_id: str = "P1", day: int = 1) -> Movement:
+    return Movement(
+        id=f"mov_{i}",
+        product_id=product_id,
+        product_name="Öl",
+        quantity_change=i,
+        movement_type="IN",
+        reason=None if i % 2 else f"Lieferung {i}",
+        timestamp=datetime(2026, 1, day, 8, 0, i % 60),
+    )
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "bewegungen.log"
+
+
+class TestMovementLog:
+    def test_movements_survive_reopen(self, log_path):
+        repo = MovementLogRepository(log_path)
+        repo.save_movements(_movement(i, product_id=f"P{i % 3}") for i in range(30))
+        repo.close()
+
+        reopened = MovementLogRepository(log_path)
+        movements = reopened.load_movements()
+
+        assert [m.id for m in movements] == [f"mov_{i}" for i in range(30)]
+        assert movements[1].reason is None and movements[2].reason == "Lieferung 2"
+        assert len(reopened.query_movements(product_id="P1")) == 10
+        # Wiederkehrende Strings teilen sich ein Objekt
+        assert movements[0].movement_type is movements[1].movement_type
+        reopened.close()
+
+    def test_time_range_is_zero_copy_slice(self, log_path):
+        repo = MovementLogRepository(log_path)
+        repo.save_movements(_movement(i, day=1 + i // 10) for i in range(40))
+
+        lo, hi = repo.log.time_range(datetime(2026, 1, 2), datetime(2026, 1, 4))
+        records = repo.log.slice(lo, hi)
+
+        assert isinstance(records, memoryview)
+        assert (lo, hi) == (10, 30)
+        assert sum(records[QUANTITY::FIELDS]) == sum(range(10, 30))
+        repo.close()
+
+    def test_out_of_order_appends_are_sorted_on_query(self, log_path):
+        repo = MovementLogRepository(log_path)
+        repo.save_movement(_movement(1, day=5))
+        repo.save_movement(_movement(2, day=3))
+
+        assert not repo.log.time_ordered
+        assert [m.id for m in repo.query_movements()] == ["mov_2", "mov_1"]
+        assert [m.id for m in repo.query_movements(since=datetime(2026, 1, 4))] == ["mov_1"]
+        repo.close()
+        assert not MovementLogRepository(log_path).log.time_ordered
+
+    def test_torn_record_is_discarded_on_open(self, log_path):
+        repo = MovementLogRepository(log_path)
+        repo.save_movements(_movement(i) for i in range(3))
+        repo.close()
+        with open(log_path, "ab") as f:
+            f.write(b"\x01" * (RECORD_SIZE // 2))
+
+        reopened = MovementLogRepository(log_path)
+        assert len(reopened.load_movements()) == 3
+        reopened.save_movement(_movement(3))
+        assert [m.id for m in reopened.load_movements()][-1] == "mov_3"
+        reopened.close()
+
+    def test_factory_keeps_products_in_sqlite(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+        db_path = str(tmp_path / "lager.db")
+        repo = RepositoryFactory.create_repository("movement-log", db_path=db_path)
+        repo.save_product(Product(id="P1", name="Öl", description="", price=5.0, sku="S1"))
+        repo.apply_stock_change("P1", 4, _movement(4))
+        repo.close()
+
+        reopened = RepositoryFactory.create_repository("movement-log", db_path=db_path)
+        assert reopened.load_product("P1").quantity == 4
+        assert [m.id for m in reopened.load_movements()] == ["mov_4"]
+        reopened.close()
+
+
+class TestStockChange:
+    def test_stock_change_uses_conditional_update_of_product_store(self, tmp_path, monkeypatch):
+        pytest.importorskip("sqlalchemy")
+        db_path = str(tmp_path / "lager.db")
+        products = RepositoryFactory.create_repository("sqlite", db_path=db_path)
+        # Zweiter Prozess: eigene Verbindung auf dieselbe Datenbank
+        other = RepositoryFactory.create_repository("sqlite", db_path=db_path)
+        products.save_product(Product(id="P1", name="Öl", description="", price=4.0, quantity=10))
+        repo = MovementLogRepository(tmp_path / "bewegungen.log", products)
+        load_product = products.load_product
+
+        def load_then_scan(product_id):
+            product = load_product(product_id)
+            other.apply_stock_change(product_id, -3)
+            return product
+
+        monkeypatch.setattr(products, "load_product", load_then_scan)
+        movement = Movement("mov_1", "P1", "", -2, "OUT")
+        assert repo.apply_stock_change("P1", -2, movement) == 8
+        monkeypatch.undo()
+
+        assert other.load_product("P1").quantity == 5
+        assert movement.product_name == "Öl"
+        with pytest.raises(ValueError, match="Unzureichender Bestand"):
+            repo.apply_stock_change("P1", -6, Movement("mov_2", "P1", "", -6, "OUT"))
+        assert [m.id for m in repo.load_movements()] == ["mov_1"]
+        other.close()
+        repo.close()
+
+    def test_appends_are_synced_every_n_writes(self, log_path, monkeypatch):
+        repo = MovementLogRepository(log_path, sync_every=3)
+        syncs = []
+        monkeypatch.setattr(repo.log, "sync", lambda: syncs.append(len(repo.log)))
+
+        for i in range(7):
+            repo.save_movement(_movement(i))
+        assert syncs == [3, 6]
+
+        repo.close()
+        assert syncs == [3, 6, 7]
+
+    def test_every_append_is_synced_by_default(self, log_path, monkeypatch):
+        repo = MovementLogRepository(log_path)
+        repo.save_product(Product(id="P1", name="Öl", description="", price=4.0, quantity=1))
+        syncs = []
+        monkeypatch.setattr(repo.log, "sync", lambda: syncs.append(len(repo.log)))
+
+        repo.apply_stock_change("P1", 1, _movement(1))
+        repo.save_movements(_movement(i) for i in range(2, 5))
+
+        assert syncs == [1, 4]
+        repo.close()
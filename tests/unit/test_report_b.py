@@ -1,6 +1,7 @@
-from datetime import datetime
+import io
+from datetime import datetime, timedelta
 
-from src.adapters.report import ConsoleReportAdapter
+from src.adapters.report import ConsoleReportAdapter, iter_movement_report
 from src.domain.warehouse import Movement
 
 
@@ -69,4 +70,43 @@ def test_movement_report_sorted_and_totals():
     assert "Summe OUT: 2" in out
 
     # Netto-Bestand sollte 5 - 2 = 3 sein
-    assert "Netto: 3" in out
\ No newline at end of file
+    assert "Netto: 3" in out
+
+
+def _movements(count):
+    start = datetime(2026, 1, 1)
+    return [
+        Movement(
+            id=f"mov_{i:06d}",
+            product_id=f"P{i % 7}",
+            product_name="A",
+            quantity_change=(i % 5) - 2,
+            movement_type="IN" if i % 5 > 2 else "OUT",
+            reason="Test",
+            performed_by="max",
+            timestamp=start + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def test_movement_report_stream_matches_text():
+    """write_movement_report schreibt denselben Text wie generate_movement_report"""
+    r = ConsoleReportAdapter(products={}, movements=_movements(2500))
+
+    buffer = io.StringIO()
+    lines = r.write_movement_report(buffer)
+
+    assert buffer.getvalue() == r.generate_movement_report()
+    # Kopf (5) + Bewegungen + Fuß (4)
+    assert lines == 2500 + 9
+    assert "Gesamtbewegungen: 2500" in buffer.getvalue()
+
+
+def test_movement_report_lines_from_generator():
+    """iter_movement_report verarbeitet einen Generator in einem Durchlauf"""
+    movements = _movements(10)
+    lines = list(iter_movement_report(m for m in movements))
+
+    assert lines[-3] == "Summe IN: 6 | Summe OUT: 6 | Netto: 0\n"
+    assert list(iter_movement_report(iter(()))) == ["Keine Lagerbewegungen vorhanden.\n"]
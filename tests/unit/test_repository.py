@@ -0,0 +1,912 @@
+"""Unit Tests - Repository-Adapter (In-Memory, JSON, SQLite)"""
+
+import json
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from src.adapters.movement_log import MovementLogRepository
+from src.adapters.repository import InMemoryRepository, JsonRepository, RepositoryFactory
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+def _product(i: int, quantity: int = 5) -> Product:
+    return Product(
+        id=f"P{i:05d}",
+        name=f"Artikel {i}",
+        description="",
+        price=2.5,
+        quantity=quantity,
+        sku=f"SKU-{i:05d}",
+    )
+
+
+def _movement(i: int, product_id: str = "P00000", change: int = 1) -> Movement:
+    return Movement(
+        id=f"mov_{i}",
+        product_id=product_id,
+        product_name="",
+        quantity_change=change,
+        movement_type="IN" if change > 0 else "OUT",
+        timestamp=datetime(2026, 1, 1, 8, 0, i % 60),
+    )
+
+
+@pytest.fixture
+def sqlite_repo(tmp_path):
+    """SQLite Repository in temporärer Datei"""
+    pytest.importorskip("sqlalchemy")
+    repo = RepositoryFactory.create_repository("sqlite", db_path=str(tmp_path / "test.db"))
+    yield repo
+    repo.close()
+
+
+@pytest.fixture(params=["memory", "json", "movement-log", "sqlite"])
+def repo(request, tmp_path):
+    """Alle Repository-Implementierungen mit leerem Datenbestand"""
+    if request.param == "memory":
+        yield InMemoryRepository()
+    elif request.param == "json":
+        yield JsonRepository(str(tmp_path / "leer.json"))
+    elif request.param == "movement-log":
+        repo = MovementLogRepository(tmp_path / "bewegungen.log")
+        yield repo
+        repo.close()
+    else:
+        yield request.getfixturevalue("sqlite_repo")
+
+
+class TestBulkWrites:
+    """Tests für save_products / save_movements"""
+
+    def test_save_products_inserts_all(self, repo):
+        repo.save_products(_product(i) for i in range(2500))
+
+        products = repo.load_all_products()
+        assert len(products) == 2500
+        assert products["P01234"].name == "Artikel 1234"
+
+    def test_save_products_updates_existing(self, repo):
+        repo.save_product(_product(1, quantity=5))
+        repo.save_products([_product(1, quantity=9), _product(2)])
+
+        assert repo.load_product("P00001").quantity == 9
+        assert len(repo.load_all_products()) == 2
+
+    def test_save_movements_inserts_all(self, repo):
+        repo.save_product(_product(0))
+        repo.save_movements(_movement(i) for i in range(1200))
+
+        assert len(repo.load_movements()) == 1200
+
+    def test_save_movements_is_atomic(self, sqlite_repo):
+        sqlite_repo.save_product(_product(0))
+        # Doppelte ID in der zweiten Hälfte -> gesamte Transaktion wird verworfen
+        movements = [_movement(i) for i in range(10)] + [_movement(3)]
+
+        with pytest.raises(Exception):
+            sqlite_repo.save_movements(movements)
+        assert list(sqlite_repo.load_movements()) == []
+
+
+class TestReadViews:
+    """Tests für die Copy-on-write Snapshots des In-Memory Repositorys"""
+
+    def test_repeated_reads_share_snapshot(self):
+        repo = InMemoryRepository()
+        repo.save_products(_product(i) for i in range(3))
+        repo.save_movement(_movement(1))
+
+        assert repo.load_all_products() is repo.load_all_products()
+        assert repo.load_movements() is repo.load_movements()
+
+    def test_snapshots_are_read_only(self):
+        repo = InMemoryRepository()
+        repo.save_product(_product(0))
+
+        with pytest.raises(TypeError):
+            repo.load_all_products()["P00001"] = _product(1)
+        assert isinstance(repo.load_movements(), tuple)
+
+    def test_write_invalidates_snapshot(self):
+        repo = InMemoryRepository()
+        repo.save_product(_product(0, quantity=5))
+        products = repo.load_all_products()
+        movements = repo.load_movements()
+
+        repo.save_product(_product(1))
+        repo.apply_stock_change("P00000", 1, _movement(1))
+        repo.delete_product("P00001")
+
+        assert list(products) == ["P00000"]
+        assert movements == ()
+        assert list(repo.load_all_products()) == ["P00000"]
+        assert [m.id for m in repo.load_movements()] == ["mov_1"]
+        assert repo.load_all_products() is not products
+
+
+class TestJsonJournal:
+    """Tests für das Schreib-Journal des JsonRepository"""
+
+    @staticmethod
+    def _document(tmp_path):
+        path = tmp_path / "lager.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "warehouse": {"name": "Testlager"},
+                    "products": [
+                        {"product_id": "P00000", "name": "Artikel 0", "price": 2.5,
+                         "quantity": 5, "sku": "SKU-00000", "brand": "ATE", "location": "A1"}
+                    ],
+                    "movements": [],
+                }
+            ),
+            encoding="utf-8",
+        )
+        return path
+
+    def test_writes_are_replayed_after_restart(self, tmp_path):
+        path = self._document(tmp_path)
+        repo = JsonRepository(str(path))
+        repo.save_product(_product(1))
+        repo.apply_stock_change("P00000", -2, _movement(1, change=-2))
+        repo.delete_product("P00001")
+        repo.close()
+
+        reopened = JsonRepository(str(path))
+
+        assert list(reopened.load_all_products()) == ["P00000"]
+        assert reopened.load_product("P00000").quantity == 3
+        assert [m.id for m in reopened.load_movements()] == ["mov_1"]
+        assert len(path.with_name("lager.json.journal").read_text().splitlines()) == 3
+
+    def test_stock_change_without_movement_is_replayed(self, tmp_path):
+        path = self._document(tmp_path)
+        repo = JsonRepository(str(path))
+        repo.apply_stock_change("P00000", 3)
+        repo.close()
+
+        reopened = JsonRepository(str(path))
+
+        assert reopened.load_product("P00000").quantity == 8
+        assert list(reopened.load_movements()) == []
+
+    def test_compaction_rewrites_document_and_keeps_extra_fields(self, tmp_path):
+        path = self._document(tmp_path)
+        repo = JsonRepository(str(path), compact_after=3)
+        repo.save_movements(_movement(i) for i in range(3))
+
+        document = json.loads(path.read_text(encoding="utf-8"))
+        assert not path.with_name("lager.json.journal").exists()
+        assert document["warehouse"] == {"name": "Testlager"}
+        assert document["products"][0]["brand"] == "ATE"
+        assert len(document["movements"]) == 3
+        assert len(JsonRepository(str(path)).load_movements()) == 3
+
+    def test_replay_is_idempotent_after_interrupted_compaction(self, tmp_path):
+        path = self._document(tmp_path)
+        repo = JsonRepository(str(path), compact_after=None)
+        repo.save_movement(_movement(1))
+        repo.sync()
+        journal = path.with_name("lager.json.journal").read_text(encoding="utf-8")
+        repo.compact()
+        # Absturz nach os.replace, aber vor dem Leeren des Journals
+        path.with_name("lager.json.journal").write_text(journal + '{"op": "prod', encoding="utf-8")
+
+        reopened = JsonRepository(str(path))
+
+        assert [m.id for m in reopened.load_movements()] == ["mov_1"]
+
+    def test_persist_disabled_writes_nothing(self, tmp_path):
+        path = self._document(tmp_path)
+        repo = JsonRepository(str(path), persist=False)
+        repo.save_product(_product(1))
+        repo.compact()
+
+        assert not path.with_name("lager.json.journal").exists()
+        assert len(JsonRepository(str(path)).load_all_products()) == 1
+
+
+class TestJsonLazyLoading:
+    """Tests für den Lazy-Modus des JsonRepository (Byte-Offset-Index)"""
+
+    TESTDATA = Path(__file__).parent.parent.parent / "data" / "testdata.json"
+
+    @pytest.fixture
+    def export(self, tmp_path):
+        path = tmp_path / "export.json"
+        path.write_bytes(self.TESTDATA.read_bytes())
+        return path
+
+    def test_lazy_matches_eager(self, export):
+        eager = JsonRepository(str(export), persist=False)
+        lazy = JsonRepository(str(export), persist=False, lazy=True)
+
+        def fields(products):
+            return {
+                pid: (p.name, p.description, p.price, p.quantity, p.category, p.sku)
+                for pid, p in products.items()
+            }
+
+        assert fields(lazy.load_all_products()) == fields(eager.load_all_products())
+        assert list(lazy.load_movements()) == list(eager.load_movements())
+
+    def test_entries_are_parsed_on_first_access(self, export):
+        repo = JsonRepository(str(export), persist=False, lazy=True)
+        assert repo.products == {} and repo.movements == []
+
+        assert repo.load_product("OEL-001").name == "Motoröl 5W-30 Castrol Edge"
+        assert list(repo.products) == ["OEL-001"]
+        assert repo.movements == []
+
+        assert repo.query_movements(product_id="OEL-001")
+        assert len(repo.load_all_products()) == 22
+
+    def test_index_file_is_reused(self, export, monkeypatch):
+        from src.adapters import json_index
+
+        JsonRepository(str(export), persist=False, lazy=True)
+        assert json_index.index_path(export).exists()
+
+        def _no_scan(buffer):
+            raise AssertionError("Index hätte wiederverwendet werden müssen")
+
+        monkeypatch.setattr(json_index, "scan", _no_scan)
+        assert len(JsonRepository(str(export), lazy=True).load_all_products()) == 22
+
+    def test_journal_and_compaction_in_lazy_mode(self, export):
+        repo = JsonRepository(str(export), lazy=True)
+        repo.apply_stock_change("OEL-001", -5, _movement(1, product_id="OEL-001", change=-5))
+        repo.close()
+
+        reopened = JsonRepository(str(export), lazy=True)
+        assert reopened.load_product("OEL-001").quantity == 30
+        reopened.compact()
+
+        document = json.loads(export.read_text(encoding="utf-8"))
+        oil = next(p for p in document["products"] if p["product_id"] == "OEL-001")
+        assert oil["quantity"] == 30 and oil["brand"] == "Castrol"
+        assert len(document["movements"]) == 7
+
+    def test_scan_handles_nested_values_and_escapes(self):
+        from src.adapters import json_index
+
+        raw = (
+            b'{"meta": {"tags": ["a", "]"]}, "products": [{"product_id": "A\\"1", '
+            b'"dims": [1, 2], "name": "x{"}], "movements": []}'
+        )
+        index = json_index.scan(raw)
+
+        assert index.document == {"meta": {"tags": ["a", "]"]}}
+        start, end = index.products['A"1']
+        assert json.loads(raw[start:end])["dims"] == [1, 2]
+
+
+class TestStreamingIterators:
+    """Tests für iter_products / iter_movements"""
+
+    def test_iter_products_sorted_by_id(self, repo):
+        repo.save_products(_product(i) for i in reversed(range(25)))
+
+        ids = [p.id for p in repo.iter_products(batch_size=4)]
+
+        assert ids == sorted(ids)
+        assert len(ids) == 25
+
+    def test_iter_movements_ordered_by_time(self, repo):
+        repo.save_product(_product(0))
+        repo.save_movements(_movement(i) for i in reversed(range(90)))
+
+        streamed = list(repo.iter_movements(batch_size=7))
+        unordered = list(repo.iter_movements(order_by_time=False))
+
+        keys = [(m.timestamp, m.id) for m in streamed]
+        assert keys == sorted(keys)
+        assert {m.id for m in unordered} == {m.id for m in streamed}
+        assert len(unordered) == 90
+
+    def test_iter_products_is_lazy(self, sqlite_repo):
+        sqlite_repo.save_products(_product(i) for i in range(50))
+
+        stream = sqlite_repo.iter_products(batch_size=10)
+        first = next(stream)
+        stream.close()
+
+        assert first.id == "P00000"
+
+
+class TestApplyStockChange:
+    """Tests für die atomare Bestandsänderung"""
+
+    def test_apply_stock_change_updates_quantity_and_records_movement(self, repo):
+        repo.save_product(_product(0, quantity=5))
+
+        new_quantity = repo.apply_stock_change("P00000", -3, _movement(1, change=-3))
+
+        assert new_quantity == 2
+        assert repo.load_product("P00000").quantity == 2
+        movements = repo.load_movements()
+        assert len(movements) == 1
+        assert movements[0].product_name == "Artikel 0"
+
+    def test_apply_stock_change_rejects_negative_stock(self, repo):
+        repo.save_product(_product(0, quantity=2))
+
+        with pytest.raises(ValueError, match="Unzureichender Bestand"):
+            repo.apply_stock_change("P00000", -3, _movement(1, change=-3))
+        assert repo.load_product("P00000").quantity == 2
+        assert list(repo.load_movements()) == []
+
+    def test_apply_stock_change_without_movement(self, repo):
+        repo.save_product(_product(0, quantity=5))
+
+        assert repo.apply_stock_change("P00000", 4) == 9
+        assert repo.load_product("P00000").quantity == 9
+        assert list(repo.load_movements()) == []
+
+    def test_apply_stock_change_unknown_product(self, repo):
+        with pytest.raises(ValueError, match="nicht gefunden"):
+            repo.apply_stock_change("FEHLT", 1, _movement(1, product_id="FEHLT"))
+
+    def test_apply_stock_change_concurrent_tills(self, sqlite_repo):
+        sqlite_repo.save_product(_product(0, quantity=50))
+        failures = []
+
+        def till(worker: int):
+            for i in range(20):
+                try:
+                    sqlite_repo.apply_stock_change(
+                        "P00000", -1, _movement(worker * 100 + i, change=-1)
+                    )
+                except ValueError:
+                    failures.append(worker)
+
+        threads = [threading.Thread(target=till, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 80 Entnahmeversuche bei Bestand 50: genau 50 erfolgreich, keine verlorenen Updates
+        assert sqlite_repo.load_product("P00000").quantity == 0
+        assert len(sqlite_repo.load_movements()) == 50
+        assert len(failures) == 30
+
+
+class TestUpdateProduct:
+    """Tests für update_product (Stammdaten + Bestandsdelta)"""
+
+    def test_keeps_stock_change_after_load(self, repo):
+        repo.save_product(_product(0, quantity=5))
+        product = repo.load_product("P00000")
+        # Kassen-Scan zwischen Laden und Speichern
+        repo.apply_stock_change("P00000", -2, _movement(1, change=-2))
+
+        product.name = "Neu"
+        assert repo.update_product(product) == 3
+
+        reloaded = repo.load_product("P00000")
+        assert (reloaded.name, reloaded.quantity) == ("Neu", 3)
+
+    def test_delta_and_movement(self, repo):
+        repo.save_product(_product(0, quantity=5))
+        product = repo.load_product("P00000")
+        repo.apply_stock_change("P00000", -2, _movement(1, change=-2))
+
+        assert repo.update_product(product, 4, _movement(2, change=4)) == 7
+        assert product.quantity == 7
+        assert repo.load_product("P00000").quantity == 7
+        assert len(repo.load_movements()) == 2
+
+    def test_rejects_negative_stock_without_changes(self, repo):
+        repo.save_product(_product(0, quantity=2))
+        product = repo.load_product("P00000")
+        product.name = "Neu"
+
+        with pytest.raises(ValueError, match="Unzureichender Bestand"):
+            repo.update_product(product, -3, _movement(1, change=-3))
+
+        assert repo.load_product("P00000").quantity == 2
+        assert list(repo.load_movements()) == []
+
+    def test_unknown_product(self, repo):
+        with pytest.raises(ValueError, match="nicht gefunden"):
+            repo.update_product(_product(9))
+
+
+class TestSqliteQueryCount:
+    """Lesepfade von SqliteRepository dürfen keine Lazy-Loads pro Zeile auslösen"""
+
+    @staticmethod
+    def _fill(repo, count: int) -> None:
+        from src.adapters.models import CategoryORM, ProductORM
+
+        session = repo.SessionLocal()
+        session.add(CategoryORM(id="CAT001", name="Reifen"))
+        session.commit()
+        session.close()
+
+        repo.save_products(_product(i) for i in range(count))
+        repo.save_movements(_movement(i, product_id=f"P{i:05d}") for i in range(count))
+
+        session = repo.SessionLocal()
+        session.query(ProductORM).update({ProductORM.category_id: "CAT001"})
+        session.commit()
+        session.close()
+
+    @staticmethod
+    def _count_queries(repo, action) -> int:
+        from sqlalchemy import event
+
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(repo.engine, "before_cursor_execute", on_execute)
+        try:
+            action()
+        finally:
+            event.remove(repo.engine, "before_cursor_execute", on_execute)
+        return len(statements)
+
+    @pytest.mark.parametrize("count", [1, 50])
+    def test_load_all_products_constant_queries(self, sqlite_repo, count):
+        self._fill(sqlite_repo, count)
+
+        queries = self._count_queries(sqlite_repo, sqlite_repo.load_all_products)
+
+        assert queries == 1
+        assert sqlite_repo.load_all_products()["P00000"].category == "Reifen"
+
+    @pytest.mark.parametrize("count", [1, 50])
+    def test_load_movements_constant_queries(self, sqlite_repo, count):
+        self._fill(sqlite_repo, count)
+
+        queries = self._count_queries(sqlite_repo, sqlite_repo.load_movements)
+
+        assert queries == 1
+        assert {m.product_name for m in sqlite_repo.load_movements()} >= {"Artikel 0"}
+
+
+class TestQueryMovements:
+    """Tests für gefilterte, keyset-paginierte Bewegungsabfragen"""
+
+    @staticmethod
+    def _fill(repo) -> None:
+        repo.save_products([_product(0), _product(1)])
+        movements = []
+        for i in range(30):
+            movement = _movement(i, product_id=f"P{i % 2:05d}", change=1 if i % 3 else -1)
+            movement.timestamp = datetime(2026, 1, 1 + i % 10, 12, 0)
+            movement.performed_by = "anna" if i % 5 == 0 else "max"
+            movements.append(movement)
+        repo.save_movements(reversed(movements))
+
+    def test_query_movements_sorted_by_time_and_id(self, repo):
+        self._fill(repo)
+
+        result = repo.query_movements()
+
+        keys = [(m.timestamp, m.id) for m in result]
+        assert len(result) == 30
+        assert keys == sorted(keys)
+
+    def test_query_movements_filters(self, repo):
+        self._fill(repo)
+
+        result = repo.query_movements(
+            product_id="P00000",
+            movement_type="OUT",
+            since=datetime(2026, 1, 2),
+            until=datetime(2026, 1, 9),
+        )
+
+        assert result
+        for m in result:
+            assert m.product_id == "P00000"
+            assert m.movement_type == "OUT"
+            assert datetime(2026, 1, 2) <= m.timestamp < datetime(2026, 1, 9)
+        assert {m.performed_by for m in repo.query_movements(performed_by="anna")} == {"anna"}
+
+    def test_query_movements_keyset_pagination(self, repo):
+        self._fill(repo)
+        expected = [m.id for m in repo.query_movements()]
+
+        pages = []
+        cursor = None
+        while True:
+            page = repo.query_movements(after_cursor=cursor, limit=7)
+            if not page:
+                break
+            pages.append([m.id for m in page])
+            cursor = (page[-1].timestamp, page[-1].id)
+
+        assert [len(p) for p in pages] == [7, 7, 7, 7, 2]
+        assert [mid for page in pages for mid in page] == expected
+
+
+class TestSearchProducts:
+    """Tests für die Produktsuche im Repository"""
+
+    @staticmethod
+    def _fill(repo) -> None:
+        products = []
+        for i, (name, category) in enumerate(
+            [
+                ("Batterie 12V 70Ah", "Batterien"),
+                ("Batterie 12V 95Ah", "Batterien"),
+                ("Bremsbeläge vorne", "Bremsen"),
+                ("Starthilfekabel 100%", "Licht & Elektrik"),
+                ("Reifen 18 Zoll", "Reifen"),
+            ]
+        ):
+            product = _product(i)
+            product.name = name
+            product.category = category
+            products.append(product)
+        repo.save_products(products)
+
+    def test_search_by_text_and_category(self, repo):
+        self._fill(repo)
+
+        assert list(repo.search_products("batt")) == ["P00000", "P00001"]
+        assert list(repo.search_products("BREMS", "Bremsen")) == ["P00002"]
+        assert list(repo.search_products("", "Reifen")) == ["P00004"]
+        assert repo.search_products("batt", "Reifen") == {}
+
+    def test_search_matches_product_id_and_escapes_like(self, repo):
+        self._fill(repo)
+
+        assert list(repo.search_products("p00003")) == ["P00003"]
+        assert list(repo.search_products("100%")) == ["P00003"]
+        assert repo.search_products("12_") == {}
+
+    def test_search_limit_and_offset(self, repo):
+        self._fill(repo)
+
+        assert list(repo.search_products(limit=2)) == ["P00000", "P00001"]
+        assert list(repo.search_products(limit=2, offset=3)) == ["P00003", "P00004"]
+
+    def test_search_returns_category(self, repo):
+        self._fill(repo)
+
+        assert repo.search_products("reifen")["P00004"].category == "Reifen"
+        assert repo.load_product("P00002").category == "Bremsen"
+
+    def test_search_follows_writes(self, repo):
+        self._fill(repo)
+        assert list(repo.search_products("batt")) == ["P00000", "P00001"]
+
+        renamed = _product(0)
+        renamed.name, renamed.category = "Scheinwerfer H7", "Licht & Elektrik"
+        repo.save_product(renamed)
+        repo.delete_product("P00001")
+        moved = repo.load_product("P00002")
+        moved.category = "Reifen"
+        repo.update_product(moved)
+
+        assert repo.search_products("batt") == {}
+        assert list(repo.search_products("h7", "Licht & Elektrik")) == ["P00000"]
+        assert list(repo.search_products("", "Reifen")) == ["P00002", "P00004"]
+        assert repo.search_products("", "Bremsen") == {}
+
+    def test_search_short_text(self, repo):
+        self._fill(repo)
+
+        assert list(repo.search_products("v")) == ["P00000", "P00001", "P00002"]
+        assert list(repo.search_products("5a")) == ["P00001"]
+        assert list(repo.search_products("%")) == ["P00003"]
+
+    def test_sqlite_search_uses_trigram_index(self, sqlite_repo):
+        from sqlalchemy import text
+
+        self._fill(sqlite_repo)
+        renamed = _product(4)
+        renamed.name = "Winterreifen 17 Zoll"
+        sqlite_repo.save_product(renamed)
+        sqlite_repo.delete_product("P00002")
+
+        assert sqlite_repo.search_index_available
+        with sqlite_repo.engine.connect() as conn:
+            indexed = conn.execute(text(
+                "SELECT p.id FROM products_search"
+                " JOIN products p ON p.rowid = products_search.rowid"
+                " WHERE products_search MATCH '\"winter\" OR \"brems\"'"
+            )).scalars().all()
+        assert indexed == ["P00004"]
+        assert list(sqlite_repo.search_products("winter")) == ["P00004"]
+
+
+class TestFullTextSearch:
+    """Tests für die rangierte Präfix-Volltextsuche"""
+
+    @staticmethod
+    def _fill(repo) -> None:
+        data = [
+            ("Motoröl 5W-30 Castrol Edge", "Vollsynthetisch, 5 Liter", "CAST-EDGE-5W30-5L"),
+            ("Motoröl 10W-40 Liqui Moly", "Teilsynthetisch", "LIQ-10W40-5L"),
+            ("Glühlampe H7 Osram", "Halogen 12V 55W", "OSR-H7-55W"),
+            ("Glühlampe H4 Philips", "Halogen 12V 60/55W", "PHI-H4"),
+            ("Scheibenwischer Bosch", "Passend für Castrol-Werbefahrzeuge", "BOS-WIPER"),
+        ]
+        products = []
+        for i, (name, description, sku) in enumerate(data):
+            product = _product(i)
+            product.name, product.description, product.sku = name, description, sku
+            products.append(product)
+        repo.save_products(products)
+
+    def test_prefix_search_across_fields(self, repo):
+        self._fill(repo)
+
+        assert [p.id for p in repo.full_text_search("5w30 castrol")] == ["P00000"]
+        assert [p.id for p in repo.full_text_search("H7 55W")] == ["P00002"]
+        assert sorted(p.id for p in repo.full_text_search("motoröl")) == ["P00000", "P00001"]
+        assert [p.id for p in repo.full_text_search("OEL MOTOR")] == []
+
+    def test_ranking_prefers_name_over_description(self, repo):
+        self._fill(repo)
+
+        result = [p.id for p in repo.full_text_search("castrol")]
+
+        assert result == ["P00000", "P00004"]
+        assert len(repo.full_text_search("castrol", limit=1)) == 1
+
+    def test_index_follows_updates_and_deletes(self, repo):
+        self._fill(repo)
+        product = repo.load_product("P00003")
+        product.name = "Glühlampe H7 Philips"
+        repo.save_product(product)
+        repo.delete_product("P00002")
+
+        assert [p.id for p in repo.full_text_search("h7")] == ["P00003"]
+        assert repo.full_text_search("") == []
+
+
+class TestSqliteProfiles:
+    """Tests für die SQLite Performance-Profile"""
+
+    def test_profile_pragmas_applied(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+        from sqlalchemy import text
+
+        repo = RepositoryFactory.create_repository(
+            "sqlite", db_path=str(tmp_path / "wal.db"), profile="balanced"
+        )
+        try:
+            with repo.engine.connect() as conn:
+                assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+                assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+                assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        finally:
+            repo.close()
+
+    def test_unknown_profile_rejected(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+
+        with pytest.raises(ValueError, match="Unbekanntes SQLite-Profil"):
+            RepositoryFactory.create_repository(
+                "sqlite", db_path=str(tmp_path / "x.db"), profile="turbo"
+            )
+        with pytest.raises(ValueError, match="Nicht unterstützte PRAGMAs"):
+            RepositoryFactory.create_repository(
+                "sqlite", db_path=str(tmp_path / "x.db"), profile={"writable_schema": 1}
+            )
+
+
+class TestInventorySnapshots:
+    """Tests für save_inventory_snapshot / load_inventory_snapshot"""
+
+    @staticmethod
+    def _fill(repo):
+        product = _product(1, quantity=10)
+        product.created_at = datetime(2025, 12, 1)
+        later = _product(2, quantity=4)
+        later.created_at = datetime(2026, 1, 5)
+        repo.save_products([product, later])
+        repo.save_movements([
+            Movement("mov_1", "P00001", "", 5, "IN", timestamp=datetime(2026, 1, 1, 9)),
+            Movement("mov_2", "P00001", "", -3, "OUT", timestamp=datetime(2026, 1, 2, 9)),
+            Movement("mov_3", "P00001", "", 8, "IN", timestamp=datetime(2026, 1, 3, 9)),
+            Movement("mov_4", "P00002", "", 4, "IN", timestamp=datetime(2026, 1, 5, 9)),
+        ])
+
+    def test_snapshot_is_end_of_day_stock(self, repo):
+        self._fill(repo)
+
+        assert repo.save_inventory_snapshot(date(2026, 1, 1)) == 1
+        assert repo.save_inventory_snapshot(date(2026, 1, 2)) == 1
+
+        assert repo.load_inventory_snapshot(date(2026, 1, 1)) == (
+            date(2026, 1, 1), {"P00001": 5}
+        )
+        assert repo.load_inventory_snapshot(date(2026, 1, 20), "P00001") == (
+            date(2026, 1, 2), {"P00001": 2}
+        )
+        assert repo.load_inventory_snapshot(date(2025, 12, 31)) == (None, {})
+        assert repo.load_inventory_snapshot(date(2026, 1, 20), "P00002") == (None, {})
+
+    def test_rerun_replaces_day(self, repo):
+        self._fill(repo)
+        repo.save_inventory_snapshot(date(2026, 1, 6))
+        repo.apply_stock_change(
+            "P00002", -1,
+            Movement("mov_5", "P00002", "", -1, "OUT", timestamp=datetime(2026, 1, 6, 9)),
+        )
+
+        assert repo.save_inventory_snapshot(date(2026, 1, 6)) == 2
+        assert repo.load_inventory_snapshot(date(2026, 1, 6)) == (
+            date(2026, 1, 6), {"P00001": 10, "P00002": 3}
+        )
+
+    def test_json_snapshots_survive_reopen_and_compaction(self, tmp_path):
+        path = tmp_path / "lager.json"
+        repo = JsonRepository(str(path))
+        self._fill(repo)
+        repo.save_inventory_snapshot(date(2026, 1, 1))
+        repo.close()
+
+        reopened = JsonRepository(str(path))
+        assert reopened.load_inventory_snapshot(date(2026, 1, 1)) == (
+            date(2026, 1, 1), {"P00001": 5}
+        )
+        reopened.compact()
+        reopened.close()
+
+        assert json.loads(path.read_text())["inventory_snapshots"] == {
+            "2026-01-01": {"P00001": 5}
+        }
+        for lazy in (False, True):
+            compacted = JsonRepository(str(path), lazy=lazy)
+            assert compacted.load_inventory_snapshot(date(2026, 1, 3))[1] == {"P00001": 5}
+            compacted.close()
+
+    def test_movement_log_snapshots_survive_reopen(self, tmp_path):
+        repo = MovementLogRepository(tmp_path / "bewegungen.log")
+        self._fill(repo)
+        repo.save_inventory_snapshot(date(2026, 1, 2))
+        repo.close()
+
+        reopened = MovementLogRepository(tmp_path / "bewegungen.log")
+        try:
+            assert reopened.load_inventory_snapshot(date(2026, 1, 2)) == (
+                date(2026, 1, 2), {"P00001": 2}
+            )
+        finally:
+            reopened.close()
+
+
+class TestDataVersion:
+    """Tests für data_version (monotoner Datenstand)"""
+
+    def test_changes_on_every_write_only(self, repo):
+        versions = [repo.data_version()]
+        writes = [
+            lambda: repo.save_product(_product(1)),
+            lambda: repo.save_products([_product(2), _product(3)]),
+            lambda: repo.save_movement(_movement(1, "P00001")),
+            lambda: repo.save_movements([_movement(2, "P00002")]),
+            lambda: repo.apply_stock_change("P00001", 2, _movement(3, "P00001", 2)),
+            lambda: repo.delete_product("P00003"),
+            lambda: repo.save_inventory_snapshot(date.today()),
+        ]
+        for write in writes:
+            write()
+            # Lesen ändert den Datenstand nicht
+            repo.load_all_products()
+            repo.query_movements()
+            assert repo.data_version() == repo.data_version()
+            versions.append(repo.data_version())
+
+        assert versions == sorted(set(versions))
+
+    def test_failed_stock_change_keeps_version(self, repo):
+        repo.save_product(_product(1, quantity=1))
+        before = repo.data_version()
+
+        with pytest.raises(ValueError):
+            repo.apply_stock_change("P00001", -5, _movement(1, "P00001", -5))
+
+        assert repo.data_version() == before
+
+    def test_sqlite_sees_writes_of_other_connections(self, sqlite_repo):
+        before = sqlite_repo.data_version()
+        other = RepositoryFactory.create_repository("sqlite", db_path=sqlite_repo.db_path)
+        try:
+            other.save_product(_product(1))
+        finally:
+            other.close()
+
+        assert sqlite_repo.data_version() > before
+
+
+class TestSchemaVersion:
+    """Tests für die versionierte Schema-Initialisierung"""
+
+    def test_up_to_date_database_needs_single_check(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+        from sqlalchemy import create_engine, event
+        from src.adapters.models import SCHEMA_VERSION, get_schema_version, init_db
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+        init_db(engine=engine)
+        assert get_schema_version(engine) == SCHEMA_VERSION
+
+        statements = []
+        event.listen(
+            engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+        init_db(engine=engine)
+
+        assert statements == ["PRAGMA user_version"]
+        engine.dispose()
+
+    def test_repository_reopens_existing_database(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+        from src.adapters.repository import SqliteRepository
+
+        db_path = str(tmp_path / "reopen.db")
+        repo = SqliteRepository(db_path)
+        repo.save_product(_product(1))
+        repo.close()
+
+        reopened = SqliteRepository(db_path)
+        try:
+            assert reopened.load_product("P00001").name == "Artikel 1"
+            assert reopened.fts_available
+        finally:
+            reopened.close()
+
+    def test_v2_deduplicates_inventory_snapshots(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+        from sqlalchemy import create_engine, text
+        from src.adapters.models import SCHEMA_VERSION, get_schema_version, init_db
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'v1.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE inventory_snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " warehouse_id VARCHAR(50) NOT NULL, product_id VARCHAR(50) NOT NULL,"
+                " quantity INTEGER, total_value FLOAT, snapshot_date VARCHAR(10) NOT NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO inventory_snapshots"
+                " (warehouse_id, product_id, quantity, snapshot_date) VALUES"
+                " ('WH001', 'P1', 1, '2026-01-01'), ('WH001', 'P1', 2, '2026-01-01')"
+            ))
+            conn.execute(text("PRAGMA user_version = 1"))
+
+        init_db(engine=engine)
+
+        assert get_schema_version(engine) == SCHEMA_VERSION
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT quantity FROM inventory_snapshots")).all()
+        assert rows == [(2,)]
+        engine.dispose()
+
+    def test_v3_builds_search_index_for_existing_products(self, tmp_path):
+        pytest.importorskip("sqlalchemy")
+        from sqlalchemy import text
+        from src.adapters.repository import SqliteRepository
+
+        db_path = str(tmp_path / "v2.db")
+        repo = SqliteRepository(db_path)
+        repo.save_products([_product(1), _product(2)])
+        with repo.engine.begin() as conn:
+            conn.execute(text("DROP TABLE products_search"))
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(text(f"DROP TRIGGER products_search_{trigger}"))
+            conn.execute(text("PRAGMA user_version = 2"))
+        repo.close()
+
+        repo = SqliteRepository(db_path)
+        try:
+            assert repo.search_index_available
+            assert list(repo.search_products("artikel 2")) == ["P00002"]
+        finally:
+            repo.close()
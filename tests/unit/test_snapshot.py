@@ -0,0 +1,119 @@
+"""Unit Tests - Binärer Snapshot des In-Memory Repositorys"""
+
+import struct
+from datetime import date, datetime
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository, JsonRepository, RepositoryFactory
+from src.adapters.snapshot import MAGIC, SnapshotError
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+
+def _filled_repository() -> InMemoryRepository:
+    repo = InMemoryRepository()
+    repo.save_products(
+        [
+            Product(id="REI-001", name="Winterreifen", description="M+S", price=89.99,
+                    quantity=4, sku="W-1", category="Reifen",
+                    created_at=datetime(2026, 1, 2, 3, 4, 5, 678901)),
+            Product(id="ÖL-1", name="Motoröl 5W-30", description="", price=0.0,
+                    quantity=0, notes="Notiz"),
+        ]
+    )
+    repo.save_movements(
+        Movement(id=f"mov_{i}", product_id="REI-001", product_name="Winterreifen",
+                 quantity_change=i - 5, movement_type="IN" if i >= 5 else "OUT",
+                 reason=None if i % 2 else "Lieferung",
+                 timestamp=datetime(2026, 3, 1, 12, 0, i))
+        for i in range(10)
+    )
+    return repo
+
+
+class TestSnapshot:
+    def test_roundtrip_restores_full_state(self, tmp_path):
+        repo = _filled_repository()
+        path = tmp_path / "lager.snapshot"
+
+        repo.save_snapshot(path)
+        loaded = InMemoryRepository.load_snapshot(path)
+
+        assert dict(loaded.load_all_products()) == dict(repo.load_all_products())
+        assert list(loaded.load_movements()) == list(repo.load_movements())
+        assert loaded.load_product("ÖL-1").notes == "Notiz"
+        assert loaded.load_movements()[1].reason is None
+
+    def test_roundtrip_restores_inventory_snapshots(self, tmp_path):
+        repo = _filled_repository()
+        repo.save_inventory_snapshot(date(2026, 2, 28))
+        repo.save_inventory_snapshot(date(2026, 3, 1))
+        # Produkt, das nach dem Stichtag gelöscht wurde
+        repo.inventory_snapshots[date(2026, 1, 31)] = {"ALT-9": 7, "REI-001": 3}
+        path = tmp_path / "lager.snapshot"
+
+        repo.save_snapshot(path)
+        loaded = InMemoryRepository.load_snapshot(path)
+
+        assert loaded.inventory_snapshots == repo.inventory_snapshots
+        assert loaded.load_inventory_snapshot(date(2026, 2, 1), "ALT-9") == (
+            date(2026, 1, 31), {"ALT-9": 7}
+        )
+        assert loaded.load_inventory_snapshot(date(2026, 3, 2)) == (
+            date(2026, 3, 1), repo.inventory_snapshots[date(2026, 3, 1)]
+        )
+
+    def test_repeated_strings_are_shared(self, tmp_path):
+        path = tmp_path / "lager.snapshot"
+        _filled_repository().save_snapshot(path)
+
+        movements = InMemoryRepository.load_snapshot(path).load_movements()
+
+        assert movements[0].product_name is movements[9].product_name
+        assert movements[5].movement_type is movements[6].movement_type
+
+    def test_loaded_repository_is_writable(self, tmp_path):
+        path = tmp_path / "lager.snapshot"
+        _filled_repository().save_snapshot(path)
+
+        repo = RepositoryFactory.create_repository("snapshot", db_path=str(path))
+        repo.apply_stock_change("REI-001", 2, Movement(
+            id="mov_x", product_id="REI-001", product_name="", quantity_change=2,
+            movement_type="IN"))
+
+        assert repo.load_product("REI-001").quantity == 6
+        assert len(repo.load_movements()) == 11
+
+    def test_movements_are_built_on_first_query(self, tmp_path):
+        path = tmp_path / "lager.snapshot"
+        _filled_repository().save_snapshot(path)
+
+        repo = InMemoryRepository.load_snapshot(path)
+        assert repo.movements == []
+        repo.save_movement(Movement(id="mov_neu", product_id="REI-001", product_name="",
+                                    quantity_change=1, movement_type="IN"))
+
+        ids = [m.id for m in repo.load_movements()]
+        assert ids == [f"mov_{i}" for i in range(10)] + ["mov_neu"]
+
+    def test_snapshot_of_json_repository(self, tmp_path):
+        path = tmp_path / "lager.snapshot"
+        JsonRepository(persist=False, lazy=False).save_snapshot(path)
+
+        assert len(InMemoryRepository.load_snapshot(path).load_all_products()) == 22
+
+    def test_rejects_foreign_and_truncated_files(self, tmp_path):
+        path = tmp_path / "lager.snapshot"
+        path.write_bytes(b"kein snapshot")
+        with pytest.raises(SnapshotError):
+            InMemoryRepository.load_snapshot(path)
+
+        path.write_bytes(struct.pack("<6sH", MAGIC, 1) + bytes(40))
+        with pytest.raises(SnapshotError, match="Version 1"):
+            InMemoryRepository.load_snapshot(path)
+
+        _filled_repository().save_snapshot(path)
+        path.write_bytes(path.read_bytes()[:-8])
+        with pytest.raises(SnapshotError):
+            InMemoryRepository.load_snapshot(path)